@@ -0,0 +1,202 @@
+"""
+Batch grading for MathQuest Adventures.
+
+Grades answers typed up or exported from printed worksheets without the
+app's window, by the same rules as the exam screen:
+
+    python batch_grade.py answers.csv --output graded.csv --stats stats.csv
+
+The answers file is a CSV with a ``question`` column, holding the question
+as printed (with or without the ``Q.<n>`` number and "What will be the
+result of" wording), and an ``answer`` column. An optional ``remainder``
+column holds division remainders, and a ``learner`` column splits the
+stats. Other columns are copied through.
+
+Each row is written out with its topic, the correct answer and a result of
+right, wrong or invalid. Invalid rows carry the message the exam screen
+would show. The stats file keeps question, right and invalid counts per
+learner and topic, and is added to when it already exists.
+
+The file is read and written in chunks, so it may be any size. Whole-number
++, -, * and / rows, which make up most worksheets, are graded a column at
+a time with numpy. Other rows are read back into questions by their
+topic's ``read`` and marked by ``project.grade_answer``.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from classroom_server import load_project
+
+# larger operands are graded one by one, so products fit in int64
+OPERAND_LIMIT = 10 ** 9
+STATS_COLUMNS = ["questions", "right", "invalid"]
+# distinct questions remembered between chunks
+CACHE_SIZE = 100_000
+
+
+def column(frame, name):
+    if name in frame:
+        return frame[name].astype(str)
+    return pd.Series("", index=frame.index)
+
+
+def whole_numbers(column):
+    """
+    Return ``(valid, values)`` arrays for a column of typed answers.
+
+    Valid answers are the ones the exam screen reads as whole numbers, once
+    spaces around them are stripped. Each distinct text is looked at once.
+    """
+    codes, texts = pd.factorize(column)
+    texts = [text.strip() for text in texts]
+    valid = np.array([text.isdecimal() and len(text) <= 18 for text in texts], dtype=bool)
+    values = np.array([int(text) if ok else 0 for text, ok in zip(texts, valid)], dtype=np.int64)
+    return valid[codes], values[codes]
+
+
+class Grader:
+    """
+    Grades chunks of answers, reading each distinct question once.
+
+    A question is read into its paper by ``project.read_question``. Papers of
+    whole-number +, -, * and / questions are graded a column at a time from
+    their operands; the others through ``project.grade_answer``.
+    """
+    def __init__(self, project):
+        self.project = project
+        self.known = {}
+
+    def read(self, question):
+        """``(paper, op, X, Y, Z)`` for *question*; *op* is set for whole-number arithmetic only."""
+        entry = self.known.get(question)
+        if entry is None:
+            paper = self.project.read_question(question)
+            entry = (paper, "", 0, 0, 0)
+            if paper is not None and paper._S in self.project.FACT_OPS:
+                operands = (paper._X, paper._Y, paper._Z or 0)
+                if max(operands) < OPERAND_LIMIT:
+                    entry = (paper, paper._S, *operands)
+            if len(self.known) >= CACHE_SIZE:
+                self.known.clear()
+            self.known[question] = entry
+        return entry
+
+    def grade(self, frame):
+        """Grade one chunk and return it with ``topic``, ``expected``, ``result`` and ``message`` columns."""
+        project = self.project
+        n = len(frame)
+        codes, questions = pd.factorize(frame["question"].astype(str))
+        entries = [self.read(question) for question in questions]
+        papers = [entry[0] for entry in entries]
+        ops = np.array([entry[1] for entry in entries], dtype=object)[codes]
+        X, Y, Z = (np.array([entry[k] for entry in entries], dtype=np.int64)[codes] for k in (2, 3, 4))
+        topics = np.array(["" if paper is None else paper._S for paper in papers], dtype=object)[codes]
+        keys = np.array(["" if paper is None else project.format_answer(paper) for paper in papers], dtype=object)
+        expected = keys[codes]
+        answer = column(frame, "answer")
+        remainder = column(frame, "remainder")
+        given_ok, given = whole_numbers(answer)
+        left_ok, given_left = whole_numbers(remainder)
+        result = np.full(n, "invalid", dtype=object)
+        message = np.full(n, "", dtype=object)
+
+        divide = ops == "/"
+        fast = (ops != "") & given_ok & (~divide | left_ok)
+        divisor = np.where(divide, Y, 1)
+        value = np.select([ops == "+", ops == "-", ops == "*"], [X + Y + Z, X - Y, X * Y], X // divisor)
+        right = (given == value) & (~divide | (given_left == X % divisor))
+        result[fast] = np.where(right[fast], "right", "wrong")
+
+        answers, remainders = answer.to_numpy(), remainder.to_numpy()
+        for i in np.flatnonzero(~fast):
+            paper = papers[codes[i]]
+            if paper is None:
+                message[i] = "Unrecognised question"
+                continue
+            try:
+                correct = project.grade_answer(paper, answers[i].strip(), remainders[i].strip())
+            except ValueError as e:
+                message[i] = str(e)
+                continue
+            result[i] = "right" if correct else "wrong"
+        return frame.assign(topic=topics, expected=expected, result=result, message=message)
+
+
+def tally(graded, stats=None):
+    """Add a graded chunk's counts per learner and topic to *stats*."""
+    counts = pd.DataFrame({
+        "learner": column(graded, "learner"),
+        "topic": graded["topic"],
+        "questions": 1,
+        "right": (graded["result"] == "right").astype(int),
+        "invalid": (graded["result"] == "invalid").astype(int),
+    }).groupby(["learner", "topic"]).sum()
+    return counts if stats is None else stats.add(counts, fill_value=0).astype(int)
+
+
+def load_stats(path):
+    if not path or not os.path.exists(path):
+        return None
+    stats = pd.read_csv(path, dtype={"learner": str, "topic": str}, keep_default_na=False)
+    return stats.set_index(["learner", "topic"])[STATS_COLUMNS]
+
+
+def write_stats(project, stats, path):
+    stats = stats.reset_index()
+    stats.insert(2, "name", stats["topic"].map(lambda key: project.op_names.get(key, key)))
+    stats["accuracy"] = (stats["right"] / stats["questions"]).round(3)
+    stats.to_csv(path, index=False)
+
+
+def grade_file(project, source, output, chunk_size=100_000):
+    """Grade the CSV *source* into *output* chunk by chunk; return its stats and row count."""
+    grader = Grader(project)
+    stats, rows = None, 0
+    for chunk in pd.read_csv(source, dtype=str, keep_default_na=False, chunksize=chunk_size):
+        if "question" not in chunk or "answer" not in chunk:
+            raise ValueError("the answers file needs question and answer columns")
+        graded = grader.grade(chunk)
+        graded.to_csv(output, index=False, header=rows == 0)
+        stats = tally(graded, stats)
+        rows += len(graded)
+    return stats, rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grade worksheet answers from a CSV file.")
+    parser.add_argument("answers", help="CSV file with question and answer columns ('-' reads standard input)")
+    parser.add_argument("--output", default="-", help="graded CSV to write (standard output by default)")
+    parser.add_argument("--stats", help="per learner and topic stats CSV, added to if it exists")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="rows read and graded at a time")
+    parser.add_argument("--output-dir", help="app output folder (the app's usual folder by default)")
+    args = parser.parse_args(argv)
+
+    project = load_project(args.output_dir)
+    source = sys.stdin if args.answers == "-" else args.answers
+    start = time.perf_counter()
+    try:
+        if args.output == "-":
+            stats, rows = grade_file(project, source, sys.stdout, args.chunk_size)
+        else:
+            with open(args.output, "w", newline="", encoding="utf-8") as output:
+                stats, rows = grade_file(project, source, output, args.chunk_size)
+    except ValueError as e:
+        parser.error(str(e))
+    seconds = time.perf_counter() - start
+    if stats is not None:
+        if args.stats:
+            previous = load_stats(args.stats)
+            write_stats(project, stats if previous is None else previous.add(stats, fill_value=0).astype(int), args.stats)
+        totals = stats.sum()
+        print(f"{rows} answers graded in {seconds:.2f}s ({rows / max(seconds, 1e-9):,.0f}/s): "
+              f"{totals['right']} right, {totals['invalid']} invalid", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""
+Benchmark suite for MathQuest Adventures.
+
+Times question generation, number theory helpers, workbook persistence and
+the dashboard aggregations, then compares the results with a stored
+baseline.
+
+    python benchmarks.py                    # run and compare with the baseline
+    python benchmarks.py --save-baseline    # run and store a new baseline
+    python benchmarks.py --quick -k quiz    # small sizes, only names containing "quiz"
+
+Baselines depend on the machine, so only compare runs made on the same
+computer.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from classroom_server import load_project
+from synthetic_history import simulate_sessions, write_workbook
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+LEVELS = ["Easy", "Medium", "Hard"]
+SCORES = [1.0, 2.0, 3.0, 4.0]
+WORKBOOK_SIZES = [10, 100, 1000, 10000]
+QUICK_SIZES = [10, 100]
+
+
+def measure(func, setup=None, repeat=5, min_time=0.05):
+    """
+    Return the median seconds per call of *func*.
+
+    Calls are batched until a batch takes *min_time* so fast functions are
+    not dominated by timer overhead. *setup* runs before every batch and
+    is not timed; it forces a batch size of one.
+    """
+    number = 1
+    if setup is None:
+        while True:
+            t0 = time.perf_counter()
+            for _ in range(number):
+                func()
+            if time.perf_counter() - t0 >= min_time:
+                break
+            number *= 2
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - t0) / number)
+    return statistics.median(samples)
+
+
+def quiz_benchmarks(project):
+    for op in project.DEFAULT_DIFFICULTY:
+        for score in SCORES:
+            scores = {op: score}
+            for level in LEVELS:
+                yield f"quiz/{op}/{level}/score={score}", (
+                    lambda op=op, level=level, scores=scores: project.Exam.quiz(op, level, scores)
+                ), None
+
+
+def number_theory_benchmarks(project):
+    # largest primes below each size are the worst case for trial division
+    for n in [97, 997, 9973, 99991, 999983]:
+        yield f"factors_of/n={n}", (lambda n=n: project.factors_of(n)), None
+    for n in [997, 99991, 9999991, 999999937, 99999999977]:
+        yield f"prime_factorization/n={n}", (lambda n=n: project.prime_factorization(n)), None
+    groups = [[12, 18], [48, 180], [360, 756], [2520, 5544, 3600], [27720, 65520, 55440]]
+    for method in ["listing multiples", "prime factorization", "division method"]:
+        for nums in groups:
+            key = "-".join(map(str, nums))
+            yield f"lcm_explanation/{method}/nums={key}", (
+                lambda nums=nums, method=method: project.lcm_explanation(nums, method)
+            ), None
+
+
+def persistence_benchmarks(project, workdir, sizes):
+    df_summary, meta_df = project.build_session_summary(
+        {"+": {"total_questions": 5, "correct_answers": 4, "total_attempts": 6, "total_time": 40.0,
+               "first_try_correct": 3}},
+        4, 5, datetime(2025, 1, 1, 10), datetime(2025, 1, 1, 10, 12), "10:00AM", "10:12AM",
+    )
+    for size in sizes:
+        base = os.path.join(workdir, f"base_{size}.xlsx")
+        write_workbook(project, base, simulate_sessions(project, size))
+        target = os.path.join(workdir, f"run_{size}.xlsx")
+        setup = lambda base=base, target=target: shutil.copyfile(base, target)
+        repeat = 5 if size <= 1000 else 1
+        yield f"update_all_sessions_log/sessions={size}", (
+            lambda target=target: project.write_all_sessions_log(
+                target, df_summary, meta_df, datetime(2025, 1, 1, 10), datetime(2025, 1, 1, 10, 12), 5)
+        ), (setup, repeat)
+        yield f"append_difficulty_session/sessions={size}", (
+            lambda target=target: project.append_difficulty_session(project.DEFAULT_DIFFICULTY, target)
+        ), (setup, repeat)
+        yield f"load_progress_frames/sessions={size}", (
+            lambda base=base: project.load_progress_frames(base)
+        ), (None, repeat)
+        yield f"load_difficulty_history/sessions={size}", (
+            lambda base=base: project.load_difficulty_history(base, list(project.DEFAULT_DIFFICULTY))
+        ), (None, repeat)
+
+
+def dashboard_benchmarks(project, workdir, sizes):
+    import pandas as pd
+
+    for size in sizes:
+        base = os.path.join(workdir, f"base_{size}.xlsx")
+        if not os.path.exists(base):
+            write_workbook(project, base, simulate_sessions(project, size))
+        raw_log = pd.read_excel(base, sheet_name="Log")
+        raw_idx = pd.read_excel(base, sheet_name="Index")
+        log_df, _ = project.prepare_progress_frames(raw_log.copy(), raw_idx.copy())
+        diff_hist = project.load_difficulty_history(base, list(project.DEFAULT_DIFFICULTY))
+        yield f"prepare_progress_frames/sessions={size}", (
+            lambda: project.prepare_progress_frames(raw_log.copy(), raw_idx.copy())
+        ), None
+        for func in [project.accuracy_by_session, project.accuracy_by_topic,
+                     project.attempts_by_topic, project.questions_by_topic]:
+            yield f"{func.__name__}/sessions={size}", (lambda func=func, df=log_df: func(df)), None
+        yield f"difficulty_frame/sessions={size}", (lambda h=diff_hist: project.difficulty_frame(h)), None
+        yield f"difficulty_with_accuracy/sessions={size}", (
+            lambda df=log_df, h=diff_hist: project.difficulty_with_accuracy(df, h)
+        ), None
+
+
+def run(project, sizes, pattern=None):
+    workdir = tempfile.mkdtemp(prefix="mathquest_bench_")
+    groups = [
+        quiz_benchmarks(project),
+        number_theory_benchmarks(project),
+        persistence_benchmarks(project, workdir, sizes),
+        dashboard_benchmarks(project, workdir, sizes),
+    ]
+    results = {}
+    try:
+        for group in groups:
+            for name, func, opts in group:
+                if pattern and pattern not in name:
+                    continue
+                setup, repeat = opts if opts else (None, 5)
+                random.seed(0)
+                results[name] = measure(func, setup=setup, repeat=repeat)
+                print(f"{name:<60} {format_time(results[name]):>12}", flush=True)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def format_time(seconds):
+    if seconds is None:
+        return "-"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.2f} s"
+
+
+def compare(results, baseline, threshold):
+    """Print a comparison table and return the names that regressed."""
+    base = baseline.get("results", {})
+    regressions = []
+    print()
+    print(f"{'benchmark':<60} {'baseline':>12} {'current':>12} {'ratio':>8}")
+    for name, current in results.items():
+        old = base.get(name)
+        if old is None:
+            print(f"{name:<60} {'-':>12} {format_time(current):>12} {'new':>8}")
+            continue
+        ratio = current / old if old else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  SLOWER"
+            regressions.append(name)
+        elif ratio < 1 / (1 + threshold):
+            flag = "  faster"
+        print(f"{name:<60} {format_time(old):>12} {format_time(current):>12} {ratio:>7.2f}x{flag}")
+    print(f"\n{len(regressions)} regression(s) above {threshold:.0%} "
+          f"(baseline from {baseline.get('created', 'unknown')} on {baseline.get('machine', 'unknown')})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run MathQuest benchmarks and compare with a baseline.")
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--quick", action="store_true", help=f"use workbook sizes {QUICK_SIZES} only")
+    parser.add_argument("--sizes", help="comma separated workbook session counts")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+
+    if args.sizes:
+        sizes = [int(s) for s in args.sizes.split(",")]
+    else:
+        sizes = QUICK_SIZES if args.quick else WORKBOOK_SIZES
+    project = load_project(tempfile.mkdtemp(prefix="mathquest_bench_data_"))
+    results = run(project, sizes, args.pattern)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as fh:
+                baseline = json.load(fh)
+        merged = baseline.get("results", {}) if args.pattern or args.quick or args.sizes else {}
+        merged.update(results)
+        with open(args.baseline, "w") as fh:
+            json.dump({
+                "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "machine": f"{platform.system()} {platform.machine()} Python {platform.python_version()}",
+                "results": merged,
+            }, fh, indent=1, sort_keys=True)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline first.")
+        return 0
+    with open(args.baseline) as fh:
+        baseline = json.load(fh)
+    return 1 if compare(results, baseline, args.threshold) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+Offline item-difficulty calibration for MathQuest Adventures.
+
+Fits how hard each question template really is from the attempts stored in
+``learners.db`` and writes ``calibration.json``, which the app loads at
+startup to pitch questions (see ``project.Calibration``).
+
+A template is an operation together with a half-point band of the nominal
+difficulty ``Exam.quiz`` generates at; the bands line up with the
+generator's own difficulty thresholds. For every template a logistic IRT
+model is fitted to first attempts:
+
+    P(correct) = 1 / (1 + exp(-a * (rating - b)))
+
+where *rating* is the learner's ability estimate at the time. By default
+*a* is fixed at the estimator's slope (a Rasch/1PL fit), because one
+learner's ratings within a band vary too little to pin down a slope.
+``--two-pl`` also fits *a* when the history covers many learners. All
+templates are fitted at once with vectorised Newton steps, with a weak
+prior that pulls *b* towards the nominal value (and *a* towards the
+slope), so sparse templates stay sensible.
+
+    python calibrate.py --output-dir <folder>
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+
+import numpy as np
+
+from classroom_server import load_project
+
+BAND = 0.5
+
+
+def load_attempts(store, learner_id=None):
+    """Return operation, nominal difficulty, rating and result arrays of first attempts."""
+    sql = ("SELECT operation, difficulty, rating, correct FROM attempts "
+           "WHERE attempt = 1 AND difficulty IS NOT NULL AND rating IS NOT NULL")
+    params = ()
+    if learner_id:
+        sql += " AND learner_id = ?"
+        params = (learner_id,)
+    with store.lock:
+        rows = store.conn.execute(sql, params).fetchall()
+    if not rows:
+        return np.array([], dtype=object), np.array([]), np.array([]), np.array([])
+    ops, nominal, rating, correct = zip(*rows)
+    return (np.array(ops, dtype=object), np.array(nominal, dtype=float),
+            np.array(rating, dtype=float), np.array(correct, dtype=float))
+
+
+def fit(ops, nominal, rating, correct, slope=1.7, prior=2.0, two_pl=False, iterations=100, tol=1e-6):
+    """
+    Fit the model per template; return a list of per-template dicts.
+
+    Every Newton step updates all templates together using ``np.bincount``
+    sums, so the cost is a few passes over the data. Steps are capped at
+    one unit to keep early iterations stable.
+    """
+    op_names, op_idx = np.unique(ops.astype(str), return_inverse=True)
+    band_idx = np.floor(nominal / BAND).astype(int)
+    lowest = band_idx.min() if len(band_idx) else 0
+    width = (band_idx.max() - lowest + 1) if len(band_idx) else 1
+    codes, t = np.unique(op_idx * width + (band_idx - lowest), return_inverse=True)
+    n = len(codes)
+    template_op = op_names[codes // width] if n else np.array([])
+    centre = ((codes % width) + lowest) * BAND + BAND / 2
+    # logit p = alpha * rating + beta, with alpha = a and beta = -a * b
+    alpha0 = np.full(n, slope)
+    beta0 = -slope * centre
+    alpha, beta = alpha0.copy(), beta0.copy()
+    for _ in range(iterations):
+        z = np.clip(alpha[t] * rating + beta[t], -30, 30)
+        p = 1 / (1 + np.exp(-z))
+        w = p * (1 - p)
+        r = correct - p
+        g_a = np.bincount(t, r * rating, n) - prior * (alpha - alpha0)
+        g_b = np.bincount(t, r, n) - prior * (beta - beta0)
+        h_aa = np.bincount(t, w * rating * rating, n) + prior
+        h_ab = np.bincount(t, w * rating, n)
+        h_bb = np.bincount(t, w, n) + prior
+        if two_pl:
+            det = h_aa * h_bb - h_ab * h_ab
+            d_a = np.clip((h_bb * g_a - h_ab * g_b) / det, -1, 1)
+            d_b = np.clip((h_aa * g_b - h_ab * g_a) / det, -1, 1)
+        else:
+            d_a = np.zeros(n)
+            d_b = np.clip(g_b / h_bb, -1, 1)
+        alpha = np.maximum(alpha + d_a, 0.05)
+        beta = beta + d_b
+        if max(np.abs(d_a).max(), np.abs(d_b).max()) < tol:
+            break
+    counts = np.bincount(t, minlength=n)
+    accuracy = np.bincount(t, correct, n) / np.maximum(counts, 1)
+    results = []
+    for i in range(n):
+        results.append({
+            "operation": str(template_op[i]),
+            "nominal": round(float(centre[i]), 2),
+            "difficulty": round(float(-beta[i] / alpha[i]), 3),
+            "discrimination": round(float(alpha[i]), 3),
+            "attempts": int(counts[i]),
+            "accuracy": round(float(accuracy[i]), 3),
+        })
+    return results
+
+
+def build_table(results, min_attempts):
+    """Group fitted templates by operation, keeping those with enough attempts."""
+    templates = {}
+    for r in sorted(results, key=lambda r: (r["operation"], r["nominal"])):
+        if r["attempts"] < min_attempts:
+            continue
+        t = templates.setdefault(r["operation"], {"nominal": [], "difficulty": [], "discrimination": [],
+                                                  "attempts": []})
+        for field in t:
+            t[field].append(r[field])
+    return templates
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibrate question difficulty from recorded attempts.")
+    parser.add_argument("--output-dir", help="app output folder (the app's usual folder by default)")
+    parser.add_argument("--learner", help="only use this learner's attempts")
+    parser.add_argument("--min-attempts", type=int, default=50,
+                        help="templates with fewer first attempts keep their nominal difficulty")
+    parser.add_argument("--prior", type=float, default=2.0, help="strength of the pull towards nominal values")
+    parser.add_argument("--two-pl", action="store_true", help="also fit each template's slope")
+    parser.add_argument("--output", help="calibration file to write (calibration.json in the output folder)")
+    args = parser.parse_args(argv)
+
+    project = load_project(args.output_dir)
+    store = project.learner_store
+    learner_id = store.find_learner(args.learner) if args.learner else None
+    if args.learner and not learner_id:
+        parser.error(f"no learner named {args.learner!r}")
+
+    t0 = time.perf_counter()
+    ops, nominal, rating, correct = load_attempts(store, learner_id)
+    t1 = time.perf_counter()
+    results = fit(ops, nominal, rating, correct, slope=project.AbilityEstimator.SLOPE, prior=args.prior,
+                  two_pl=args.two_pl)
+    t2 = time.perf_counter()
+    templates = build_table(results, args.min_attempts)
+
+    path = args.output or project.CALIBRATION_FILE
+    with open(path, "w") as fh:
+        json.dump({
+            "fitted": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "attempts": int(len(correct)),
+            "min_attempts": args.min_attempts,
+            "templates": templates,
+        }, fh, indent=2)
+
+    print(f"{len(correct)} first attempts loaded in {t1 - t0:.2f} s, {len(results)} templates fitted in {t2 - t1:.2f} s")
+    print(f"{'operation':<22}{'nominal':>8}{'fitted':>8}{'slope':>7}{'attempts':>10}{'accuracy':>10}")
+    for r in results:
+        flag = "" if r["attempts"] >= args.min_attempts else "  (too few, not used)"
+        print(f"{r['operation']:<22}{r['nominal']:>8.2f}{r['difficulty']:>8.2f}{r['discrimination']:>7.2f}"
+              f"{r['attempts']:>10}{r['accuracy']:>10.2f}{flag}")
+    print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+"""
+Classroom server for MathQuest Adventures.
+
+Serves quizzes to browsers on the local network over HTTP and WebSocket
+using only ``asyncio`` from the standard library. Every WebSocket connection
+holds its own ``QuizSession`` and finished sessions are handed to a single
+writer task, so workbooks and the learner store are never written
+concurrently.
+
+Run with:
+
+    python classroom_server.py --host 0.0.0.0 --port 8765 --output-dir <folder>
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import struct
+import traceback
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OP_TEXT, OP_CLOSE, OP_PING, OP_PONG = 0x1, 0x8, 0x9, 0xA
+MAX_FRAME = 64 * 1024
+
+
+def load_project(output_dir=None):
+    """Import the quiz module, pointing it at *output_dir* first if given."""
+    if output_dir:
+        os.environ["MATHQUEST_OUTPUT_DIR"] = output_dir
+    import project
+    return project
+
+
+def encode_frame(opcode, payload=b""):
+    """Return an unmasked server-to-client WebSocket frame."""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+async def read_frame(reader):
+    """Read one WebSocket frame and return ``(opcode, payload)``."""
+    b1, b2 = await reader.readexactly(2)
+    opcode = b1 & 0x0F
+    masked = b2 & 0x80
+    length = b2 & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", await reader.readexactly(8))
+    if length > MAX_FRAME:
+        raise ConnectionError("frame too large")
+    mask = await reader.readexactly(4) if masked else None
+    payload = await reader.readexactly(length)
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return opcode, payload
+
+
+def accept_key(key):
+    digest = hashlib.sha1((key + WS_GUID).encode()).digest()
+    return base64.b64encode(digest).decode()
+
+
+def int_field(msg, key, default):
+    """Read a whole-number field of a client message; ``None`` if it holds anything else."""
+    value = msg.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def question_layout(paper):
+    """Name the input widgets a client needs for *paper*."""
+    if paper._S == "/":
+        return "quotient_remainder"
+    if paper.choices:
+        return "choices"
+    return "text"
+
+
+class ClassroomServer:
+    """
+    Asyncio HTTP/WebSocket front end over ``project.QuizSession``.
+
+    Grading runs on the event loop since it takes microseconds. Workbook
+    and store writes take far longer and are queued for the writer task,
+    which runs them one at a time in a worker thread.
+    """
+
+    def __init__(self, project, host="0.0.0.0", port=8765):
+        self.project = project
+        self.host, self.port = host, port
+        self.commit_queue = None
+        self.server = None
+        self.connections = 0
+        self.committed = 0
+
+    async def run(self):
+        self.commit_queue = asyncio.Queue()
+        writer = asyncio.create_task(self.writer_task())
+        server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        # port 0 picks a free port
+        self.port = server.sockets[0].getsockname()[1]
+        self.server = server
+        print(f"MathQuest classroom server on http://{self.host}:{self.port}/")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.commit_queue.join()
+            writer.cancel()
+
+    async def writer_task(self):
+        """Persist finished sessions one at a time."""
+        loop = asyncio.get_running_loop()
+        while True:
+            session, record = await self.commit_queue.get()
+            try:
+                await loop.run_in_executor(None, session.save, record)
+                self.committed += 1
+            except Exception as e:
+                print(f"Failed to save session for {session.profile.name}: {e}")
+            finally:
+                self.commit_queue.task_done()
+
+    async def handle_client(self, reader, writer):
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        lines = request.decode("latin-1").split("\r\n")
+        parts = lines[0].split()
+        path = parts[1] if len(parts) > 1 else "/"
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                k, v = line.split(":", 1)
+                headers[k.strip().lower()] = v.strip()
+
+        try:
+            if path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                await self.serve_websocket(reader, writer, headers)
+            elif path == "/":
+                self.send_http(writer, "200 OK", "text/html; charset=utf-8", PAGE.encode())
+            elif path == "/health":
+                body = json.dumps({
+                    "connections": self.connections,
+                    "pending_commits": self.commit_queue.qsize(),
+                    "committed": self.committed,
+                }).encode()
+                self.send_http(writer, "200 OK", "application/json", body)
+            else:
+                self.send_http(writer, "404 Not Found", "text/plain", b"Not found")
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def send_http(writer, status, content_type, body):
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+            + body
+        )
+
+    async def serve_websocket(self, reader, writer, headers):
+        key = headers.get("sec-websocket-key")
+        if not key:
+            self.send_http(writer, "400 Bad Request", "text/plain", b"Missing key")
+            return
+        writer.write(
+            "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+            f"Connection: Upgrade\r\nSec-WebSocket-Accept: {accept_key(key)}\r\n\r\n".encode()
+        )
+        self.connections += 1
+        state = {"session": None}
+        try:
+            while True:
+                opcode, payload = await read_frame(reader)
+                if opcode == OP_CLOSE:
+                    writer.write(encode_frame(OP_CLOSE))
+                    break
+                if opcode == OP_PING:
+                    writer.write(encode_frame(OP_PONG, payload))
+                    continue
+                if opcode != OP_TEXT:
+                    continue
+                try:
+                    msg = json.loads(payload.decode("utf-8"))
+                except ValueError:
+                    msg = None
+                if not isinstance(msg, dict):
+                    replies = [{"type": "error", "message": "Invalid message"}]
+                else:
+                    try:
+                        replies = self.handle_message(state, msg)
+                    except Exception:
+                        # a bad message must not end the child's quiz
+                        traceback.print_exc()
+                        replies = [{"type": "error", "message": "Invalid message"}]
+                for reply in replies:
+                    writer.write(encode_frame(OP_TEXT, json.dumps(reply).encode()))
+                await writer.drain()
+        finally:
+            self.connections -= 1
+
+    def handle_message(self, state, msg):
+        """Apply one client message to the connection state and return replies."""
+        kind = msg.get("type")
+        if kind == "join":
+            return self.join(state, msg)
+        session = state["session"]
+        if session is None:
+            return [{"type": "error", "message": "Join a quiz first"}]
+        if kind == "answer":
+            return self.answer(session, msg)
+        return [{"type": "error", "message": f"Unknown message type: {kind}"}]
+
+    def join(self, state, msg):
+        project = self.project
+        name = str(msg.get("learner", "")).strip()
+        if not name:
+            return [{"type": "error", "message": "Please type your name"}]
+        operations = msg.get("operations")
+        operations = [op for op in operations if isinstance(op, str) and op in project.DEFAULT_DIFFICULTY] \
+            if isinstance(operations, list) else []
+        if not operations:
+            return [{"type": "error", "message": "Please Select atleast One option!"}]
+        total = int_field(msg, "questions", 10)
+        if total is None or not 0 < total <= project.MAX_QUESTIONS:
+            return [{"type": "error", "message": "Please ensure correct selections & entry!"}]
+
+        store = project.learner_store
+        learner_id = store.find_learner(name) or store.add_learner(name)
+        profile = store.profile(learner_id)
+        session = project.QuizSession(profile, operations, total)
+        state["session"] = session
+        return [self.question_message(session)]
+
+    def answer(self, session, msg):
+        project = self.project
+        if session.finished:
+            return [{"type": "error", "message": "This quiz is already finished"}]
+        paper = session.question_paper
+        choice = int_field(msg, "choice", -1)
+        if choice is None:
+            return [{"type": "error", "message": "Please select an option!"}]
+        try:
+            correct, done = session.submit(
+                str(msg.get("answer", "")),
+                str(msg.get("remainder", "")),
+                choice,
+            )
+        except ValueError as e:
+            return [{"type": "error", "message": str(e)}]
+
+        left = session.MAX_ATTEMPTS - session.attempts_counter
+        if correct:
+            text = f"Correct! {paper.question} is {project.format_answer(paper)}"
+        elif done:
+            text = f"Incorrect! {paper.question} is {project.format_answer(paper)}"
+        elif left > 1:
+            text = f"Your Answer is Incorrect, you've got {left - 1} more attempts!"
+        else:
+            text = "Your Answer is Incorrect, it's the last attempt!"
+        replies = [{"type": "feedback", "correct": correct, "done": done, "message": text}]
+        if not done:
+            return replies
+        if session.finished:
+            record = session.finish()
+            # profile state changes here on the loop; the writer only gets the snapshot
+            session.apply(record)
+            self.commit_queue.put_nowait((session, record))
+            replies.append({
+                "type": "result",
+                "score": session.exam_score,
+                "total": session.question_asked,
+                "grade": project.get_grade(session.exam_score, session.question_asked),
+            })
+        else:
+            replies.append(self.question_message(session))
+        return replies
+
+    def question_message(self, session):
+        paper = session.next_question()
+        return {
+            "type": "question",
+            "number": session.question_asked,
+            "total": session.total,
+            "text": self.project.format_question(paper, session.question_asked),
+            "layout": question_layout(paper),
+            "choices": paper.choices,
+        }
+
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>MathQuest Adventures</title>
+<style>
+body { font-family: "Comic Sans MS", sans-serif; background: #F0F8FF; text-align: center; }
+#question { font-size: 2em; font-weight: bold; margin: 1em; }
+#feedback { font-size: 1.4em; padding: .3em; }
+input, button { font-size: 1.3em; margin: .3em; }
+.bar { display: flex; width: 120px; height: 60px; border: 1px solid black; margin-bottom: .2em; }
+.bar span { flex: 1; background: white; }
+.bar span + span { border-left: 1px solid black; }
+.bar span.on { background: blue; }
+</style></head>
+<body>
+<h1>&#129518; MathQuest Adventures</h1>
+<div id="join">
+  <p>Your name: <input id="name"></p>
+  <p id="ops"></p>
+  <p>Number of Questions: <input id="count" value="10" size="4"></p>
+  <button onclick="join()">Start Exam!</button>
+</div>
+<div id="exam" hidden>
+  <div id="question"></div>
+  <input id="answer" size="12">
+  <span id="rem" hidden>Remainder: <input id="remainder" size="6"></span>
+  <div id="choices" hidden></div>
+  <button onclick="send()">Submit</button>
+  <div id="feedback"></div>
+</div>
+<script>
+const OPS = {"+": "Addition", "-": "Subtraction", "*": "Multiplication", "/": "Division",
+  "fraction": "Fractions", "factors_primes": "Factors & Primes",
+  "prime_factorization": "Prime Factorization", "hcf": "HCF", "lcm": "LCM",
+  "expression": "Mixed Operations"};
+const $ = id => document.getElementById(id);
+for (const [k, v] of Object.entries(OPS))
+  $("ops").insertAdjacentHTML("beforeend", `<label><input type="checkbox" value="${k}">${v}</label> `);
+const ws = new WebSocket(`ws://${location.host}/ws`);
+function join() {
+  const ops = [...document.querySelectorAll("#ops input:checked")].map(e => e.value);
+  ws.send(JSON.stringify({type: "join", learner: $("name").value, operations: ops,
+                          questions: parseInt($("count").value)}));
+}
+function send() {
+  ws.send(JSON.stringify({type: "answer", answer: $("answer").value, remainder: $("remainder").value}));
+  $("answer").value = ""; $("remainder").value = "";
+}
+function bar(n, d) {
+  const parts = Array.from({length: d}, (_, j) => `<span${j < n ? ' class="on"' : ""}></span>`);
+  return `<div class="bar">${parts.join("")}</div>`;
+}
+function choose(i) {
+  ws.send(JSON.stringify({type: "answer", choice: i}));
+}
+$("answer").addEventListener("keydown", e => { if (e.key === "Enter") send(); });
+ws.onmessage = e => {
+  const m = JSON.parse(e.data);
+  if (m.type === "question") {
+    $("join").hidden = true; $("exam").hidden = false;
+    $("question").textContent = m.text; $("rem").hidden = m.layout !== "quotient_remainder";
+    const choices = m.layout === "choices";
+    $("answer").hidden = choices; $("choices").hidden = !choices;
+    $("choices").innerHTML = choices
+      ? m.choices.map(([n, d], i) => `<button onclick="choose(${i})">${bar(n, d)}${n}/${d}</button>`).join(" ") : "";
+    if (!choices) $("answer").focus();
+  } else if (m.type === "feedback" || m.type === "error") {
+    $("feedback").textContent = m.message;
+    $("feedback").style.background = m.type === "error" ? "orange" : (m.correct ? "lightgreen" : "#fdd");
+  } else if (m.type === "result") {
+    $("question").textContent = `${m.grade} - Score ${m.score} of ${m.total}`;
+    $("answer").hidden = true; $("rem").hidden = true; $("choices").hidden = true;
+  }
+};
+</script>
+</body></html>
+"""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve MathQuest quizzes to browsers on the LAN.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--output-dir", help="folder for learner data (defaults to the app's save folder)")
+    args = parser.parse_args(argv)
+    server = ClassroomServer(load_project(args.output_dir), args.host, args.port)
+    try:
+        asyncio.run(server.run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Question generator for MathQuest Adventures.
+
+Streams questions from ``Exam.quiz`` as JSON lines, one question per line,
+for printed packs, LMS imports or tests:
+
+    python generate_questions.py 1000 --seed 7 --ops +,-,fraction --levels Easy,Medium > pack.jsonl
+    python generate_questions.py 10000000 --workers 4 | gzip > big.jsonl.gz
+
+Each line holds the question's number, operation, level and difficulty,
+its text (bare and as shown in the app), the operands, the answer as data
+and as text, the division remainder, the multiple-choice options, and
+the numbers and method of HCF/LCM questions, or null where they do not
+apply.
+
+Questions are made in blocks of ``BLOCK``, each from its own random stream
+derived from the seed, so the output depends only on the seed and options,
+not on the number of workers. Only a few blocks per worker are in flight
+at once, so memory stays constant however many questions are asked for.
+"""
+import argparse
+import json
+import random
+import sys
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from classroom_server import load_project
+
+BLOCK = 1000
+LEVELS = ["Easy", "Medium", "Hard"]
+
+project = None
+
+
+def start_worker(output_dir):
+    global project
+    project = load_project(output_dir)
+
+
+def describe(paper, number, level, difficulty):
+    """The JSON-ready record of *paper*."""
+    return {
+        "n": number,
+        "op": paper._S,
+        "level": level,
+        "difficulty": round(difficulty, 2),
+        "question": paper.question,
+        "text": project.format_question(paper, number),
+        "operands": [paper._X, paper._Y, paper._Z],
+        "answer": paper.answer_actual,
+        "answer_text": project.format_answer(paper),
+        "remainder": getattr(paper, "answer_actual_remainder", None),
+        "choices": paper.choices,
+        "numbers": getattr(paper, "numbers", None),
+        "method": getattr(paper, "method", None),
+        "mode": getattr(paper, "mode", None),
+    }
+
+
+def generate(seed, block, count, ops, levels, scores):
+    """Yield the records of questions ``block * BLOCK + 1`` to ``block * BLOCK + count``."""
+    rng = random.Random(f"{seed}:{block}")
+    for i in range(count):
+        op, level = rng.choice(ops), rng.choice(levels)
+        score = rng.choice(scores) if scores else project.DEFAULT_DIFFICULTY[op]
+        paper = project.Exam.quiz(op, level, {op: score}, rng)
+        yield describe(paper, block * BLOCK + i + 1, level, score + project.LEVEL_ADJUST[level])
+
+
+def block_lines(job):
+    return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in generate(*job))
+
+
+def jobs(total, seed, ops, levels, scores):
+    for block in range((total + BLOCK - 1) // BLOCK):
+        yield seed, block, min(BLOCK, total - block * BLOCK), ops, levels, scores
+
+
+def stream(jobs, workers, output_dir):
+    """Yield each job's lines in order, running up to *workers* processes with two jobs each in flight."""
+    if workers <= 1:
+        start_worker(output_dir)
+        for job in jobs:
+            yield block_lines(job)
+        return
+    with ProcessPoolExecutor(workers, initializer=start_worker, initargs=(output_dir,)) as pool:
+        pending = deque()
+        try:
+            for job in jobs:
+                pending.append(pool.submit(block_lines, job))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def split(text):
+    return [part.strip() for part in text.split(",") if part.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream generated questions as JSON lines.")
+    parser.add_argument("count", type=int, help="number of questions")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (0 by default)")
+    parser.add_argument("--ops", help="comma separated operations, e.g. '+,-,fraction' (all by default)")
+    parser.add_argument("--levels", default=",".join(LEVELS), help="comma separated levels (all by default)")
+    parser.add_argument("--scores", help="comma separated difficulty scores to draw from "
+                                         "(each operation's starting score by default)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes")
+    parser.add_argument("--output", help="file to write (standard output by default)")
+    parser.add_argument("--output-dir", help="app output folder to load the app with (a temporary folder by default)")
+    args = parser.parse_args(argv)
+
+    output_dir = args.output_dir or tempfile.mkdtemp(prefix="mathquest_generate_")
+    start_worker(output_dir)
+    ops = split(args.ops) if args.ops else list(project.OPERATIONS)
+    levels = split(args.levels)
+    unknown = [op for op in ops if op not in project.OPERATIONS] + [lvl for lvl in levels if lvl not in LEVELS]
+    if unknown or not ops or not levels:
+        parser.error(f"unknown operations or levels: {', '.join(unknown) or 'none given'}")
+    try:
+        scores = [float(score) for score in split(args.scores)] if args.scores else None
+    except ValueError:
+        parser.error("--scores takes numbers, e.g. 1.5,2,3")
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for lines in stream(jobs(args.count, args.seed, ops, levels, scores), args.workers, output_dir):
+            out.write(lines)
+    except BrokenPipeError:
+        # the reader stopped early, e.g. `| head`
+        sys.stderr.close()
+    finally:
+        if args.output:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
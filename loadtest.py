@@ -0,0 +1,239 @@
+"""
+Load generator for MathQuest Adventures.
+
+Simulates many learners taking quizzes at once through the headless
+question/grade/commit path (``project.QuizSession``), the same path the
+classroom server uses. Reports throughput, latency percentiles and how long
+finished sessions wait for the storage layer.
+
+Example:
+
+    python loadtest.py --learners 10,100,300 --sessions 3 --questions 10 --think 0.5
+
+Learner data is written to a temporary folder unless --output-dir is given.
+"""
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from classroom_server import load_project
+
+ALL_OPS = ["+", "-", "*", "/", "fraction", "factors_primes", "prime_factorization", "hcf", "lcm", "expression"]
+
+
+class TimedLock:
+    """Wrap a lock and record how long each acquire waited and held it."""
+
+    def __init__(self, lock):
+        self._lock = lock
+        self._local = threading.local()
+        self.waits, self.holds = [], []
+
+    def acquire(self, *args, **kwargs):
+        t0 = time.perf_counter()
+        got = self._lock.acquire(*args, **kwargs)
+        t1 = time.perf_counter()
+        depth = getattr(self._local, "depth", 0)
+        if got and depth == 0:
+            self.waits.append(t1 - t0)
+            self._local.start = t1
+        self._local.depth = depth + 1
+        return got
+
+    def release(self):
+        self._local.depth -= 1
+        if self._local.depth == 0:
+            self.holds.append(time.perf_counter() - self._local.start)
+        self._lock.release()
+
+    __enter__ = acquire
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def correct_answer(paper):
+    """Return ``(text, remainder, choice)`` that grades as correct for *paper*."""
+    actual = paper.answer_actual
+    if paper.choices:
+        return "", "", paper.choices.index(actual)
+    if paper._S == "/":
+        return str(actual), str(paper.answer_actual_remainder), -1
+    if paper._S == "fraction":
+        return f"{actual[0]}/{actual[1]}", "", -1
+    if paper._S == "prime_factorization":
+        return " ".join(map(str, actual)), "", -1
+    if paper._S == "factors_primes":
+        mode = getattr(paper, "mode", "count")
+        if mode == "list":
+            return " ".join(map(str, actual)), "", -1
+        if mode in ("prime", "twin"):
+            return ("yes" if actual else "no"), "", -1
+    return str(actual), "", -1
+
+
+def wrong_answer(paper):
+    """Return an answer that parses but grades as incorrect."""
+    text, rem, choice = correct_answer(paper)
+    if paper.choices:
+        return "", "", (choice + 1) % len(paper.choices)
+    if text in ("yes", "no"):
+        return ("no" if text == "yes" else "yes"), "", -1
+    if paper._S == "fraction":
+        num, den = text.split("/")
+        return f"{int(num) + 1}/{den}", "", -1
+    if " " in text:
+        return text + " 2", "", -1
+    return str(int(text) + 1), rem, -1
+
+
+def percentiles(values):
+    if not values:
+        return {"count": 0, "p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+    arr = np.asarray(values) * 1000
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+    return {
+        "count": len(values),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(arr.max()), 3),
+    }
+
+
+class LoadTest:
+    """One run with a fixed number of simulated learners."""
+
+    def __init__(self, project, args, learners):
+        self.project = project
+        self.args = args
+        self.learners = learners
+        self.answer_latency, self.plan_latency = [], []
+        self.commit_queue_wait, self.commit_time = [], []
+        self.answers = 0
+        self.sessions = 0
+
+    async def learner(self, index, pool, rng):
+        project, args = self.project, self.args
+        loop = asyncio.get_running_loop()
+        store = project.learner_store
+        name = f"loadtest_{index:04d}"
+        learner_id = store.find_learner(name) or store.add_learner(name)
+        profile = store.profile(learner_id)
+        pending = []
+        for _ in range(args.sessions):
+            t0 = time.perf_counter()
+            session = project.QuizSession(profile, args.ops, args.questions)
+            session.next_question()
+            self.plan_latency.append(time.perf_counter() - t0)
+            while not session.finished:
+                if args.think:
+                    await asyncio.sleep(rng.expovariate(1.0 / args.think))
+                right = rng.random() < args.accuracy
+                answer = correct_answer(session.question_paper) if right else wrong_answer(session.question_paper)
+                t0 = time.perf_counter()
+                try:
+                    _, done = session.submit(*answer)
+                except ValueError:
+                    # e.g. a negative fraction result, which the input rules reject
+                    _, done = session.submit("0", "0")
+                if done and not session.finished:
+                    session.next_question()
+                self.answer_latency.append(time.perf_counter() - t0)
+                self.answers += 1
+            record = session.finish()
+            session.apply(record)
+            queued = time.perf_counter()
+            pending.append(loop.run_in_executor(pool, self.commit, session, record, queued))
+            self.sessions += 1
+        await asyncio.gather(*pending)
+
+    def commit(self, session, record, queued):
+        start = time.perf_counter()
+        self.commit_queue_wait.append(start - queued)
+        session.save(record)
+        self.commit_time.append(time.perf_counter() - start)
+
+    async def run(self):
+        rng = random.Random(self.args.seed)
+        pool = ThreadPoolExecutor(max_workers=self.args.writers)
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            self.learner(i, pool, random.Random(rng.random())) for i in range(self.learners)
+        ])
+        elapsed = time.perf_counter() - start
+        pool.shutdown()
+        return elapsed
+
+
+def run_level(project, args, learners):
+    store = project.learner_store
+    timed = TimedLock(store.lock)
+    store.lock = timed
+    try:
+        test = LoadTest(project, args, learners)
+        elapsed = asyncio.run(test.run())
+    finally:
+        store.lock = timed._lock
+    return {
+        "learners": learners,
+        "elapsed_s": round(elapsed, 3),
+        "answers": test.answers,
+        "sessions": test.sessions,
+        "answers_per_s": round(test.answers / elapsed, 1),
+        "sessions_per_s": round(test.sessions / elapsed, 2),
+        "answer_latency": percentiles(test.answer_latency),
+        "plan_latency": percentiles(test.plan_latency),
+        "commit_queue_wait": percentiles(test.commit_queue_wait),
+        "commit_time": percentiles(test.commit_time),
+        "store_lock_wait": percentiles(timed.waits),
+        "store_lock_hold": percentiles(timed.holds),
+    }
+
+
+def print_report(results):
+    cols = ["answer_latency", "plan_latency", "commit_queue_wait", "commit_time", "store_lock_wait"]
+    print(f"{'learners':>8} {'answers/s':>10} {'sessions/s':>10}  " + "  ".join(f"{c + ' p50/p95/p99 ms':>38}" for c in cols))
+    for r in results:
+        cells = []
+        for c in cols:
+            p = r[c]
+            cells.append(f"{p['p50_ms']!s:>12}/{p['p95_ms']!s:>12}/{p['p99_ms']!s:>12}")
+        print(f"{r['learners']:>8} {r['answers_per_s']:>10} {r['sessions_per_s']:>10}  " + "  ".join(cells))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate many learners to load-test MathQuest.")
+    parser.add_argument("--learners", default="10,50,200",
+                        help="comma separated learner counts to run, one level each")
+    parser.add_argument("--sessions", type=int, default=2, help="quizzes per learner")
+    parser.add_argument("--questions", type=int, default=10, help="questions per quiz")
+    parser.add_argument("--think", type=float, default=0.0, help="mean think time per answer in seconds")
+    parser.add_argument("--accuracy", type=float, default=0.8, help="chance of answering correctly")
+    parser.add_argument("--ops", default=",".join(ALL_OPS), help="comma separated operations")
+    parser.add_argument("--writers", type=int, default=1,
+                        help="threads committing sessions (1 matches the classroom server)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output-dir", help="learner data folder (a temporary folder by default)")
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+    args.ops = [op for op in args.ops.split(",") if op]
+
+    project = load_project(args.output_dir or tempfile.mkdtemp(prefix="mathquest_load_"))
+    results = [run_level(project, args, int(n)) for n in args.learners.split(",")]
+    print(f"Output folder: {project.OUTPUT_DIR}")
+    print_report(results)
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
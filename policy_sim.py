@@ -0,0 +1,234 @@
+"""
+Adaptive-policy simulator for MathQuest Adventures.
+
+Runs synthetic learners through the real quiz loop: ``QuizSession``
+planning, ``Exam.quiz`` generation, ``grade_answer`` and the ability
+estimator. It does this for every combination of a parameter grid, on a
+process pool, and reports how quickly each policy finds a learner's level
+and how much of the time questions sit in the learner's target zone.
+
+    python policy_sim.py --learners 500 --grid k_max=0.6,0.8,1.2 --grid target=0.7,0.75,0.8
+
+Grid keys: ``target``, ``slope``, ``k_max``, ``k_min`` and ``k_decay`` for
+the estimator; ``split`` (how many standard deviations separate Easy,
+Medium and Hard in ``determine_difficulty_levels``) and ``level_step`` (how
+far Easy and Hard questions sit from the estimate) for the session.
+"""
+import argparse
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from classroom_server import load_project
+from loadtest import ALL_OPS, correct_answer, wrong_answer
+
+ESTIMATOR_KEYS = ("target", "slope", "k_max", "k_min", "k_decay")
+SESSION_KEYS = ("split", "level_step")
+DEFAULT_GRID = ["k_max=0.6,0.8,1.2", "target=0.7,0.75,0.8"]
+
+project = None
+
+
+class SimProfile:
+    """In-memory stand-in for a learner profile; nothing is written to disk."""
+
+    def __init__(self, estimator_params):
+        self.scores = project.DEFAULT_DIFFICULTY.copy()
+        self.history = {}
+        self.ability = project.AbilityEstimator({}, self.scores, **estimator_params)
+        self.mastery = project.FactMastery()
+        self.recent = None
+        self.reviews = None
+
+    @property
+    def thresholds(self):
+        return project.compute_thresholds(self.history, self.scores)
+
+    def commit(self, scores):
+        for op, val in scores.items():
+            self.history.setdefault(op, []).append(float(val))
+
+
+class SimLearner:
+    """
+    A synthetic learner.
+
+    Each operation has a true ability, which grows a little with every
+    attempt, and a hidden hardness that shifts how difficult its questions
+    really are. The chance of a correct answer is logistic in ability minus
+    true difficulty, on the same slope the estimator assumes.
+    """
+
+    def __init__(self, rng, mean_ability, spread, learning):
+        self.rng = rng
+        self.learning = learning
+        self.ability = {op: min(5.5, max(0.8, rng.gauss(mean_ability, spread))) for op in ALL_OPS}
+        self.hardness = {op: rng.gauss(0, 0.2) for op in ALL_OPS}
+
+    def p_correct(self, op, nominal):
+        return 1 / (1 + math.exp(-project.AbilityEstimator.SLOPE * (self.ability[op] - nominal - self.hardness[op])))
+
+    def ideal(self, op, zone_target):
+        """Nominal difficulty at which this learner succeeds *zone_target* of the time."""
+        logit = math.log(zone_target / (1 - zone_target))
+        return self.ability[op] - self.hardness[op] - logit / project.AbilityEstimator.SLOPE
+
+    def learn(self, op):
+        self.ability[op] += self.learning * self.rng.random()
+
+
+def init_worker(output_dir):
+    global project
+    project = load_project(output_dir)
+
+
+def run_learner(job):
+    """Simulate one learner under one policy and return ``(combo, metrics)``."""
+    combo, params, seed, opts = job
+    rng = random.Random(seed)
+    estimator_params = {k: v for k, v in params.items() if k in ESTIMATOR_KEYS}
+    session_params = {k: v for k, v in params.items() if k in SESSION_KEYS}
+    profile = SimProfile(estimator_params)
+    learner = SimLearner(rng, opts["ability"], opts["spread"], opts["learning"])
+    lo, hi = opts["zone"]
+    zone_target = (lo + hi) / 2
+
+    asked = {op: 0 for op in opts["ops"]}
+    converged_at = {}
+    in_zone = first_try = questions = 0
+    for _ in range(opts["sessions"]):
+        session = project.QuizSession(profile, opts["ops"], opts["questions"], seed=rng.getrandbits(32),
+                                      **session_params)
+        session.next_question()
+        attempt = 1
+        while not session.finished:
+            paper = session.question_paper
+            op = paper._S
+            p = learner.p_correct(op, session.question_nominal)
+            if attempt == 1:
+                questions += 1
+                asked[op] += 1
+                in_zone += lo <= p <= hi
+                if op not in converged_at and abs(profile.ability.difficulty(op) - learner.ideal(op, zone_target)) <= opts["tolerance"]:
+                    converged_at[op] = asked[op]
+            right = rng.random() < p
+            answer = correct_answer(paper) if right else wrong_answer(paper)
+            try:
+                correct, done = session.submit(*answer)
+            except ValueError:
+                # e.g. a negative fraction, which the input rules reject
+                correct, done = session.submit("0", "0")
+            first_try += correct and attempt == 1
+            learner.learn(op)
+            attempt = 1 if done else attempt + 1
+            if done and not session.finished:
+                session.next_question()
+        profile.commit(session.finish()["scores"])
+
+    practised = [op for op, n in asked.items() if n]
+    final_error = [abs(profile.ability.difficulty(op) - learner.ideal(op, zone_target)) for op in practised]
+    return combo, {
+        # an operation that never converged counts as all of its questions
+        "converge_questions": statistics.mean(converged_at.get(op, asked[op]) for op in practised),
+        "converged": sum(op in converged_at for op in practised) / len(practised),
+        "in_zone": in_zone / questions,
+        "first_try_accuracy": first_try / questions,
+        "final_error": statistics.mean(final_error),
+    }
+
+
+def parse_grid(items):
+    keys, values = [], []
+    for item in items:
+        key, _, vals = item.partition("=")
+        if key not in ESTIMATOR_KEYS + SESSION_KEYS:
+            raise SystemExit(f"unknown grid key {key!r}; choose from {', '.join(ESTIMATOR_KEYS + SESSION_KEYS)}")
+        keys.append(key)
+        values.append([float(v) for v in vals.split(",") if v])
+    return [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+
+
+def summarise(combos, results):
+    rows = []
+    for i, params in enumerate(combos):
+        metrics = results[i]
+        row = {"params": params, "learners": len(metrics)}
+        for key in ("converge_questions", "converged", "in_zone", "first_try_accuracy", "final_error"):
+            vals = [m[key] for m in metrics]
+            row[key] = round(statistics.mean(vals), 4)
+        row["converge_questions_p90"] = round(statistics.quantiles([m["converge_questions"] for m in metrics],
+                                                                   n=10)[-1], 2) if len(metrics) > 1 else None
+        rows.append(row)
+    rows.sort(key=lambda r: (-r["in_zone"], r["converge_questions"]))
+    return rows
+
+
+def print_report(rows, zone):
+    print(f"{'policy':<40}{'to level':>10}{'p90':>8}{'found':>8}{'in zone':>9}{'1st try':>9}{'error':>8}")
+    for r in rows:
+        name = " ".join(f"{k}={v:g}" for k, v in r["params"].items())
+        print(f"{name:<40}{r['converge_questions']:>10.1f}{r['converge_questions_p90'] or 0:>8.1f}"
+              f"{r['converged'] * 100:>7.0f}%{r['in_zone'] * 100:>8.1f}%{r['first_try_accuracy'] * 100:>8.1f}%"
+              f"{r['final_error']:>8.2f}")
+    print(f"\n'to level': questions per topic until the estimate is within tolerance of the learner's level; "
+          f"'in zone': questions the learner had a {zone[0]:.0%}-{zone[1]:.0%} chance of answering.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare adaptive difficulty policies on synthetic learners.")
+    parser.add_argument("--grid", action="append", help="key=v1,v2,... (repeat for more keys)")
+    parser.add_argument("--learners", type=int, default=200, help="learners per policy")
+    parser.add_argument("--sessions", type=int, default=5, help="quizzes per learner")
+    parser.add_argument("--questions", type=int, default=12, help="questions per quiz")
+    parser.add_argument("--ops", default="+,-,*,/", help="comma separated operations")
+    parser.add_argument("--ability", type=float, default=2.5, help="mean true ability of the learners")
+    parser.add_argument("--spread", type=float, default=0.8, help="spread of true ability between learners")
+    parser.add_argument("--learning", type=float, default=0.01, help="largest ability gain per attempt")
+    parser.add_argument("--zone", default="0.65,0.85", help="target zone of success chance")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="how close counts as having found the level")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="processes (all cores by default)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    combos = parse_grid(args.grid or DEFAULT_GRID)
+    opts = {
+        "sessions": args.sessions,
+        "questions": args.questions,
+        "ops": [op for op in args.ops.split(",") if op],
+        "ability": args.ability,
+        "spread": args.spread,
+        "learning": args.learning,
+        "zone": tuple(float(z) for z in args.zone.split(",")),
+        "tolerance": args.tolerance,
+    }
+    # the same learners (seeds) face every policy
+    jobs = [(i, params, args.seed * 1_000_003 + n, opts)
+            for i, params in enumerate(combos) for n in range(args.learners)]
+    output_dir = tempfile.mkdtemp(prefix="mathquest_policy_")
+
+    start = time.perf_counter()
+    results = {i: [] for i in range(len(combos))}
+    with multiprocessing.Pool(args.workers, initializer=init_worker, initargs=(output_dir,)) as pool:
+        chunk = max(1, len(jobs) // (args.workers * 16))
+        for combo, metrics in pool.imap_unordered(run_learner, jobs, chunksize=chunk):
+            results[combo].append(metrics)
+    elapsed = time.perf_counter() - start
+
+    rows = summarise(combos, results)
+    print(f"{len(jobs)} simulated learners across {len(combos)} policies on {args.workers} processes "
+          f"in {elapsed:.1f} s")
+    print_report(rows, opts["zone"])
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump({"options": opts, "results": rows}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
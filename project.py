@@ -1,14 +1,33 @@
 # Importing necessary libraries and modules
 import random
+import secrets
 import re
 from collections import Counter
 import os
 import sys
+import atexit
+import cProfile
+import importlib
+import io
+import hashlib
+import heapq
 import json
+import logging
+import logging.handlers
+import sqlite3
+import pstats
+import threading
+import time
+import tracemalloc
+import traceback
+from contextlib import contextmanager, nullcontext
+from fractions import Fraction
+from functools import lru_cache
+from types import SimpleNamespace
 import pyttsx3
 from tkinter import *
-from tkinter import messagebox, filedialog
-from datetime import datetime
+from tkinter import messagebox, filedialog, simpledialog
+from datetime import date, datetime
 from fpdf import FPDF
 import pandas as pd
 import numpy as np
@@ -37,7 +56,10 @@ def resource_path(filename: str) -> str:
 
 def get_output_dir():
     """Return a writable directory for output files."""
-    path = None
+    path = os.environ.get("MATHQUEST_OUTPUT_DIR")
+    if path:
+        os.makedirs(path, exist_ok=True)
+        return path
     if os.path.exists(SAVE_FILE):
         with open(SAVE_FILE, "r") as fh:
             p = fh.read().strip()
@@ -62,20 +84,53 @@ def get_output_dir():
 # Folder where all generated files will be saved
 OUTPUT_DIR = get_output_dir()
 
+# --- Question topics ---
+class Operation:
+    """
+    One entry of ``OPERATIONS``: a topic's name, starting difficulty and ``Topic`` class.
+
+    The class is given by name, either of this module or as
+    ``"module:Class"``, and is only looked up when a question of the topic
+    is first made or marked, so a topic kept in another module is not
+    imported until a quiz asks for it. *worded* topics are asked as "What
+    will be the result of ...?"; *group* picks the box of the home screen.
+    """
+    def __init__(self, key, name, topic, difficulty=2.0, group="more", worded=False):
+        self.key, self.name, self.difficulty = key, name, difficulty
+        self.group, self.worded = group, worded
+        self._topic = topic
+
+    @property
+    def topic(self):
+        if isinstance(self._topic, str):
+            module, _, name = self._topic.rpartition(":")
+            self._topic = getattr(importlib.import_module(module) if module else sys.modules[__name__], name)
+        return self._topic
+
+
+OPERATIONS = {op.key: op for op in [
+    Operation("+", "Addition", "Addition", group="arithmetic", worded=True),
+    Operation("-", "Subtraction", "Subtraction", group="arithmetic", worded=True),
+    # start multiplication slightly easier than other operations
+    Operation("*", "Multiplication", "Multiplication", 1.5, group="arithmetic", worded=True),
+    Operation("/", "Division", "Division", group="arithmetic", worded=True),
+    Operation("fraction", "Fractions", "Fractions"),
+    Operation("factors_primes", "Factors & Primes", "FactorsPrimes"),
+    Operation("prime_factorization", "Prime Factorization", "PrimeFactorization"),
+    Operation("hcf", "HCF", "HCF"),
+    Operation("lcm", "LCM", "LCM"),
+    Operation("expression", "Mixed Operations", "MixedOperations", worded=True),
+]}
+
+
+def topic(S):
+    """The ``Topic`` class of operation *S*."""
+    return OPERATIONS[S].topic
+
+
 # --- Adaptive difficulty settings ---
 DIFFICULTY_FILE = os.path.join(OUTPUT_DIR, "difficulty_scores.json")
-DEFAULT_DIFFICULTY = {
-    "+": 2.0,
-    "-": 2.0,
-    # start multiplication slightly easier than other operations
-    "*": 1.5,
-    "/": 2.0,
-    "fraction": 2.0,
-    "factors_primes": 2.0,
-    "prime_factorization": 2.0,
-    "hcf": 2.0,
-    "lcm": 2.0,
-}
+DEFAULT_DIFFICULTY = {key: op.difficulty for key, op in OPERATIONS.items()}
 
 
 def clamp_percent(values):
@@ -90,16 +145,22 @@ def clamp_percent(values):
 
 
 def load_difficulty_scores():
+    """Return the difficulty scores of the active learner."""
+    return active_learner.scores
+
+
+def save_difficulty_scores(scores):
+    """Persist difficulty scores for the active learner."""
+    active_learner.commit_scores(scores)
+
+
+def load_legacy_difficulty_scores():
+    """Read the pre-profile ``difficulty_scores.json`` if it exists."""
     try:
         with open(DIFFICULTY_FILE, "r") as fh:
             return json.load(fh)
     except Exception:
-        return DEFAULT_DIFFICULTY.copy()
-
-
-def save_difficulty_scores(scores):
-    with open(DIFFICULTY_FILE, "w") as fh:
-        json.dump(scores, fh)
+        return None
 
 
 def write_difficulty_sheet(wb, scores):
@@ -118,10 +179,10 @@ def write_difficulty_sheet(wb, scores):
     diff_ws.append(row)
 
 
-def append_difficulty_session(scores):
+def append_difficulty_session(scores, path=None):
     """Persist difficulty scores to the AllSessions workbook."""
-    path = os.path.join(OUTPUT_DIR, "AllSessions.xlsx")
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    path = path or active_learner.sessions_path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
     if os.path.exists(path):
         wb = load_workbook(path)
     else:
@@ -132,24 +193,697 @@ def append_difficulty_session(scores):
     wb.save(path)
 
 
-difficulty_scores = load_difficulty_scores()
+def build_session_summary(stats, exam_score, question_asked, start_time, end_time, test_start, test_end):
+    """Return the per-operation summary and session metadata tables."""
+    rows = []
+    for k, v in stats.items():
+        total = v["total_questions"]
+        correct = v["correct_answers"]
+        attempts = v["total_attempts"]
+        accuracy = round((correct / total * 100) if total else 0, 2)
+        accuracy = clamp_percent(accuracy)
+        rows.append({
+            "Question Type": op_names.get(k, k),
+            "Total Questions": total,
+            "Correct Answers": correct,
+            "Total Attempts": attempts,
+            "Accuracy (%)": accuracy,
+        })
+
+    df_summary = pd.DataFrame(rows)
+
+    overall_acc = round(exam_score / question_asked * 100, 2) if question_asked else 0
+    overall_acc = clamp_percent(overall_acc)
+    meta = {
+        "Start Time": test_start,
+        "End Time": test_end,
+        "Duration": f"{round((end_time - start_time).total_seconds()/60, 2)} minutes",
+        "Total Questions": question_asked,
+        "Total Correct": exam_score,
+        "Overall Accuracy (%)": overall_acc,
+    }
+    meta_df = pd.DataFrame(list(meta.items()), columns=["Metric", "Value"])
+    return df_summary, meta_df
+
+
+def write_all_sessions_log(path, df_summary, meta_df, start_time, end_time, question_asked):
+    """Create or update an AllSessions workbook with log, index, and summary sheets."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    if os.path.exists(path):
+        wb = load_workbook(path)
+    else:
+        wb = Workbook()
+        # remove default sheet and create Log and Index
+        default = wb.active
+        wb.remove(default)
+        log_ws = wb.create_sheet("Log")
+        log_ws.append([
+            "Date",
+            "Time",
+            "Question Type",
+            "Total Questions",
+            "Correct Answers",
+            "Total Attempts",
+            "Accuracy (%)",
+            "Start Time",
+            "End Time",
+            "Duration",
+        ])
+        idx_ws = wb.create_sheet("Index")
+        idx_ws.append([
+            "Session Number",
+            "Date",
+            "Start Time",
+            "End Time",
+            "Duration",
+            "Total Questions",
+            "Accuracy (%)",
+            "Summary Sheet",
+        ])
+
+    # ensure worksheets exist
+    log_ws = wb["Log"] if "Log" in wb.sheetnames else wb.create_sheet("Log")
+    idx_ws = wb["Index"] if "Index" in wb.sheetnames else wb.create_sheet("Index")
+
+    from openpyxl.utils.dataframe import dataframe_to_rows
+
+    # determine next session number based on summary sheets
+    session_num = len([s for s in wb.sheetnames if s.startswith("Summary_")]) + 1
+    summary_name = f"Summary_{session_num:03d}"
+    summary_ws = wb.create_sheet(summary_name)
+
+    # write summary table
+    for r in dataframe_to_rows(df_summary, index=False, header=True):
+        summary_ws.append(r)
+    summary_ws.append([])
+    for r in dataframe_to_rows(meta_df, index=False, header=True):
+        summary_ws.append(r)
+
+    # append entries to log sheet
+    date_str = start_time.strftime("%Y-%m-%d")
+    time_str = start_time.strftime("%H:%M:%S")
+    start_full = start_time.strftime("%Y-%m-%d %H:%M:%S")
+    end_full = end_time.strftime("%Y-%m-%d %H:%M:%S")
+    duration = round((end_time - start_time).total_seconds() / 60, 2)
+
+    for r in df_summary.to_dict("records"):
+        log_ws.append([
+            date_str,
+            time_str,
+            r["Question Type"],
+            r["Total Questions"],
+            r["Correct Answers"],
+            r["Total Attempts"],
+            r["Accuracy (%)"],
+            start_full,
+            end_full,
+            duration,
+        ])
+
+    # append index row with hyperlink to summary sheet
+    overall_accuracy = clamp_percent(
+        meta_df.loc[meta_df["Metric"] == "Overall Accuracy (%)", "Value"].iloc[0]
+    )
+    idx_row = [
+        session_num,
+        date_str,
+        time_str,
+        end_time.strftime("%H:%M:%S"),
+        duration,
+        question_asked,
+        overall_accuracy,
+    ]
+    idx_ws.append(idx_row + [summary_name])
+    link_cell = idx_ws.cell(row=idx_ws.max_row, column=len(idx_row) + 1)
+    link_cell.hyperlink = f"#{summary_name}!A1"
+    link_cell.style = "Hyperlink"
+
+    wb.save(path)
+
+
+# --- Learner profiles ---
+LEARNER_DB = os.path.join(OUTPUT_DIR, "learners.db")
+DEFAULT_LEARNER = "default"
+
+
+class LearnerStore:
+    """
+    Single SQLite store holding every learner profile, keyed by learner id.
+
+    Each table is indexed by ``learner_id`` first so loading one learner
+    never touches the rows of another. The connection is shared and guarded
+    by a lock so the store can be used from helper threads as well.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS learners (
+            learner_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            created TEXT NOT NULL,
+            last_used TEXT
+        );
+        CREATE TABLE IF NOT EXISTS difficulty (
+            learner_id TEXT NOT NULL,
+            operation TEXT NOT NULL,
+            score REAL NOT NULL,
+            PRIMARY KEY (learner_id, operation)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS difficulty_history (
+            learner_id TEXT NOT NULL,
+            session INTEGER NOT NULL,
+            timestamp TEXT NOT NULL,
+            operation TEXT NOT NULL,
+            score REAL NOT NULL,
+            PRIMARY KEY (learner_id, operation, session)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS latency (
+            learner_id TEXT NOT NULL,
+            session_start TEXT NOT NULL,
+            phase TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            total_ms REAL NOT NULL,
+            max_ms REAL NOT NULL,
+            p50_ms REAL,
+            p95_ms REAL,
+            buckets TEXT NOT NULL,
+            PRIMARY KEY (learner_id, session_start, phase)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS attempts (
+            learner_id TEXT NOT NULL,
+            session_start TEXT NOT NULL,
+            question INTEGER NOT NULL,
+            attempt INTEGER NOT NULL,
+            operation TEXT NOT NULL,
+            level TEXT,
+            correct INTEGER NOT NULL,
+            displayed_ms REAL NOT NULL,
+            first_key_ms REAL,
+            last_edit_ms REAL,
+            submit_ms REAL NOT NULL,
+            difficulty REAL,
+            rating REAL,
+            answer TEXT,
+            PRIMARY KEY (learner_id, session_start, question, attempt)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS reviews (
+            learner_id TEXT NOT NULL,
+            item INTEGER NOT NULL,
+            operation TEXT NOT NULL,
+            due REAL NOT NULL,
+            easiness REAL NOT NULL,
+            repetitions INTEGER NOT NULL,
+            interval REAL NOT NULL,
+            paper TEXT NOT NULL,
+            nominal REAL,
+            PRIMARY KEY (learner_id, item)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS sessions (
+            learner_id TEXT NOT NULL,
+            session_start TEXT NOT NULL,
+            seed INTEGER NOT NULL,
+            record TEXT NOT NULL,
+            PRIMARY KEY (learner_id, session_start)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS ability (
+            learner_id TEXT NOT NULL,
+            operation TEXT NOT NULL,
+            rating REAL NOT NULL,
+            attempts INTEGER NOT NULL,
+            PRIMARY KEY (learner_id, operation)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.RLock()
+        self._conn = None
+        self._profiles = {}
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(self.SCHEMA)
+            # older attempts tables lack the calibration and replay columns
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(attempts)")}
+            for column, kind in (("difficulty", "REAL"), ("rating", "REAL"), ("answer", "TEXT")):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE attempts ADD COLUMN {column} {kind}")
+        return self._conn
+
+    def list_learners(self):
+        """Return ``(learner_id, name)`` pairs, most recently used first."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT learner_id, name FROM learners "
+                "ORDER BY COALESCE(last_used, created) DESC, name"
+            ).fetchall()
+        return rows
+
+    def add_learner(self, name):
+        """Create a learner profile for *name* and return its id."""
+        name = name.strip()
+        if not name:
+            raise ValueError("Learner name cannot be empty")
+        base = re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_") or "learner"
+        with self.lock:
+            learner_id, n = base, 1
+            while self.conn.execute(
+                "SELECT 1 FROM learners WHERE learner_id = ?", (learner_id,)
+            ).fetchone():
+                n += 1
+                learner_id = f"{base}_{n}"
+            self.conn.execute(
+                "INSERT INTO learners (learner_id, name, created) VALUES (?, ?, ?)",
+                (learner_id, name, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+            )
+            self.conn.commit()
+        return learner_id
+
+    def find_learner(self, name):
+        """Return the id of the learner called *name*, if any."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT learner_id FROM learners WHERE name = ? COLLATE NOCASE",
+                (name.strip(),),
+            ).fetchone()
+        return row[0] if row else None
+
+    def ensure_default(self):
+        """Create the default learner used before profiles existed."""
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO learners (learner_id, name, created) VALUES (?, ?, ?)",
+                (DEFAULT_LEARNER, "Default", datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+            )
+            self.conn.commit()
+
+    def profile(self, learner_id):
+        """Return the (cached) profile for *learner_id* without loading its data."""
+        prof = self._profiles.get(learner_id)
+        if prof is None:
+            with self.lock:
+                row = self.conn.execute(
+                    "SELECT name FROM learners WHERE learner_id = ?", (learner_id,)
+                ).fetchone()
+            if row is None:
+                raise KeyError(learner_id)
+            prof = LearnerProfile(self, learner_id, row[0])
+            self._profiles[learner_id] = prof
+        return prof
+
+    def touch(self, learner_id):
+        with self.lock:
+            self.conn.execute(
+                "UPDATE learners SET last_used = ? WHERE learner_id = ?",
+                (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), learner_id),
+            )
+            self.conn.commit()
+
+    def load_scores(self, learner_id):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT operation, score FROM difficulty WHERE learner_id = ?",
+                (learner_id,),
+            ).fetchall()
+        return dict(rows)
+
+    def load_history(self, learner_id):
+        """Return ``{operation: [score, ...]}`` ordered by session."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT operation, score FROM difficulty_history "
+                "WHERE learner_id = ? ORDER BY operation, session",
+                (learner_id,),
+            ).fetchall()
+        history = {}
+        for op, score in rows:
+            history.setdefault(op, []).append(score)
+        return history
+
+    def save_scores(self, learner_id, scores, record_history=True, timestamp=None):
+        """Store *scores* and optionally append them as a new history session."""
+        timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self.lock:
+            conn = self.conn
+            conn.executemany(
+                "INSERT OR REPLACE INTO difficulty (learner_id, operation, score) VALUES (?, ?, ?)",
+                [(learner_id, op, float(val)) for op, val in scores.items()],
+            )
+            if record_history:
+                session = conn.execute(
+                    "SELECT COALESCE(MAX(session), 0) + 1 FROM difficulty_history WHERE learner_id = ?",
+                    (learner_id,),
+                ).fetchone()[0]
+                conn.executemany(
+                    "INSERT INTO difficulty_history VALUES (?, ?, ?, ?, ?)",
+                    [(learner_id, session, timestamp, op, float(val)) for op, val in scores.items()],
+                )
+            conn.commit()
+
+    def load_ability(self, learner_id):
+        """Return ``{operation: [rating, attempts]}`` for one learner."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT operation, rating, attempts FROM ability WHERE learner_id = ?",
+                (learner_id,),
+            ).fetchall()
+        return {op: [rating, n] for op, rating, n in rows}
+
+    def save_ability(self, learner_id, state):
+        with self.lock:
+            conn = self.conn
+            conn.executemany(
+                "INSERT OR REPLACE INTO ability VALUES (?, ?, ?, ?)",
+                [(learner_id, op, float(rating), int(n)) for op, (rating, n) in state.items()],
+            )
+            conn.commit()
+
+    ATTEMPT_FIELDS = ["question", "attempt", "operation", "level", "correct",
+                      "displayed_ms", "first_key_ms", "last_edit_ms", "submit_ms", "difficulty", "rating",
+                      "answer"]
+
+    def save_attempts(self, learner_id, session_start, attempts):
+        """Store the response timestamps and answers of every attempt in one session."""
+        with self.lock:
+            conn = self.conn
+            conn.executemany(
+                f"INSERT OR REPLACE INTO attempts VALUES ({', '.join('?' * (len(self.ATTEMPT_FIELDS) + 2))})",
+                [(learner_id, session_start) + tuple(a[f] for f in self.ATTEMPT_FIELDS) for a in attempts],
+            )
+            conn.commit()
+
+    def load_attempts(self, learner_id, session_start=None):
+        """Return a learner's attempts, or one session's, as dicts, oldest first."""
+        sql = "SELECT session_start, " + ", ".join(self.ATTEMPT_FIELDS) + " FROM attempts WHERE learner_id = ?"
+        params = (learner_id,)
+        if session_start is not None:
+            sql += " AND session_start = ?"
+            params += (session_start,)
+        with self.lock:
+            rows = self.conn.execute(sql + " ORDER BY session_start, question, attempt", params).fetchall()
+        return [dict(zip(["session_start"] + self.ATTEMPT_FIELDS, row)) for row in rows]
+
+    def save_session(self, learner_id, session_start, record):
+        """Store the seed and starting state of one session (see ``QuizSession.record``)."""
+        with self.lock:
+            conn = self.conn
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?)",
+                (learner_id, session_start, record["seed"], json.dumps(record)),
+            )
+            conn.commit()
+
+    def load_session(self, learner_id, session_start=None):
+        """Return a stored session record, the latest one by default, or ``None``."""
+        sql = "SELECT session_start, record FROM sessions WHERE learner_id = ?"
+        params = (learner_id,)
+        if session_start is not None:
+            sql += " AND session_start = ?"
+            params += (session_start,)
+        with self.lock:
+            row = self.conn.execute(sql + " ORDER BY session_start DESC LIMIT 1", params).fetchone()
+        if row is None:
+            return None
+        return dict(json.loads(row[1]), session_start=row[0])
+
+    def save_latency(self, learner_id, session_start, phases):
+        """Store the per-phase latency histograms of one session."""
+        with self.lock:
+            conn = self.conn
+            conn.executemany(
+                "INSERT OR REPLACE INTO latency VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(learner_id, session_start, phase, h["count"], h["total_ms"], h["max_ms"],
+                  h["p50_ms"], h["p95_ms"], json.dumps(h["buckets"])) for phase, h in phases.items()],
+            )
+            conn.commit()
+
 
+class LearnerProfile:
+    """
+    One learner's adaptive state.
 
-op_names = {
-    "+": "Addition",
-    "-": "Subtraction",
-    "*": "Multiplication",
-    "/": "Division",
-    "fraction": "Fractions",
-    "factors_primes": "Factors & Primes",
-    "prime_factorization": "Prime Factorization",
-    "hcf": "HCF",
-    "lcm": "LCM",
-}
+    Scores, history and thresholds are read from the store on first access
+    only, so creating or switching to a profile is instant.
+    """
 
+    def __init__(self, store, learner_id, name):
+        self.store = store
+        self.learner_id = learner_id
+        self.name = name
+        self._scores = None
+        self._history = None
+        self._thresholds = None
+        self._ability = None
+        self._mastery = None
+        self._recent = None
+        self._reviews = None
+        # one writer at a time per learner, as sessions share a workbook
+        self.save_lock = threading.Lock()
 
-def load_difficulty_history():
-    path = os.path.join(OUTPUT_DIR, "AllSessions.xlsx")
+    @property
+    def output_dir(self):
+        if self.learner_id == DEFAULT_LEARNER:
+            return OUTPUT_DIR
+        return os.path.join(OUTPUT_DIR, "learners", self.learner_id)
+
+    @property
+    def sessions_path(self):
+        return os.path.join(self.output_dir, "AllSessions.xlsx")
+
+    @property
+    def checkpoint_path(self):
+        return os.path.join(self.output_dir, "session_checkpoint.jsonl")
+
+    @property
+    def scores(self):
+        if self._scores is None:
+            scores = DEFAULT_DIFFICULTY.copy()
+            stored = self.store.load_scores(self.learner_id)
+            if not stored and self.learner_id == DEFAULT_LEARNER:
+                stored = self._import_legacy()
+            scores.update(stored)
+            self._scores = scores
+        return self._scores
+
+    @property
+    def history(self):
+        if self._history is None:
+            self._history = self.store.load_history(self.learner_id)
+        return self._history
+
+    @property
+    def thresholds(self):
+        if self._thresholds is None:
+            self._thresholds = compute_thresholds(self.history, self.scores)
+        return self._thresholds
+
+    @property
+    def ability(self):
+        if self._ability is None:
+            self._ability = AbilityEstimator(self.store.load_ability(self.learner_id), self.scores)
+        return self._ability
+
+    @property
+    def mastery(self):
+        if self._mastery is None:
+            self._mastery = FactMastery(os.path.join(self.output_dir, "fact_mastery.bin"))
+        return self._mastery
+
+    @property
+    def recent(self):
+        if self._recent is None:
+            self._recent = RecentQuestions(os.path.join(self.output_dir, "recent_questions.bin"))
+        return self._recent
+
+    @property
+    def reviews(self):
+        if self._reviews is None:
+            self._reviews = ReviewQueue(self.store, self.learner_id)
+        return self._reviews
+
+    def commit_state(self, state=None):
+        """
+        Save the learner's per-attempt state: the ability ratings (or *state*,
+        a snapshot taken by ``QuizSession.apply``), and the fact mastery and
+        recent-question files.
+        """
+        if state is None and self._ability is not None:
+            state = self._ability.state
+        if state is not None:
+            self.store.save_ability(self.learner_id, state)
+        if self._mastery is not None:
+            self._mastery.flush()
+        if self._recent is not None:
+            self._recent.flush()
+
+    def commit_scores(self, scores):
+        """Save end-of-session scores and extend the cached history."""
+        self.store.save_scores(self.learner_id, scores)
+        self.remember_scores(scores)
+
+    def remember_scores(self, scores):
+        """Extend the cached history with end-of-session scores, without writing them."""
+        if self._history is not None:
+            for op, val in scores.items():
+                self._history.setdefault(op, []).append(float(val))
+        self._thresholds = None
+
+    def _import_legacy(self):
+        """Carry over scores and history written before profiles existed."""
+        legacy = load_legacy_difficulty_scores() or {}
+        history = load_difficulty_history(self.sessions_path, list(DEFAULT_DIFFICULTY))
+        if history:
+            sessions = max(len(v) for v in history.values())
+            for i in range(sessions):
+                row = {op: vals[i] for op, vals in history.items() if i < len(vals)}
+                self.store.save_scores(self.learner_id, row, timestamp="imported")
+        if legacy:
+            self.store.save_scores(self.learner_id, legacy, record_history=False)
+        return legacy
+
+
+class ReviewQueue:
+    """
+    Spaced-repetition queue of one learner's missed questions.
+
+    A question still wrong after the last attempt joins the queue, due a
+    day later. Due items replace up to a quarter of a later session's
+    planned questions. Reviews are scheduled with SM-2. A right answer at
+    the first, second or third attempt rates 5, 4 or 3 and a miss rates 1.
+    A miss starts over at one day. Otherwise the interval goes 1 day, 6
+    days, then grows by the item's easiness. After ``RETIRE_AFTER`` right
+    reviews in a row the item leaves the queue.
+
+    Items are rows of the ``reviews`` table. Their due times sit in a heap,
+    so adding and taking an item are O(log n). The heap is read from the
+    store the first time a session asks for reviews, never at startup. An
+    item taken by a session that is never finished is offered again once
+    the queue is next loaded.
+    """
+
+    QUALITY = {1: 5, 2: 4, 3: 3}
+    FAILED = 1
+    RETIRE_AFTER = 4
+    SHARE = 4
+    DAY = 86400
+
+    def __init__(self, store, learner_id):
+        self.store = store
+        self.learner_id = learner_id
+        self._heap = None
+        self._due = {}
+        self._next = 1
+
+    @property
+    def heap(self):
+        if self._heap is None:
+            with self.store.lock:
+                rows = self.store.conn.execute(
+                    "SELECT item, due, operation FROM reviews WHERE learner_id = ?", (self.learner_id,)
+                ).fetchall()
+            self._heap = [(due, item, op) for item, due, op in rows]
+            heapq.heapify(self._heap)
+            # heap entries whose due time no longer matches were rescheduled and are skipped
+            self._due = {item: due for item, due, _ in rows}
+            self._next = max(self._due, default=0) + 1
+        return self._heap
+
+    def __len__(self):
+        self.heap
+        return len(self._due)
+
+    def take(self, operations, limit, now=None):
+        """Remove and return up to *limit* due items of *operations*, earliest due first."""
+        now = time.time() if now is None else now
+        with self.store.lock:
+            heap, taken, other = self.heap, [], []
+            while heap and heap[0][0] <= now and len(taken) < limit:
+                entry = heapq.heappop(heap)
+                due, item, op = entry
+                if self._due.get(item) != due:
+                    continue
+                if op not in operations:
+                    other.append(entry)
+                    continue
+                easiness, repetitions, interval, paper, nominal = self.store.conn.execute(
+                    "SELECT easiness, repetitions, interval, paper, nominal FROM reviews "
+                    "WHERE learner_id = ? AND item = ?", (self.learner_id, item),
+                ).fetchone()
+                taken.append({"item": item, "operation": op, "paper": json.loads(paper), "nominal": nominal,
+                              "easiness": easiness, "repetitions": repetitions, "interval": interval})
+            for entry in other:
+                heapq.heappush(heap, entry)
+        return taken
+
+    @staticmethod
+    def schedule(easiness, repetitions, interval, quality):
+        """Return the SM-2 ``(easiness, repetitions, interval in days)`` after a review rated *quality*."""
+        easiness = max(1.3, easiness + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+        if quality < 3:
+            return easiness, 0, 1.0
+        repetitions += 1
+        if repetitions == 1:
+            interval = 1.0
+        elif repetitions == 2:
+            interval = 6.0
+        else:
+            interval = round(interval * easiness)
+        return easiness, repetitions, interval
+
+    def record(self, outcomes, now=None):
+        """Apply a finished session's review outcomes (see ``review_outcome``) in one transaction."""
+        if not outcomes:
+            return
+        now = time.time() if now is None else now
+        with self.store.lock:
+            heap, conn = self.heap, self.store.conn
+            for o in outcomes:
+                item = o["item"]
+                if item is None:
+                    item, self._next = self._next, self._next + 1
+                    state = (2.5, 0, 0.0)
+                else:
+                    state = conn.execute(
+                        "SELECT easiness, repetitions, interval FROM reviews WHERE learner_id = ? AND item = ?",
+                        (self.learner_id, item),
+                    ).fetchone()
+                    if state is None:
+                        continue
+                easiness, repetitions, interval = self.schedule(*state, o["quality"])
+                if repetitions >= self.RETIRE_AFTER:
+                    conn.execute("DELETE FROM reviews WHERE learner_id = ? AND item = ?", (self.learner_id, item))
+                    self._due.pop(item, None)
+                    continue
+                due = now + interval * self.DAY
+                conn.execute(
+                    "INSERT OR REPLACE INTO reviews VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (self.learner_id, item, o["operation"], due, easiness, repetitions, interval,
+                     json.dumps(o["paper"]), o["nominal"]),
+                )
+                self._due[item] = due
+                heapq.heappush(heap, (due, item, o["operation"]))
+            conn.commit()
+
+
+def set_active_learner(learner_id):
+    """Switch the adaptive state used by the quiz to *learner_id*."""
+    global active_learner, difficulty_scores
+    active_learner = learner_store.profile(learner_id)
+    difficulty_scores = active_learner.scores
+    learner_store.touch(learner_id)
+    return active_learner
+
+
+op_names = {key: op.name for key, op in OPERATIONS.items()}
+
+
+def load_difficulty_history(path=None, ops=None):
+    """Read the Difficulty sheet of a workbook (the active learner's by default)."""
+    path = path or active_learner.sessions_path
+    ops = ops if ops is not None else list(difficulty_scores.keys())
     if not os.path.exists(path):
         return {}
     try:
@@ -159,48 +893,1113 @@ def load_difficulty_history():
     history = {}
     if set(["Operation", "Difficulty Score"]).issubset(df.columns):
         grouped = df.groupby("Operation")
-        for key in difficulty_scores.keys():
+        for key in ops:
             name = op_names.get(key, key)
             if name in grouped.groups:
                 vals = grouped.get_group(name)["Difficulty Score"].dropna().tolist()
                 history[key] = vals
     else:
-        for op in difficulty_scores.keys():
+        for op in ops:
             col = op_names.get(op, op)
             if col in df.columns:
                 history[op] = df[col].dropna().tolist()
     return history
 
 
-def compute_thresholds(history):
+def compute_thresholds(history, scores=None):
+    scores = difficulty_scores if scores is None else scores
     stats = {}
     for op, vals in history.items():
         if vals:
             mean = float(np.mean(vals))
             std = float(np.std(vals))
         else:
-            mean = difficulty_scores.get(op, 2.0)
+            mean = scores.get(op, 2.0)
             std = 0.0
         stats[op] = (mean, std)
-    for op in difficulty_scores.keys():
+    for op in scores.keys():
         if op not in stats:
-            stats[op] = (difficulty_scores.get(op, 2.0), 0.0)
+            stats[op] = (scores.get(op, 2.0), 0.0)
     return stats
 
 
-def determine_difficulty_levels(scores, stats):
+def determine_difficulty_levels(scores, stats, split=1.0):
+    """Label each operation Easy, Medium or Hard by how far its score sits from its history."""
     levels = {}
     for op, val in scores.items():
         mean, std = stats.get(op, (val, 0.0))
-        if val < mean - std:
+        if val < mean - split * std:
             levels[op] = "Easy"
-        elif val > mean + std:
+        elif val > mean + split * std:
             levels[op] = "Hard"
         else:
             levels[op] = "Medium"
     return levels
 
 
+def load_progress_frames(path):
+    """Read the Log and Index sheets and tag each log row with its session."""
+    log_df = pd.read_excel(path, sheet_name="Log")
+    idx_df = pd.read_excel(path, sheet_name="Index")
+    return prepare_progress_frames(log_df, idx_df)
+
+
+def prepare_progress_frames(log_df, idx_df):
+    log_df["Accuracy (%)"] = clamp_percent(log_df["Accuracy (%)"])
+    idx_df["Accuracy (%)"] = clamp_percent(idx_df["Accuracy (%)"])
+
+    # The log sheet stores start times with a date component while the
+    # index only contains the time. Extract the time portion before
+    # merging so we can match rows correctly.
+    log_df["_time"] = log_df["Start Time"].astype(str).str[-8:]
+    idx_df["_time"] = idx_df["Start Time"].astype(str).str[-8:]
+    log_df = log_df.merge(idx_df[["_time", "Session Number"]], on="_time", how="left")
+    log_df.drop(columns=["_time"], inplace=True)
+
+    # Use forward fill for the session numbers so consecutive rows share
+    # the appropriate session identifier.
+    log_df["Session Number"] = log_df["Session Number"].ffill()
+    return log_df, idx_df
+
+
+def accuracy_by_session(log_df):
+    """Mean accuracy per session (rows) and question type (columns)."""
+    data = (
+        log_df.groupby(["Session Number", "Question Type"])["Accuracy (%)"].mean().reset_index()
+    )
+    data["Accuracy (%)"] = clamp_percent(data["Accuracy (%)"])
+    return data.pivot(index="Session Number", columns="Question Type", values="Accuracy (%)")
+
+
+def accuracy_by_topic(log_df):
+    return log_df.groupby("Question Type").apply(
+        lambda g: clamp_percent(g["Correct Answers"].sum() / g["Total Questions"].sum() * 100)
+    )
+
+
+def attempts_by_topic(log_df):
+    return log_df.groupby("Question Type").apply(
+        lambda g: g["Total Attempts"].sum() / g["Total Questions"].sum()
+    )
+
+
+def questions_by_topic(log_df):
+    return log_df.groupby("Question Type")["Total Questions"].sum()
+
+
+def difficulty_frame(diff_hist):
+    """Difficulty history as one column per operation, indexed by session."""
+    max_len = max(len(v) for v in diff_hist.values())
+    df = pd.DataFrame({op_names.get(k, k): v + [None] * (max_len - len(v)) for k, v in diff_hist.items()})
+    df.index = range(1, max_len + 1)
+    return df
+
+
+def difficulty_with_accuracy(log_df, diff_hist):
+    """Join each session's difficulty score onto its log rows."""
+    rows = []
+    for op, vals in diff_hist.items():
+        for i, val in enumerate(vals, start=1):
+            rows.append(
+                {
+                    "Session Number": i,
+                    "Question Type": op_names.get(op, op),
+                    "Difficulty Score": val,
+                }
+            )
+    diff_df = pd.DataFrame(rows)
+    return log_df.merge(diff_df, on=["Session Number", "Question Type"], how="inner")
+
+
+class SessionRandom:
+    """
+    Random streams for one quiz session, all derived from one seed.
+
+    The question plan, the questions and the feedback phrases each draw
+    from their own stream. The questions therefore depend only on the seed
+    and the learner's answers, not on how often feedback was spoken. The
+    seed is stored with the session so ``replay_session`` can regenerate it.
+    """
+
+    def __init__(self, seed=None):
+        self.seed = secrets.randbits(32) if seed is None else int(seed)
+        self.plan = random.Random(f"{self.seed}:plan")
+        self.questions = random.Random(f"{self.seed}:questions")
+        self.feedback = random.Random(f"{self.seed}:feedback")
+
+
+# most questions one quiz may ask, in the app and from classroom clients
+MAX_QUESTIONS = 100
+
+
+def build_question_plan(operations, total, levels, rng=None):
+    """Return a shuffled list of ``(operation, level)`` pairs for a session."""
+    rng = random if rng is None else rng
+    operations = [op for op in operations if op not in (None, "", "0")]
+    base = total // 3
+    dist = {"Easy": base, "Medium": base, "Hard": base}
+    for i in range(total - base * 3):
+        dist[["Easy", "Medium", "Hard"][i]] += 1
+
+    ops_by_level = {"Easy": [], "Medium": [], "Hard": []}
+    for op in operations:
+        ops_by_level[levels.get(op, "Medium")].append(op)
+
+    plan = []
+    for lvl in ["Easy", "Medium", "Hard"]:
+        ops = ops_by_level[lvl] or operations
+        for _ in range(dist[lvl]):
+            plan.append((rng.choice(ops), lvl))
+    rng.shuffle(plan)
+    return plan
+
+
+# offset of each planned level from an operation's difficulty score
+LEVEL_ADJUST = {"Easy": -0.5, "Medium": 0.0, "Hard": 0.5}
+
+
+class AbilityEstimator:
+    """
+    Online Elo-style ability estimate per operation.
+
+    Ratings share the scale of the difficulty scores. The chance of a
+    correct attempt is ``1 / (1 + exp(-SLOPE * (rating - difficulty)))``.
+    After the first attempt at every question the rating moves towards the
+    result, by a step that starts large and shrinks as questions build up.
+    Retries are not counted: they depend on the first try and would count
+    one miss several times. This matches ``calibrate.py``, which fits on
+    first attempts. A new learner settles within a handful of questions and
+    then stays steady.
+    The next question is pitched where the expected success rate is
+    ``TARGET``. The state is just ``[rating, attempts]`` per operation.
+
+    Keyword arguments (``target``, ``slope``, ``k_max``, ``k_min``,
+    ``k_decay``) override the class settings for one estimator, which is
+    how ``policy_sim.py`` tries alternatives.
+    """
+
+    SLOPE = 1.7
+    TARGET = 0.75
+    K_MAX, K_MIN, K_DECAY = 0.8, 0.12, 0.12
+    MIN_DIFFICULTY, MAX_DIFFICULTY = 1.0, 6.0
+    OFFSET = math.log(TARGET / (1 - TARGET)) / SLOPE
+
+    def __init__(self, state=None, scores=None, **params):
+        self.state = dict(state or {})
+        self.scores = DEFAULT_DIFFICULTY if scores is None else scores
+        for name, value in params.items():
+            if name.upper() not in ("TARGET", "SLOPE", "K_MAX", "K_MIN", "K_DECAY"):
+                raise TypeError(f"unknown estimator setting {name!r}")
+            setattr(self, name.upper(), value)
+        if params:
+            self.OFFSET = math.log(self.TARGET / (1 - self.TARGET)) / self.SLOPE
+
+    def _entry(self, op):
+        entry = self.state.get(op)
+        if entry is None:
+            # start from the stored score so existing learners carry on where they were
+            entry = self.state[op] = [self.scores.get(op, DEFAULT_DIFFICULTY.get(op, 2.0)) + self.OFFSET, 0]
+        return entry
+
+    def rating(self, op):
+        return self._entry(op)[0]
+
+    def expected(self, op, difficulty):
+        return 1 / (1 + math.exp(-self.SLOPE * (self._entry(op)[0] - difficulty)))
+
+    def difficulty(self, op):
+        """Difficulty score at which the learner should succeed ``TARGET`` of the time."""
+        return min(self.MAX_DIFFICULTY, max(self.MIN_DIFFICULTY, self._entry(op)[0] - self.OFFSET))
+
+    def update(self, op, difficulty, correct):
+        """Fold the first attempt at a question of *difficulty* into the rating."""
+        entry = self._entry(op)
+        p = 1 / (1 + math.exp(-self.SLOPE * (entry[0] - difficulty)))
+        k = max(self.K_MIN, self.K_MAX / (1 + self.K_DECAY * entry[1]))
+        entry[0] += k * ((1.0 if correct else 0.0) - p)
+        entry[1] += 1
+
+    def apply_to(self, scores, stats):
+        """Set the scores of the operations practised in *stats* from the ratings."""
+        for op, data in stats.items():
+            if data.get("total_questions", 0):
+                scores[op] = round(self.difficulty(op), 2)
+
+
+def alias_table(weights):
+    """
+    Build Vose alias tables for drawing index ``i`` with probability ``weights[i] / sum(weights)``.
+
+    Building is linear in the number of weights; every draw from the
+    tables (``alias_draw``) then takes constant time.
+    """
+    n = len(weights)
+    scaled = (np.asarray(weights, dtype=float) * n / np.sum(weights)).tolist()
+    prob, alias = [1.0] * n, list(range(n))
+    small = [i for i, w in enumerate(scaled) if w < 1]
+    large = [i for i, w in enumerate(scaled) if w >= 1]
+    while small and large:
+        lo, hi = small.pop(), large.pop()
+        prob[lo], alias[lo] = scaled[lo], hi
+        scaled[hi] -= 1 - scaled[lo]
+        (small if scaled[hi] < 1 else large).append(hi)
+    return prob, alias
+
+
+def alias_draw(table, rng):
+    prob, alias = table
+    i = rng.randrange(len(prob))
+    return i if rng.random() < prob[i] else alias[i]
+
+
+def digit_count(values):
+    return np.floor(np.log10(np.maximum(values, 1))).astype(np.int64) + 1
+
+
+def digits_of(values, columns):
+    """Decimal digits of each value, units first, as an ``(n, columns)`` array."""
+    return (values[:, None] // 10 ** np.arange(columns, dtype=np.int64)) % 10
+
+
+def carry_load(op, X, Y, Z=None):
+    """
+    Written-method effort of whole batches of arithmetic items, from 0 to 1.
+
+    Operands are decomposed into digit columns with NumPy, and the column
+    loop runs across the batch at once. The effort counted is:
+
+    * ``+``: carries, over the columns of the longest operand;
+    * ``-``: borrows, plus borrows through a zero digit;
+    * ``*``: carries inside every partial product, plus the partial
+      products to add up;
+    * ``/``: quotient digits above 1 and the carries of multiplying the
+      divisor by each quotient digit.
+
+    Each count is divided by the most the item's digit counts allow.
+    """
+    X, Y = np.asarray(X, dtype=np.int64), np.asarray(Y, dtype=np.int64)
+    effort = np.zeros(len(X))
+    if op == "+":
+        operands = [X, Y] if Z is None else [X, Y, np.asarray(Z, dtype=np.int64)]
+        size = digit_count(np.maximum.reduce(operands))
+        columns = int(size.max()) + 1
+        column_sums = sum(digits_of(v, columns) for v in operands)
+        carry = np.zeros(len(X), dtype=np.int64)
+        for j in range(columns):
+            carry = (column_sums[:, j] + carry) // 10
+            effort += carry > 0
+        return np.minimum(1.0, effort / size)
+    if op == "-":
+        size = digit_count(X)
+        columns = int(size.max())
+        dx, dy = digits_of(X, columns), digits_of(Y, columns)
+        borrow = np.zeros(len(X), dtype=bool)
+        for j in range(columns):
+            # regrouping through a zero digit is the classic stumbling block
+            effort += borrow & (dx[:, j] == 0)
+            borrow = dx[:, j] - borrow < dy[:, j]
+            effort += borrow
+        return np.minimum(1.0, effort / size)
+    if op == "*":
+        size_x, size_y = digit_count(X), digit_count(Y)
+        dx, dy = digits_of(X, int(size_x.max())), digits_of(Y, int(size_y.max()))
+        effort += (dy > 0).sum(axis=1) - 1
+        for j in range(dy.shape[1]):
+            carry = np.zeros(len(X), dtype=np.int64)
+            for i in range(dx.shape[1]):
+                carry = (dx[:, i] * dy[:, j] + carry) // 10
+                effort += carry > 0
+        return np.clip(effort / (size_x * size_y + size_y - 1), 0.0, 1.0)
+    if op == "/":
+        Q = X // Y
+        size_q, size_y = digit_count(Q), digit_count(Y)
+        dq, dy = digits_of(Q, int(size_q.max())), digits_of(Y, int(size_y.max()))
+        for k in range(dq.shape[1]):
+            q = dq[:, k]
+            effort += q > 1
+            carry = np.zeros(len(X), dtype=np.int64)
+            for i in range(dy.shape[1]):
+                carry = (dy[:, i] * q + carry) // 10
+                effort += carry > 0
+        return np.minimum(1.0, effort / (size_q * (size_y + 1)))
+    raise ValueError(f"no carry model for {op!r}")
+
+
+def shuffled(items, rng):
+    """Yield *items* in random order, shuffling only as far as the caller reads."""
+    items = list(items)
+    for i in range(len(items)):
+        j = rng.randrange(i, len(items))
+        items[i], items[j] = items[j], items[i]
+        yield items[i]
+
+
+def farey(order):
+    """Every reduced fraction from 0/1 to 1/1 with a denominator up to *order*, in increasing order."""
+    a, b, c, d = 0, 1, 1, order
+    sequence = [(a, b)]
+    while c <= order:
+        k = (order + b) // d
+        a, b, c, d = c, d, k * c - a, k * d - b
+        sequence.append((a, b))
+    return sequence
+
+
+class FractionChoices:
+    """
+    Multiple-choice fraction sums, with their wrong choices worked out once.
+
+    The table holds every sum the easy and medium fraction questions can
+    ask whose answer is below one. It is split into like and unlike
+    denominators, and each entry comes with ``CHOICES - 1`` wrong answers
+    taken from the usual slips:
+
+    * adding the denominators as well (``1/4 + 2/4 = 3/8``);
+    * a numerator off by one.
+
+    When those run short, the answer's neighbours in the Farey sequence of
+    order ``ORDER`` fill in, so every wrong choice is a nearby fraction. No
+    two choices are equal in value, so an equivalent form of the answer is
+    never offered as a wrong one. The
+    table is built on first use, and a question is then one random index
+    into it plus a shuffle of the choices.
+    """
+
+    ORDER = 12
+    CHOICES = 4
+    # most parts a choice's bar is cut into, so the bars stay readable
+    MAX_PARTS = 16
+    # share of easy and medium fraction questions asked as multiple choice
+    SHARE = 0.5
+    _tables = None
+
+    @classmethod
+    def tables(cls):
+        if cls._tables is None:
+            sequence = farey(cls.ORDER)
+            neighbours = {f: [sequence[j] for j in (i - 1, i + 1, i - 2, i + 2) if 0 < j < len(sequence)]
+                          for i, f in enumerate(sequence)}
+            like = [cls.entry((a, d), (b, d), neighbours)
+                    for d in range(3, 7) for a in range(1, d - 1) for b in range(1, d - a)]
+            unlike = [cls.entry((n1, d1), (n2, d2), neighbours)
+                      for d1 in range(2, 9) for d2 in range(2, 9) if d1 != d2
+                      for n1 in range(1, d1) for n2 in range(1, d2) if n1 * d2 + n2 * d1 < d1 * d2]
+            cls._tables = {
+                band: [e for e in entries if e and len(e[3]) == cls.CHOICES - 1]
+                for band, entries in (("like", like), ("unlike", unlike))
+            }
+        return cls._tables
+
+    @classmethod
+    def entry(cls, first, second, neighbours):
+        (n1, d1), (n2, d2) = first, second
+        l = d1 * d2 // math.gcd(d1, d2)
+        total = n1 * (l // d1) + n2 * (l // d2)
+        g = math.gcd(total, l)
+        answer = (total // g, l // g)
+        if answer not in neighbours:
+            # the simplest form has too many parts to draw
+            return None
+        wrong, values = [], {Fraction(*answer)}
+        slips = [(n1 + n2, d1 + d2), (answer[0] + 1, answer[1]), (answer[0] - 1, answer[1])]
+        for w in slips + neighbours[answer]:
+            if 0 < w[0] <= w[1] <= cls.MAX_PARTS and Fraction(*w) not in values:
+                values.add(Fraction(*w))
+                wrong.append(w)
+        return first, second, answer, wrong[:cls.CHOICES - 1]
+
+    @classmethod
+    def draw(cls, band, rng):
+        """Return ``(first, second, answer, choices)`` for a random sum of *band* ("like" or "unlike")."""
+        first, second, answer, wrong = rng.choice(cls.tables()[band])
+        choices = [answer] + wrong
+        rng.shuffle(choices)
+        return first, second, answer, choices
+
+
+EXPRESSION_SYMBOLS = {"+": "+", "-": "-", "*": "×", "/": "÷"}
+PRECEDENCE = {"+": 1, "-": 1, "*": 2, "/": 2}
+
+
+def evaluate_expression(tree):
+    """Exact value of an expression tree as a ``Fraction``; a tree is an int or ``(op, left, right)``."""
+    if not isinstance(tree, tuple):
+        return Fraction(tree)
+    op, left, right = tree
+    a, b = evaluate_expression(left), evaluate_expression(right)
+    if op == "+":
+        return a + b
+    if op == "-":
+        return a - b
+    if op == "*":
+        return a * b
+    return a / b
+
+
+def expression_text(tree):
+    """Write *tree* the way it is printed in a book, with only the brackets it needs."""
+    if not isinstance(tree, tuple):
+        return str(tree)
+    op, left, right = tree
+    a, b = expression_text(left), expression_text(right)
+    if isinstance(left, tuple) and PRECEDENCE[left[0]] < PRECEDENCE[op]:
+        a = f"({a})"
+    # a - (b + c) and a ÷ (b × c) need brackets on the right even at equal precedence
+    if isinstance(right, tuple) and (PRECEDENCE[right[0]] < PRECEDENCE[op]
+                                     or PRECEDENCE[right[0]] == PRECEDENCE[op] and op in "-/"):
+        b = f"({b})"
+    return f"{a} {EXPRESSION_SYMBOLS[op]} {b}"
+
+
+EXPRESSION_TOKENS = re.compile(r"\s*(\d+|[-+×÷()])")
+EXPRESSION_OPERATORS = {symbol: op for op, symbol in EXPRESSION_SYMBOLS.items()}
+
+
+def read_expression(text):
+    """The tree of an expression written as by ``expression_text``, or ``None`` if *text* is not one."""
+    tokens, end = [], 0
+    for match in EXPRESSION_TOKENS.finditer(text):
+        if match.start() != end:
+            return None
+        tokens.append(match.group(1))
+        end = match.end()
+    if end != len(text.rstrip()) or not tokens:
+        return None
+    tokens.append(None)
+    position = 0
+
+    def term(level):
+        nonlocal position
+        if level == 3:
+            token = tokens[position]
+            position += 1
+            if token == "(":
+                tree = term(1)
+                if tokens[position] != ")":
+                    raise ValueError(text)
+                position += 1
+                return tree
+            if token is None or not token.isdigit():
+                raise ValueError(text)
+            return int(token)
+        tree = term(level + 1)
+        while tokens[position] in EXPRESSION_OPERATORS and PRECEDENCE[EXPRESSION_OPERATORS[tokens[position]]] == level:
+            op = EXPRESSION_OPERATORS[tokens[position]]
+            position += 1
+            tree = (op, tree, term(level + 1))
+        return tree
+
+    try:
+        tree = term(1)
+    except ValueError:
+        return None
+    return tree if tokens[position] is None else None
+
+
+@lru_cache(maxsize=4096)
+def canonical_expression(tree):
+    """
+    A text form shared by trees that differ only in the order of ``+`` or ``×`` operands.
+
+    ``3 + 4 × 5`` and ``5 × 4 + 3`` give the same form, so the no-repeat filter
+    treats them as one question.
+    """
+    if not isinstance(tree, tuple):
+        return str(tree)
+    op, left, right = tree
+    a, b = canonical_expression(left), canonical_expression(right)
+    if op in "+*" and b < a:
+        a, b = b, a
+    return f"({a}{op}{b})"
+
+
+class Expressions:
+    """
+    Random multi-step questions mixing the four operations, such as ``(12 + 6) ÷ 3 × 4``.
+
+    Each question is built on a random *shape*: a tree of operators whose
+    leaves are numbered slots, such as ``("*", ("+", 0, 1), 2)``. Numbers are
+    drawn for the slots and ``check`` works through the tree, giving up as
+    soon as a step breaks the rules:
+
+    * a division that does not come out exactly, or by 0 or 1;
+    * a difference below zero;
+    * a value above the band's limit.
+
+    Every intermediate is therefore a whole number, and the checked value
+    equals the exact ``Fraction`` value of ``evaluate_expression``. The
+    shapes of each band are built once and kept.
+
+    ``BANDS`` maps difficulty to ``(operators, operations, largest number,
+    limit)``.
+    """
+
+    BANDS = [(2.5, (2, "+-*", 10, 100)), (3.5, (2, "+-*/", 12, 150)), (4.5, (3, "+-*/", 15, 300)),
+             (None, (4, "+-*/", 20, 1000))]
+    # draws in a row without a new question before ``batch`` stops short
+    PATIENCE = 10000
+    _shapes = {}
+
+    @classmethod
+    def shapes(cls, operators, operations):
+        """Every shape with *operators* operators from *operations*, leaves numbered left to right."""
+        key = (operators, operations)
+        if key not in cls._shapes:
+            def build(n, first):
+                if n == 0:
+                    return [first]
+                found = []
+                for left_ops in range(n):
+                    for left in build(left_ops, first):
+                        for right in build(n - 1 - left_ops, first + left_ops + 1):
+                            found.extend((op, left, right) for op in operations)
+                return found
+            cls._shapes[key] = build(operators, 0)
+        return cls._shapes[key]
+
+    @staticmethod
+    def check(node, values, limit):
+        """Value of *node* with *values* in its slots, or ``None`` if a step breaks the rules."""
+        if not isinstance(node, tuple):
+            return values[node]
+        op, left, right = node
+        a = Expressions.check(left, values, limit)
+        if a is None:
+            return None
+        b = Expressions.check(right, values, limit)
+        if b is None:
+            return None
+        if op == "/":
+            return None if b < 2 or a % b else a // b
+        if op == "-":
+            return None if a < b else a - b
+        value = a + b if op == "+" else a * b
+        return None if value > limit else value
+
+    @staticmethod
+    def fill(shape, values):
+        if not isinstance(shape, tuple):
+            return values[shape]
+        op, left, right = shape
+        return op, Expressions.fill(left, values), Expressions.fill(right, values)
+
+    @classmethod
+    def generate(cls, difficulty, rng):
+        """Return ``(tree, value)`` for one random question at *difficulty*."""
+        operators, operations, largest, limit = Exam.band(cls.BANDS, difficulty)
+        shapes = cls.shapes(operators, operations)
+        while True:
+            shape = rng.choice(shapes)
+            values = [rng.randint(2, largest) for _ in range(operators + 1)]
+            value = cls.check(shape, values, limit)
+            if value is not None:
+                return cls.fill(shape, values), value
+
+    @classmethod
+    def batch(cls, difficulty, rng, count):
+        """
+        Return up to *count* different ``(tree, value)`` questions at *difficulty*.
+
+        Questions that differ only in the order of ``+`` or ``×`` operands
+        count as one. Fewer than *count* come back when the band has run out
+        of new questions, that is after ``PATIENCE`` draws in a row without one.
+        """
+        operators, operations, largest, limit = Exam.band(cls.BANDS, difficulty)
+        shapes = cls.shapes(operators, operations)
+        check, fill = cls.check, cls.fill
+        seen, found = set(), []
+        misses = 0
+        while len(found) < count and misses < cls.PATIENCE:
+            shape = rng.choice(shapes)
+            values = [rng.randint(2, largest) for _ in range(operators + 1)]
+            value = check(shape, values, limit)
+            if value is not None:
+                tree = fill(shape, values)
+                form = canonical_expression(tree)
+                if form not in seen:
+                    seen.add(form)
+                    found.append((tree, value))
+                    misses = 0
+                    continue
+            misses += 1
+        return found
+
+
+FACT_OPS = ("+", "-", "*", "/")
+FACT_MIN, FACT_MAX = 2, 12
+
+
+class FactMastery:
+    """
+    Attempts and correct answers per basic fact of one learner.
+
+    A fact is ``a + b``, ``(a + b) - b``, ``a * b`` or ``(a * b + r) / b``
+    with *a* and *b* from 2 to 12. The counts are a ``uint16`` array of
+    shape ``(operation, [attempts, correct], a, b)`` memory-mapped from
+    ``fact_mastery.bin`` in the learner's folder, so recording an attempt
+    is a write to one page and the file is under 2 KB. Without a path the
+    array lives in memory.
+
+    Easy questions of the four operations are drawn from these counts. A
+    fact's weight is its smoothed error rate, ``(wrong + 1) / (attempts + 2)``,
+    so unseen facts weigh 0.5 and well-known ones fade towards zero. Each
+    operation's alias table is rebuilt on the first draw after an update.
+    """
+
+    SIZE = FACT_MAX - FACT_MIN + 1
+    LIMIT = np.iinfo(np.uint16).max
+
+    def __init__(self, path=None):
+        self.path = path
+        shape = (len(FACT_OPS), 2, self.SIZE, self.SIZE)
+        if path is None:
+            self.counts = np.zeros(shape, dtype=np.uint16)
+        else:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            mode = "r+" if os.path.exists(path) else "w+"
+            self.counts = np.memmap(path, dtype=np.uint16, mode=mode, shape=shape)
+        self._tables = {}
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """In-memory copy of the counts returned by ``snapshot``."""
+        mastery = cls()
+        for op, counts in snapshot.items():
+            mastery.counts[FACT_OPS.index(op)] = np.asarray(counts, dtype=np.uint16).reshape(2, cls.SIZE, cls.SIZE)
+        return mastery
+
+    def snapshot(self, ops):
+        return {op: self.counts[FACT_OPS.index(op)].ravel().tolist() for op in ops if op in FACT_OPS}
+
+    def fact(self, paper):
+        """Return ``(operation index, a, b)`` indices if *paper* asks a basic fact, else ``None``."""
+        S, X, Y = paper._S, paper._X, paper._Y
+        if S not in FACT_OPS or paper._Z is not None:
+            return None
+        if S == "-":
+            a, b = X - Y, Y
+        elif S == "/":
+            a, b = X // Y, Y
+        else:
+            a, b = X, Y
+        if FACT_MIN <= a <= FACT_MAX and FACT_MIN <= b <= FACT_MAX:
+            return FACT_OPS.index(S), a - FACT_MIN, b - FACT_MIN
+        return None
+
+    def record(self, paper, correct):
+        """Count one attempt at *paper* if it is a basic fact."""
+        fact = self.fact(paper)
+        if fact is None:
+            return
+        i, a, b = fact
+        if self.counts[i, 0, a, b] == self.LIMIT:
+            # halve both counts rather than overflow, keeping the error rate
+            self.counts[i, :, a, b] //= 2
+        self.counts[i, 0, a, b] += 1
+        self.counts[i, 1, a, b] += bool(correct)
+        self._tables.pop(i, None)
+
+    def weights(self, op):
+        """Sampling weight of every fact of *op* as an 11 x 11 array indexed ``[a - 2, b - 2]``."""
+        attempts, correct = self.counts[FACT_OPS.index(op)].astype(float)
+        return (attempts - correct + 1) / (attempts + 2)
+
+    def draw(self, op, rng):
+        """Draw a fact ``(a, b)`` of *op*, weighted towards the learner's weak facts."""
+        i = FACT_OPS.index(op)
+        table = self._tables.get(i)
+        if table is None:
+            table = self._tables[i] = alias_table(self.weights(op).ravel())
+        a, b = divmod(alias_draw(table, rng), self.SIZE)
+        return a + FACT_MIN, b + FACT_MIN
+
+    def flush(self):
+        if isinstance(self.counts, np.memmap):
+            self.counts.flush()
+
+
+class RecentQuestions:
+    """
+    The questions one learner was asked in the last ``DAYS`` days, in fixed memory.
+
+    Each day gets a Bloom filter of ``BITS`` bits. The filters form a ring
+    in ``recent_questions.bin`` in the learner's folder (memory-mapped,
+    28 KB), and a day's slot is cleared when it comes round again. Entries
+    therefore expire without any clean-up pass, and memory never grows.
+    ``seen`` tests ``HASHES`` bits in every live day at once, which takes
+    constant time however long the history. False positives run at about
+    one in 10,000 with a few hundred questions a day, and only cost a
+    different question. ``hits`` counts positive answers since ``start``,
+    so a replay can reproduce them (see ``ReplayedRecent``).
+    """
+
+    DAYS = 7
+    BITS = 1 << 15
+    HASHES = 4
+
+    def __init__(self, path=None):
+        self.path = path
+        # column 0 holds the day each row belongs to, the rest are its bits
+        shape = (self.DAYS, 1 + self.BITS // 64)
+        if path is None:
+            self.table = np.zeros(shape, dtype=np.uint64)
+        else:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            mode = "r+" if os.path.exists(path) else "w+"
+            self.table = np.memmap(path, dtype=np.uint64, mode=mode, shape=shape)
+        self.hits = 0
+
+    def _bits(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        positions = np.array([(h1 + i * h2) % self.BITS for i in range(self.HASHES)], dtype=np.uint64)
+        return 1 + (positions >> np.uint64(6)).astype(np.intp), np.uint64(1) << (positions & np.uint64(63))
+
+    def start(self):
+        self.hits = 0
+
+    def seen(self, key, today=None):
+        today = date.today().toordinal() if today is None else today
+        words, masks = self._bits(key)
+        live = self.table[:, 0].astype(np.int64) > today - self.DAYS
+        hit = bool(((((self.table[:, words] & masks) == masks).all(axis=1)) & live).any())
+        self.hits += hit
+        return hit
+
+    def add(self, key, today=None):
+        today = date.today().toordinal() if today is None else today
+        row = self.table[today % self.DAYS]
+        if row[0] != today:
+            row[:] = 0
+            row[0] = today
+        words, masks = self._bits(key)
+        np.bitwise_or.at(row, words, masks)
+
+    def flush(self):
+        if isinstance(self.table, np.memmap):
+            self.table.flush()
+
+
+class ReplayedRecent:
+    """Stands in for ``RecentQuestions`` in a replay, reporting the repeats each original question met."""
+
+    def __init__(self, skips):
+        self.skips = list(skips)
+        self.question = -1
+        self.hits = 0
+
+    def start(self):
+        self.question += 1
+        self.hits = 0
+
+    def seen(self, key):
+        hit = self.question < len(self.skips) and self.hits < self.skips[self.question]
+        self.hits += hit
+        return hit
+
+    def add(self, key):
+        pass
+
+
+CALIBRATION_FILE = os.path.join(OUTPUT_DIR, "calibration.json")
+
+
+class Calibration:
+    """
+    Fitted item difficulty for each question template.
+
+    ``calibrate.py`` fits, per operation and half-point band of nominal
+    difficulty (the value ``Exam.quiz`` builds operands from), the
+    difficulty that learners actually experience, on the ability scale.
+    Between fitted bands the map is interpolated. Outside them it shifts
+    one for one from the nearest band. Operations without a fit use the
+    nominal value unchanged.
+    """
+
+    def __init__(self, templates=None):
+        self.templates = templates or {}
+        self.table = {}
+        for op, t in (templates or {}).items():
+            if t.get("nominal"):
+                nominal = np.asarray(t["nominal"], dtype=float)
+                # harder templates must never calibrate easier than the ones below them
+                difficulty = np.maximum.accumulate(np.asarray(t["difficulty"], dtype=float))
+                self.table[op] = (nominal, difficulty)
+
+    @classmethod
+    def load(cls, path=None):
+        path = path or CALIBRATION_FILE
+        try:
+            with open(path) as fh:
+                return cls(json.load(fh).get("templates"))
+        except (OSError, ValueError, AttributeError):
+            return cls()
+
+    @staticmethod
+    def _map(x, xp, fp):
+        if x <= xp[0]:
+            return float(fp[0] + (x - xp[0]))
+        if x >= xp[-1]:
+            return float(fp[-1] + (x - xp[-1]))
+        return float(np.interp(x, xp, fp))
+
+    def difficulty(self, op, nominal):
+        """Calibrated difficulty of a question generated at *nominal*."""
+        if op not in self.table:
+            return nominal
+        xs, bs = self.table[op]
+        return self._map(nominal, xs, bs)
+
+    def nominal(self, op, target):
+        """Nominal difficulty to generate at so the question is *target* hard."""
+        if op not in self.table:
+            return target
+        xs, bs = self.table[op]
+        return self._map(target, bs, xs)
+
+
+def pitch_question(ability, op, level, level_step=None, rng=None, table=None, mastery=None, recent=None):
+    """
+    Generate a question pitched at the learner's estimated ability.
+
+    *level_step* replaces the 0.5 by which Easy and Hard questions sit
+    below and above the estimate. *rng*, *mastery* and *recent* are passed
+    on to ``Exam.quiz`` and *table* replaces the loaded calibration. Returns ``(paper, nominal, difficulty)``:
+    the question, the nominal difficulty it was generated at and its
+    calibrated difficulty.
+    """
+    adjust = LEVEL_ADJUST.get(level, 0.0)
+    if level_step is not None:
+        adjust = adjust / LEVEL_ADJUST["Hard"] * level_step
+    table = calibration if table is None else table
+    target = ability.difficulty(op) + adjust
+    nominal = min(AbilityEstimator.MAX_DIFFICULTY + 0.5,
+                  max(AbilityEstimator.MIN_DIFFICULTY - 0.5, table.nominal(op, target)))
+    # Exam.quiz adds the standard level offset back on
+    paper = Exam.quiz(op, level, {op: nominal - LEVEL_ADJUST.get(level, 0.0)}, rng, mastery, recent)
+    return paper, nominal, table.difficulty(op, nominal)
+
+
+def place_reviews(plan, items, rng=None):
+    """Swap review *items* into random slots of *plan*; return ``{plan index: item}``."""
+    rng = random if rng is None else rng
+    slots = rng.sample(range(len(plan)), min(len(items), len(plan)))
+    for index, item in zip(slots, items):
+        plan[index] = (item["operation"], "Review")
+    return dict(zip(slots, items))
+
+
+def review_question(item, table=None):
+    """Rebuild a review item's question; returns ``(paper, nominal, difficulty)`` like ``pitch_question``."""
+    table = calibration if table is None else table
+    nominal = item["nominal"]
+    difficulty = None if nominal is None else table.difficulty(item["operation"], nominal)
+    return decode_paper(item["paper"]), nominal, difficulty
+
+
+def review_outcome(item, paper, nominal, correct, attempt):
+    """
+    Return what a closed question adds to the review queue, or ``None``.
+
+    A review *item* is graded by the *attempt* it was answered at; any
+    other question is only added when it was missed.
+    """
+    if item is None and correct:
+        return None
+    return {"item": None if item is None else item["item"], "operation": paper._S,
+            "paper": encode_paper(paper), "nominal": nominal,
+            "quality": ReviewQueue.QUALITY[attempt] if correct else ReviewQueue.FAILED}
+
+
+def session_record(session_random, operations, total, levels, scores, ability, level_step=None, table=None,
+                   mastery=None):
+    """
+    Return what a session's questions depend on besides the answers.
+
+    That is the seed, the settings, and the learner's scores, ability,
+    fact mastery and calibration before the first question. The question texts are appended
+    as they are asked, so a replay can be checked against them.
+    """
+    table = calibration if table is None else table
+    operations = [op for op in operations if op not in (None, "", "0")]
+    return {
+        "seed": session_random.seed,
+        "operations": operations,
+        "total": total,
+        "level_step": level_step,
+        "levels": dict(levels),
+        "scores": dict(scores),
+        "ability": {op: list(entry) for op, entry in ability.state.items()},
+        "calibration": table.templates,
+        "mastery": None if mastery is None else mastery.snapshot(operations),
+        "questions": [],
+        # repeats turned down before each question (see ReplayedRecent)
+        "skips": [],
+    }
+
+
+# --- Latency instrumentation ---
+# upper bounds in milliseconds; the last bucket counts everything slower
+LATENCY_BUCKETS_MS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+class LatencyRecorder:
+    """
+    Per-phase latency histograms for the answer pipeline of one session.
+
+    ``span`` times a phase with ``time.perf_counter``. Spans may nest, and
+    an outer span can also record its own time minus its inner spans under
+    a second name, which is how widget work is separated from grading,
+    speech and file writes. Every submit gets an attempt record holding the
+    milliseconds spent in each phase.
+    """
+
+    def __init__(self):
+        self.histograms = {}
+        self.attempts = []
+        self.current = None
+        self._children = []
+
+    def start_attempt(self, question, operation, attempt):
+        self.current = {"question": question, "operation": operation, "attempt": attempt, "spans": {}}
+        self.attempts.append(self.current)
+        return self.current
+
+    @contextmanager
+    def span(self, phase, self_phase=None):
+        start = time.perf_counter()
+        self._children.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._children.pop()
+            if self._children:
+                self._children[-1] += elapsed
+            self.add(phase, elapsed)
+            if self_phase:
+                self.add(self_phase, elapsed - children)
+
+    def add(self, phase, seconds, attempt=None):
+        ms = seconds * 1000
+        hist = self.histograms.get(phase)
+        if hist is None:
+            hist = self.histograms[phase] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0,
+                                             "buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1)}
+        hist["count"] += 1
+        hist["total_ms"] += ms
+        hist["max_ms"] = max(hist["max_ms"], ms)
+        i = 0
+        while i < len(LATENCY_BUCKETS_MS) and ms > LATENCY_BUCKETS_MS[i]:
+            i += 1
+        hist["buckets"][i] += 1
+        attempt = attempt if attempt is not None else self.current
+        if attempt is not None:
+            attempt["spans"][phase] = round(attempt["spans"].get(phase, 0.0) + ms, 3)
+
+    @staticmethod
+    def percentile(hist, q):
+        """Upper bound of the bucket holding the *q*-th percentile."""
+        if not hist["count"]:
+            return None
+        rank = q / 100 * hist["count"]
+        seen = 0
+        for bound, n in zip(LATENCY_BUCKETS_MS + [hist["max_ms"]], hist["buckets"]):
+            seen += n
+            if seen >= rank:
+                return round(min(bound, hist["max_ms"]), 3)
+        return round(hist["max_ms"], 3)
+
+    def summary(self):
+        return {
+            phase: {
+                "count": h["count"],
+                "total_ms": round(h["total_ms"], 3),
+                "max_ms": round(h["max_ms"], 3),
+                "p50_ms": self.percentile(h, 50),
+                "p95_ms": self.percentile(h, 95),
+                "buckets": list(h["buckets"]),
+            }
+            for phase, h in self.histograms.items()
+        }
+
+    def export(self, path, **meta):
+        """Write the histograms and attempt spans to a JSON file."""
+        data = dict(meta, bucket_bounds_ms=LATENCY_BUCKETS_MS, phases=self.summary(), attempts=self.attempts)
+        with open(path, "w") as fh:
+            json.dump(data, fh, indent=2)
+
+
+class ResponseTimer:
+    """
+    Response timestamps for every attempt in a session.
+
+    An attempt starts when its question, or the feedback on the previous
+    try, is on screen. It ends when the answer is submitted. First keystroke
+    and last edit fall in between. Times come from ``time.perf_counter``
+    and are stored in milliseconds since the session started. Speech and
+    redraws after a submit therefore never count towards the learner's time.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.attempts = []
+        self.shown = self.first_key = self.last_edit = None
+
+    def _ms(self, t):
+        return None if t is None else round((t - self.origin) * 1000, 3)
+
+    def displayed(self, at=None):
+        self.shown = time.perf_counter() if at is None else at
+        self.first_key = self.last_edit = None
+
+    def edited(self):
+        now = time.perf_counter()
+        if self.first_key is None:
+            self.first_key = now
+        self.last_edit = now
+
+    def record(self, question, attempt, operation, level, correct, submitted=None, difficulty=None, rating=None,
+               answer=None):
+        """
+        Close the current attempt and return the learner's response time in seconds.
+
+        *difficulty* is the nominal difficulty the question was generated at
+        and *rating* the learner's ability estimate before this attempt;
+        both feed the offline calibration. *answer* is the
+        ``(text, remainder_text, choice)`` input as given to ``grade_answer``,
+        kept so the session can be replayed.
+        """
+        submitted = time.perf_counter() if submitted is None else submitted
+        shown = self.shown if self.shown is not None else submitted
+        self.attempts.append({
+            "question": question,
+            "attempt": attempt,
+            "operation": operation,
+            "level": level,
+            "correct": int(bool(correct)),
+            "displayed_ms": self._ms(shown),
+            "first_key_ms": self._ms(self.first_key),
+            "last_edit_ms": self._ms(self.last_edit),
+            "submit_ms": self._ms(submitted),
+            "difficulty": difficulty,
+            "rating": rating,
+            "answer": None if answer is None else json.dumps(list(answer)),
+        })
+        self.shown = self.first_key = self.last_edit = None
+        return submitted - shown
+
+
+# Load the most recently used learner so the quiz has adaptive state at start
+learner_store = LearnerStore(LEARNER_DB)
+learner_store.ensure_default()
+active_learner = None
+difficulty_scores = None
+set_active_learner(learner_store.list_learners()[0][0])
+calibration = Calibration.load()
+
+
 class Exam:
     """
     Class representing a math quiz.
@@ -219,267 +2018,182 @@ class Exam:
         _score (int): The user's score.
     """
     @classmethod
-    def quiz(cls, operation, level):
-        """Generate a random math question based on an operation and difficulty level."""
+    def quiz(cls, operation, level, scores=None, rng=None, mastery=None, recent=None):
+        """
+        Generate a random math question based on an operation and difficulty level.
+
+        *scores* defaults to the active learner's difficulty scores. *rng* is
+        the random generator to draw from, such as a session's question
+        stream; the module-level generator is used without one. With a
+        *mastery* table, easy +, -, * and / questions are basic facts drawn
+        towards the ones the learner gets wrong. With *recent* (a
+        ``RecentQuestions``), questions asked in the last few days are avoided.
+        """
+        rng = random if rng is None else rng
         S = operation
-        score = difficulty_scores.get(S, 2.0)
-        adjust = {"Easy": -0.5, "Medium": 0.0, "Hard": 0.5}
-        difficulty = score + adjust.get(level, 0.0)
-        choices = None
-        X = Y = Z = None
-        limit = int(10 ** max(difficulty, 1))
-        digits = max(1, int(difficulty))
-        base = 10 ** (digits - 1)
+        score = (difficulty_scores if scores is None else scores).get(S, 2.0)
+        difficulty = score + LEVEL_ADJUST.get(level, 0.0)
+
+        if recent is not None:
+            return cls.fresh(operation, level, scores, rng, mastery, recent, difficulty)
+
+        if mastery is not None and S in FACT_OPS and difficulty < 2:
+            return cls.fact(S, *mastery.draw(S, rng), rng)
+
+        return topic(S).generate(difficulty, rng)
 
+    # (upper difficulty, value) bands of the number ranges for factor questions
+    FACTOR_BANDS = [(1.5, ("list", (2, 30))), (2.5, ("count", (20, 100))), (3.5, ("prime", (30, 200))),
+                    (None, ("twin", (50, 300)))]
+    PRIME_FACTOR_BANDS = [(1.5, (20, 50)), (2.5, (50, 150)), (None, (150, 300))]
+    # random draws tried before a question already asked recently is accepted
+    RECENT_TRIES = 8
+    # candidates scored per arithmetic question
+    BATCH = 32
+
+    @classmethod
+    def carry_matched(cls, S, difficulty, base, limit, rng):
+        """
+        Draw operands for a +, -, * or / question whose written-method effort suits *difficulty*.
+
+        The whole number of *difficulty* sets the operand sizes as before. A
+        batch of candidates is drawn from those ranges at once and scored by
+        ``carry_load``. The one whose load is nearest the fractional part is
+        kept, so 2.0 asks the plainest two-digit sums and 2.9 the ones full
+        of carries. Returns ``(X, Y, Z)`` with *Z* set only for three-term sums.
+        """
+        gen = np.random.default_rng(rng.getrandbits(64))
+        n = cls.BATCH
         while True:
-            if S == "-":
-                if difficulty < 2:
-                    X = random.randint(5, 20)
-                    Y = random.randint(1, X)
-                elif difficulty < 3:
-                    X = random.randint(base, limit - 1)
-                    Y = random.randint(base // 2, X)
-                else:
-                    X = random.randint(base, limit - 1)
-                    Y = random.randint(base, X)
-                if X > Y:
-                    quiz = f"{X} - {Y}"
-                    break
-                continue
-            elif S == "+":
-                if difficulty < 2:
-                    X = random.randint(1, 9)
-                    Y = random.randint(1, 9)
-                    quiz = f"{X} + {Y}"
-                elif difficulty < 3:
-                    X = random.randint(base, limit - 1)
-                    Y = random.randint(base, limit - 1)
-                    quiz = f"{X} + {Y}"
-                else:
-                    X = random.randint(base, limit - 1)
-                    Y = random.randint(base, limit - 1)
-                    Z = random.randint(base, limit - 1)
-                    quiz = f"{X} + {Y} + {Z}"
-                break
+            Z = None
+            if S == "+":
+                X, Y = gen.integers(base, limit, n), gen.integers(base, limit, n)
+                if difficulty >= 3:
+                    Z = gen.integers(base, limit, n)
+                keep = np.ones(n, dtype=bool)
+            elif S == "-":
+                X = gen.integers(base, limit, n)
+                Y = gen.integers(base // 2 if difficulty < 3 else base, X + 1)
+                keep = X > Y
             elif S == "*":
-                if difficulty < 2:
-                    X = random.randint(2, 9)
-                    Y = random.randint(2, 9)
-                elif difficulty < 3:
-                    X = random.randint(10, 99)
-                    Y = random.randint(2, 9)
-                else:
-                    X = random.randint(base, limit - 1)
-                    Y = random.randint(base, limit - 1)
-                quiz = f"{X} * {Y}"
-                break
-            elif S == "/":
-                if difficulty < 2:
-                    Y = random.randint(2, 12)
-                    X = random.randint(Y + 1, 99)
-                elif difficulty < 3:
-                    Y = random.randint(2, 9)
-                    X = random.randint(Y * 2, limit - 1)
-                else:
-                    Y = random.randint(base // 2 + 1, base)
-                    X = random.randint(Y + 1, limit - 1)
-                if X % Y != 0:
-                    quiz = f"{X} / {Y}"
-                    break
-                continue
-            elif S == "fraction":
-                if difficulty < 1.5:
-                    # add fractions with like denominators
-                    denom = random.randint(2, 6)
-                    a = random.randint(1, denom - 2)
-                    b = random.randint(1, denom - a - 1)
-                    X, Y, Z = a, b, denom
-                    quiz = f"{a}/{denom} + {b}/{denom}"
-                    answer = a + b
-                    Z = (answer, denom)
-                elif difficulty < 2.5:
-                    # add fractions with unlike denominators
-                    d1 = random.randint(2, 8)
-                    d2 = random.choice([n for n in range(2, 9) if n != d1])
-                    n1 = random.randint(1, d1 - 1)
-                    n2 = random.randint(1, d2 - 1)
-                    l = lcm_of_numbers([d1, d2])
-                    total = n1 * (l // d1) + n2 * (l // d2)
-                    g = math.gcd(total, l)
-                    X, Y, Z = (n1, d1), (n2, d2), None
-                    quiz = f"{n1}/{d1} + {n2}/{d2}"
-                    Z = (total // g, l // g)
-                elif difficulty < 3.5:
-                    # subtraction or simplification
-                    choice = random.choice(["subtract", "simplify"])
-                    if choice == "subtract":
-                        d1 = random.randint(2, 9)
-                        d2 = random.choice([n for n in range(2, 10) if n != d1])
-                        n1 = random.randint(1, d1 - 1)
-                        n2 = random.randint(1, d2 - 1)
-                        l = lcm_of_numbers([d1, d2])
-                        total = n1 * (l // d1) - n2 * (l // d2)
-                        g = math.gcd(abs(total), l)
-                        X, Y, Z = (n1, d1), (n2, d2), None
-                        quiz = f"{n1}/{d1} - {n2}/{d2}"
-                        Z = (total // g, l // g)
-                    else:
-                        den = random.randint(4, 20)
-                        num = random.randint(2, den - 1)
-                        mult = random.randint(2, 5)
-                        X = num * mult
-                        Y = den * mult
-                        g = math.gcd(X, Y)
-                        quiz = f"Simplify {X}/{Y}"
-                        Z = (X // g, Y // g)
+                if difficulty < 3:
+                    X, Y = gen.integers(10, 100, n), gen.integers(2, 10, n)
                 else:
-                    # mixed numbers or multi-step problems
-                    d1 = random.randint(2, 9)
-                    d2 = random.choice([n for n in range(2, 10) if n != d1])
-                    w1 = random.randint(1, 4)
-                    n1 = random.randint(1, d1 - 1)
-                    n2 = random.randint(1, d2 - 1)
-                    l = lcm_of_numbers([d1, d2])
-                    total = (w1 * d1 + n1) * (l // d1) + n2 * (l // d2)
-                    g = math.gcd(total, l)
-                    X, Y, Z = (w1, n1, d1), (n2, d2), None
-                    quiz = f"{w1} {n1}/{d1} + {n2}/{d2}"
-                    Z = (total // g, l // g)
-                choices = None
-                break
-            elif S == "factors_primes":
-                if difficulty < 1.5:
-                    X = random.randint(2, 30)
-                    quiz = f"List all factors of {X}"
-                    Z = factors_of(X)
-                    obj = cls(quiz, X, None, Z, S, choices)
-                    obj.mode = "list"
-                    obj.answer_actual = Z
-                    return obj
-                elif difficulty < 2.5:
-                    X = random.randint(20, 100)
-                    quiz = f"How many factors does {X} have?"
-                    Z = factors_of(X)
-                    obj = cls(quiz, X, None, Z, S, choices)
-                    obj.mode = "count"
-                    return obj
-                elif difficulty < 3.5:
-                    X = random.randint(30, 200)
-                    quiz = f"Is {X} a prime number? (yes/no)"
-                    Z = factors_of(X)
-                    obj = cls(quiz, X, None, Z, S, choices)
-                    obj.mode = "prime"
-                    obj.answer_actual = is_prime(X)
-                    return obj
+                    X, Y = gen.integers(base, limit, n), gen.integers(base, limit, n)
+                keep = np.ones(n, dtype=bool)
+            else:
+                if difficulty < 3:
+                    Y = gen.integers(2, 10, n)
+                    X = gen.integers(Y * 2, limit)
                 else:
-                    X = random.randint(50, 300)
-                    quiz = f"Is {X} part of a twin prime pair? (yes/no)"
-                    Z = factors_of(X)
-                    obj = cls(quiz, X, None, Z, S, choices)
-                    obj.mode = "twin"
-                    obj.answer_actual = twin_prime_pair(X) is not None
-                    return obj
-            elif S == "prime_factorization":
-                while True:
-                    if difficulty < 1.5:
-                        X = random.randint(20, 50)
-                    elif difficulty < 2.5:
-                        X = random.randint(50, 150)
-                    else:
-                        X = random.randint(150, 300)
-                    pf = prime_factorization(X)
-                    if len(set(pf)) >= 2:
-                        method = random.choice(["factor tree", "division"])
-                        quiz = f"What are the prime factors of {X} using the {method} method?"
-                        Z = pf
-                        break
+                    Y = gen.integers(base // 2 + 1, base + 1, n)
+                    X = gen.integers(Y + 1, limit)
+                keep = X % Y != 0
+            if keep.any():
                 break
-            elif S == "hcf":
-                from math import gcd
-                if difficulty < 1.5:
-                    count = 2
-                    rng = range(2, 21)
-                elif difficulty < 2.5:
-                    count = 2
-                    rng = range(10, 100)
-                else:
-                    count = 3
-                    rng = range(20, 200)
-                while True:
-                    nums = random.sample(rng, count)
-                    g = gcd(nums[0], nums[1])
-                    if count == 3:
-                        g = gcd(g, nums[2])
-                    if g > 10:
-                        break
-                method = random.choice([
-                    "listing factors",
-                    "prime factorization",
-                    "division method",
-                ])
-                if len(nums) == 2:
-                    X, Y = nums
-                    Z = None
-                else:
-                    X, Y, Z = nums
-                if len(nums) == 3:
-                    num_text = f"{nums[0]}, {nums[1]}, and {nums[2]}"
-                else:
-                    num_text = f"{nums[0]} and {nums[1]}"
-                method_text = (
-                    "by listing factors"
-                    if method == "listing factors"
-                    else (
-                        "using prime factorization"
-                        if method == "prime factorization"
-                        else "using the division method"
-                    )
-                )
-                quiz = f"Find the HCF of {num_text} {method_text}."
-                obj = cls(quiz, X, Y, Z, S, choices)
-                obj.numbers = nums
-                obj.method = method
-                return obj
-            elif S == "lcm":
-                if difficulty < 1.5:
-                    rng = range(2, 21)
-                    count = 2
-                elif difficulty < 2.5:
-                    rng = range(6, 41)
-                    count = 2
-                else:
-                    rng = range(10, 60)
-                    count = 3
-                nums = random.sample(rng, count)
-                method = random.choice([
-                    "listing multiples",
-                    "prime factorization",
-                    "division method",
-                ])
-                if len(nums) == 2:
-                    X, Y = nums
-                    Z = None
-                else:
-                    X, Y, Z = nums
-                if len(nums) == 3:
-                    num_text = f"{nums[0]}, {nums[1]}, and {nums[2]}"
-                else:
-                    num_text = f"{nums[0]} and {nums[1]}"
-                method_text = (
-                    "by listing multiples"
-                    if method == "listing multiples"
-                    else (
-                        "using prime factorization"
-                        if method == "prime factorization"
-                        else "using the division method"
-                    )
-                )
-                quiz = f"Find the LCM of {num_text} {method_text}."
-                obj = cls(quiz, X, Y, Z, S, choices)
-                obj.numbers = nums
-                obj.method = method
-                return obj
-        return cls(quiz, X, Y, Z, S, choices)
+        X, Y = X[keep], Y[keep]
+        Z = None if Z is None else Z[keep]
+        best = int(np.argmin(np.abs(carry_load(S, X, Y, Z) - difficulty % 1)))
+        return int(X[best]), int(Y[best]), None if Z is None else int(Z[best])
+
+    @staticmethod
+    def band(bands, difficulty):
+        for upper, value in bands:
+            if upper is None or difficulty < upper:
+                return value
+
+    @classmethod
+    def fact(cls, S, a, b, rng):
+        """The basic fact question for *a* and *b* (see ``FactMastery``)."""
+        if S == "-":
+            X, Y = a + b, b
+        elif S == "/":
+            X, Y = a * b + rng.randint(1, b - 1), b
+        else:
+            X, Y = a, b
+        return cls(f"{X} {S} {Y}", X, Y, None, S)
+
+    @classmethod
+    def factor_question(cls, X, mode):
+        Z = factors_of(X)
+        if mode == "list":
+            obj = cls(f"List all factors of {X}", X, None, Z, "factors_primes")
+            obj.answer_actual = Z
+        elif mode == "count":
+            obj = cls(f"How many factors does {X} have?", X, None, Z, "factors_primes")
+        elif mode == "prime":
+            obj = cls(f"Is {X} a prime number? (yes/no)", X, None, Z, "factors_primes")
+            obj.answer_actual = is_prime(X)
+        else:
+            obj = cls(f"Is {X} part of a twin prime pair? (yes/no)", X, None, Z, "factors_primes")
+            obj.answer_actual = twin_prime_pair(X) is not None
+        obj.mode = mode
+        return obj
+
+    @classmethod
+    def prime_factor_question(cls, X, method, factors=None):
+        factors = prime_factorization(X) if factors is None else factors
+        return cls(f"What are the prime factors of {X} using the {method} method?", X, None, factors,
+                   "prime_factorization")
+
+    @classmethod
+    def small_space(cls, S, difficulty, rng, mastery=None):
+        """
+        Return ``(candidates, build)`` when a question kind has few enough variants to enumerate.
+
+        ``build(candidate)`` makes the question. Returns ``None`` for the
+        larger spaces, where a few random draws nearly always find a
+        question that was not asked recently.
+        """
+        if S in FACT_OPS and difficulty < 2:
+            if mastery is not None:
+                facts = range(FACT_MIN, FACT_MAX + 1)
+                return [(a, b) for a in facts for b in facts], lambda ab: cls.fact(S, *ab, rng)
+            if S == "+":
+                pairs = [(X, Y) for X in range(1, 10) for Y in range(1, 10)]
+            elif S == "-":
+                pairs = [(X, Y) for X in range(5, 21) for Y in range(1, X)]
+            elif S == "*":
+                pairs = [(X, Y) for X in range(2, 10) for Y in range(2, 10)]
+            else:
+                return None
+            return pairs, lambda xy: cls(f"{xy[0]} {S} {xy[1]}", xy[0], xy[1], None, S)
+        if S == "factors_primes":
+            mode, (lo, hi) = cls.band(cls.FACTOR_BANDS, difficulty)
+            return range(lo, hi + 1), lambda X: cls.factor_question(X, mode)
+        if S == "prime_factorization":
+            lo, hi = cls.band(cls.PRIME_FACTOR_BANDS, difficulty)
+            numbers = [X for X in range(lo, hi + 1) if len(set(prime_factorization(X))) >= 2]
+            return numbers, lambda X: cls.prime_factor_question(X, rng.choice(["factor tree", "division"]))
+        return None
+
+    @classmethod
+    def fresh(cls, operation, level, scores, rng, mastery, recent, difficulty):
+        """
+        Generate a question that *recent* has not seen, falling back to a repeat only when none is left.
+
+        Small spaces are walked in shuffled order, each variant checked once.
+        Other kinds get up to ``RECENT_TRIES`` random draws. Weighted fact
+        draws get those tries first, to keep their weighting, and are then
+        enumerated.
+        """
+        space = cls.small_space(operation, difficulty, rng, mastery)
+        weighted = mastery is not None and operation in FACT_OPS and difficulty < 2
+        paper = None
+        for _ in range(cls.RECENT_TRIES if space is None or weighted else 0):
+            paper = cls.quiz(operation, level, scores, rng, mastery)
+            if not recent.seen(question_key(paper)):
+                return paper
+        if space is None:
+            return paper
+        candidates, build = space
+        first = None
+        for candidate in shuffled(candidates, rng):
+            paper = build(candidate)
+            if not recent.seen(question_key(paper)):
+                return paper
+            first = first or paper
+        return first
 
      # Initialize Exam object
     def __init__(self, question, X, Y, Z, S, choices=None):
@@ -497,34 +2211,7 @@ class Exam:
         self._X, self._Y, self._Z, self._S = X, Y, Z, S
         self._choices = choices
         
-        # Calculate the actual answer based on the operation
-        if self._S == "+":
-            self.answer_actual = self._X + self._Y
-        elif self._S == "-":
-            self.answer_actual = self._X - self._Y
-        elif self._S == "*":
-            self.answer_actual = self._X * self._Y
-        elif self._S == "/":
-            self.answer_actual = int(self._X / self._Y)         # Applied 'int' Method for proper feedback dispaly on Answer Submission!
-            self.answer_actual_remainder = self._X % self._Y
-        elif self._S == "fraction":
-            self.answer_actual = self._Z
-        elif self._S == "factors_primes":
-            self.factors = self._Z
-            self.is_prime = len(self._Z) == 2
-            self.twin_pair = twin_prime_pair(self._X)
-            self.answer_actual = len(self._Z)
-        elif self._S == "prime_factorization":
-            self.answer_actual = self._Z
-        elif self._S == "hcf":
-            from math import gcd
-            if self._Z:
-                self.answer_actual = gcd(gcd(self._X, self._Y), self._Z)
-            else:
-                self.answer_actual = gcd(self._X, self._Y)
-        elif self._S == "lcm":
-            nums = [self._X, self._Y] if self._Z is None else [self._X, self._Y, self._Z]
-            self.answer_actual = lcm_of_numbers(nums)
+        topic(S).answer(self)
         self.answer_user = 0
         self.answer_user_remainder = 0
 
@@ -589,6 +2276,592 @@ class Exam:
         self._score = marks
 
 
+class Topic:
+    """
+    How the questions of one operation are made, read, marked and explained.
+
+    Each entry of ``OPERATIONS`` names a subclass. ``generate`` makes a
+    question at a difficulty and ``batch`` several at once. ``answer`` sets
+    a new paper's correct answer. ``parse`` reads the learner's input into
+    the paper, raising ``ValueError`` with the message to show, and
+    ``check`` marks it. ``explain`` returns the feedback text and the words
+    to speak, and ``layout`` the input widgets the exam screen shows (one of
+    "answer", "quotient", "factors", "yes/no" or "choices") with their label.
+    ``read`` makes the paper back from its question text, matched against
+    the topic's compiled ``PATTERN``. The defaults suit questions answered
+    with a whole number.
+    """
+    S = None
+    PATTERN = None
+
+    @classmethod
+    def generate(cls, difficulty, rng):
+        raise NotImplementedError
+
+    @classmethod
+    def batch(cls, difficulty, rng, count):
+        """*count* questions at *difficulty*."""
+        return [cls.generate(difficulty, rng) for _ in range(count)]
+
+    @staticmethod
+    def answer(paper):
+        paper.answer_actual = paper._Z
+
+    @staticmethod
+    def parse(paper, text, remainder_text="", choice=-1):
+        if not text.isdecimal():
+            raise ValueError("Please type Numbers only!")
+        paper.answer_user = int(text)
+
+    @staticmethod
+    def check(paper):
+        return evaluate(paper.answer_user, paper.answer_actual)
+
+    @staticmethod
+    def explain(paper, correct):
+        if correct:
+            return f"Correct!, {paper.question} is {paper.answer_actual}", ()
+        text = f"Incorrect!, {paper.question} is {paper.answer_actual} not {paper.answer_user}"
+        return text, (text,)
+
+    @staticmethod
+    def layout(paper):
+        return "answer", "Type Answer Here:"
+
+    @staticmethod
+    def show(paper):
+        """The correct answer as display text."""
+        return str(paper.answer_actual)
+
+    @staticmethod
+    def key(paper):
+        """What makes two questions the same for ``RecentQuestions``: the operands, not the wording."""
+        return f"{paper._S}|{paper._X}|{paper._Y}|{paper._Z}|{getattr(paper, 'mode', '')}"
+
+    @classmethod
+    def read(cls, text):
+        """The paper whose question is *text*, or ``None`` if it is not one of this topic's."""
+        return None
+
+
+class Arithmetic(Topic):
+    """Base of the four operations, whose operand sizes grow with the whole number of the difficulty."""
+    @staticmethod
+    def sizes(difficulty):
+        """``(base, limit)``: the smallest operand of the difficulty's digit count and the largest bound."""
+        return 10 ** (max(1, int(difficulty)) - 1), int(10 ** max(difficulty, 1))
+
+    @classmethod
+    def read(cls, text):
+        match = cls.PATTERN.fullmatch(text)
+        if match is None:
+            return None
+        X, Y, Z = [None if n is None else int(n) for n in match.groups()] + [None] * (3 - len(match.groups()))
+        return Exam(text, X, Y, Z, cls.S)
+
+
+class Addition(Arithmetic):
+    S = "+"
+    PATTERN = re.compile(r"(\d+) \+ (\d+)(?: \+ (\d+))?")
+
+    @classmethod
+    def generate(cls, difficulty, rng):
+        Z = None
+        if difficulty < 2:
+            X = rng.randint(1, 9)
+            Y = rng.randint(1, 9)
+        else:
+            X, Y, Z = Exam.carry_matched("+", difficulty, *cls.sizes(difficulty), rng)
+        quiz = f"{X} + {Y}" if Z is None else f"{X} + {Y} + {Z}"
+        return Exam(quiz, X, Y, Z, "+")
+
+    @staticmethod
+    def answer(paper):
+        paper.answer_actual = paper._X + paper._Y + (paper._Z or 0)
+
+
+class Subtraction(Arithmetic):
+    S = "-"
+    PATTERN = re.compile(r"(\d+) - (\d+)")
+
+    @classmethod
+    def generate(cls, difficulty, rng):
+        while True:
+            if difficulty < 2:
+                X = rng.randint(5, 20)
+                Y = rng.randint(1, X)
+            else:
+                X, Y, _ = Exam.carry_matched("-", difficulty, *cls.sizes(difficulty), rng)
+            if X > Y:
+                return Exam(f"{X} - {Y}", X, Y, None, "-")
+
+    @staticmethod
+    def answer(paper):
+        paper.answer_actual = paper._X - paper._Y
+
+
+class Multiplication(Arithmetic):
+    S = "*"
+    PATTERN = re.compile(r"(\d+) \* (\d+)")
+
+    @classmethod
+    def generate(cls, difficulty, rng):
+        if difficulty < 2:
+            X = rng.randint(2, 9)
+            Y = rng.randint(2, 9)
+        else:
+            X, Y, _ = Exam.carry_matched("*", difficulty, *cls.sizes(difficulty), rng)
+        return Exam(f"{X} * {Y}", X, Y, None, "*")
+
+    @staticmethod
+    def answer(paper):
+        paper.answer_actual = paper._X * paper._Y
+
+
+class Division(Arithmetic):
+    S = "/"
+    PATTERN = re.compile(r"(\d+) / ([1-9]\d*)")
+
+    @classmethod
+    def generate(cls, difficulty, rng):
+        while True:
+            if difficulty < 2:
+                Y = rng.randint(2, 12)
+                X = rng.randint(Y + 1, 99)
+            else:
+                X, Y, _ = Exam.carry_matched("/", difficulty, *cls.sizes(difficulty), rng)
+            if X % Y != 0:
+                return Exam(f"{X} / {Y}", X, Y, None, "/")
+
+    @staticmethod
+    def answer(paper):
+        paper.answer_actual = paper._X // paper._Y
+        paper.answer_actual_remainder = paper._X % paper._Y
+
+    @staticmethod
+    def parse(paper, text, remainder_text="", choice=-1):
+        if not (text.isdecimal() and remainder_text.isdecimal()):
+            raise ValueError("Please type Numbers only!")
+        paper.answer_user = int(text)
+        paper.answer_user_remainder = int(remainder_text)
+
+    @staticmethod
+    def check(paper):
+        return evaluate(paper.answer_user, paper.answer_actual, paper.answer_user_remainder,
+                        paper.answer_actual_remainder, "/")
+
+    @staticmethod
+    def explain(paper, correct):
+        result = f"the Quotient is {paper.answer_actual} & Remainder is {paper.answer_actual_remainder}"
+        if correct:
+            return f"Correct!, For {paper.question}, {result}", ()
+        return (f"Incorrect!, For {paper.question} {result} not {paper.answer_user} & {paper.answer_user_remainder}",
+                (f"Incorrect!, For {paper.question} {result}",))
+
+    @staticmethod
+    def layout(paper):
+        return "quotient", "Type Quotient Here:"
+
+    @staticmethod
+    def show(paper):
+        return f"Quotient {paper.answer_actual}, Remainder {paper.answer_actual_remainder}"
+
+
+class Fractions(Topic):
+    S = "fraction"
+    PATTERN = re.compile(r"(?:(\d+) )?(\d+)/([1-9]\d*) ([-+]) (\d+)/([1-9]\d*)")
+    SIMPLIFY = re.compile(r"Simplify (\d+)/([1-9]\d*)")
+
+    @classmethod
+    def generate(cls, difficulty, rng):
+        if difficulty < 2.5 and rng.random() < FractionChoices.SHARE:
+            X, Y, Z, choices = FractionChoices.draw("like" if difficulty < 1.5 else "unlike", rng)
+            return Exam(f"Which bar shows {X[0]}/{X[1]} + {Y[0]}/{Y[1]}?", X, Y, Z, "fraction", choices)
+        if difficulty < 1.5:
+            # add fractions with like denominators (a denominator
+            # of 2 leaves no room for two proper numerators)
+            denom = rng.randint(3, 6)
+            a = rng.randint(1, denom - 2)
+            b = rng.randint(1, denom - a - 1)
+            return Exam(f"{a}/{denom} + {b}/{denom}", a, b, (a + b, denom), "fraction")
+        if difficulty < 2.5:
+            # add fractions with unlike denominators
+            d1 = rng.randint(2, 8)
+            d2 = rng.choice([n for n in range(2, 9) if n != d1])
+            n1 = rng.randint(1, d1 - 1)
+            n2 = rng.randint(1, d2 - 1)
+            l = lcm_of_numbers([d1, d2])
+            total = n1 * (l // d1) + n2 * (l // d2)
+            g = math.gcd(total, l)
+            return Exam(f"{n1}/{d1} + {n2}/{d2}", (n1, d1), (n2, d2), (total // g, l // g), "fraction")
+        if difficulty < 3.5:
+            # subtraction or simplification
+            if rng.choice(["subtract", "simplify"]) == "subtract":
+                d1 = rng.randint(2, 9)
+                d2 = rng.choice([n for n in range(2, 10) if n != d1])
+                n1 = rng.randint(1, d1 - 1)
+                n2 = rng.randint(1, d2 - 1)
+                l = lcm_of_numbers([d1, d2])
+                total = n1 * (l // d1) - n2 * (l // d2)
+                g = math.gcd(abs(total), l)
+                return Exam(f"{n1}/{d1} - {n2}/{d2}", (n1, d1), (n2, d2), (total // g, l // g), "fraction")
+            den = rng.randint(4, 20)
+            num = rng.randint(2, den - 1)
+            mult = rng.randint(2, 5)
+            X = num * mult
+            Y = den * mult
+            g = math.gcd(X, Y)
+            return Exam(f"Simplify {X}/{Y}", X, Y, (X // g, Y // g), "fraction")
+        # mixed numbers or multi-step problems
+        d1 = rng.randint(2, 9)
+        d2 = rng.choice([n for n in range(2, 10) if n != d1])
+        w1 = rng.randint(1, 4)
+        n1 = rng.randint(1, d1 - 1)
+        n2 = rng.randint(1, d2 - 1)
+        l = lcm_of_numbers([d1, d2])
+        total = (w1 * d1 + n1) * (l // d1) + n2 * (l // d2)
+        g = math.gcd(total, l)
+        return Exam(f"{w1} {n1}/{d1} + {n2}/{d2}", (w1, n1, d1), (n2, d2), (total // g, l // g), "fraction")
+
+    @staticmethod
+    def parse(paper, text, remainder_text="", choice=-1):
+        if paper.choices:
+            if not 0 <= choice < len(paper.choices):
+                raise ValueError("Please select an option!")
+            paper.answer_user = choice
+            return
+        parsed = parse_fraction_mixed_input(text)
+        if parsed is None:
+            raise ValueError("Please enter a number or fraction like a/b")
+        paper.answer_user = parsed
+
+    @staticmethod
+    def check(paper):
+        actual = paper.answer_actual
+        if paper.choices:
+            # answer_user is the index of the picked choice
+            return Fraction(*paper.choices[paper.answer_user]) == Fraction(*actual)
+        user = paper.answer_user
+        if isinstance(actual, tuple):
+            return actual[0] * user[1] == user[0] * actual[1]
+        return abs(actual - (user[0] / user[1])) < 1e-6
+
+    @classmethod
+    def explain(cls, paper, correct):
+        if paper.choices:
+            return ("Correct!", ()) if correct else ("Incorrect!", ("Incorrect!",))
+        if correct:
+            return f"Correct!, {paper.question} is {cls.show(paper)}", ()
+        user = paper.answer_user
+        user = f"{user[0]}/{user[1]}" if isinstance(user, tuple) else str(user)
+        text = f"Incorrect!, {paper.question} is {cls.show(paper)} not {user}"
+        return text, (text,)
+
+    @staticmethod
+    def layout(paper):
+        return ("choices", None) if paper.choices else ("answer", "Type Answer Here:")
+
+    @staticmethod
+    def show(paper):
+        actual = paper.answer_actual
+        return f"{actual[0]}/{actual[1]}" if isinstance(actual, tuple) else str(actual)
+
+    @classmethod
+    def read(cls, text):
+        match = cls.SIMPLIFY.fullmatch(text)
+        if match:
+            X, Y = map(int, match.groups())
+            g = math.gcd(X, Y)
+            return Exam(text, X, Y, (X // g, Y // g), cls.S)
+        match = cls.PATTERN.fullmatch(text)
+        if match is None:
+            return None
+        whole, n1, d1, sign, n2, d2 = match.groups()
+        first = Fraction(int(whole or 0) * int(d1) + int(n1), int(d1))
+        second = Fraction(int(n2), int(d2))
+        total = first + second if sign == "+" else first - second
+        X = (int(n1), int(d1)) if whole is None else (int(whole), int(n1), int(d1))
+        return Exam(text, X, (int(n2), int(d2)), (total.numerator, total.denominator), cls.S)
+
+
+class FactorsPrimes(Topic):
+    S = "factors_primes"
+    # numbers are capped at six digits, since listing factors tries every number up to them
+    PATTERNS = {
+        "list": re.compile(r"List all factors of ([1-9]\d{0,5})"),
+        "count": re.compile(r"How many factors does ([1-9]\d{0,5}) have\?"),
+        "prime": re.compile(r"Is ([1-9]\d{0,5}) a prime number\? \(yes/no\)"),
+        "twin": re.compile(r"Is ([1-9]\d{0,5}) part of a twin prime pair\? \(yes/no\)"),
+    }
+
+    @classmethod
+    def generate(cls, difficulty, rng):
+        mode, (lo, hi) = Exam.band(Exam.FACTOR_BANDS, difficulty)
+        return Exam.factor_question(rng.randint(lo, hi), mode)
+
+    @staticmethod
+    def answer(paper):
+        paper.factors = paper._Z
+        paper.is_prime = len(paper._Z) == 2
+        paper.twin_pair = twin_prime_pair(paper._X)
+        paper.answer_actual = len(paper._Z)
+
+    @staticmethod
+    def parse(paper, text, remainder_text="", choice=-1):
+        mode = getattr(paper, "mode", "count")
+        text = text.strip()
+        if mode == "list":
+            parsed = parse_factor_input(text)
+            if parsed is None:
+                raise ValueError("Enter factors separated by ×, * or spaces")
+            paper.answer_user = sorted(parsed)
+        elif mode == "count":
+            if not text.isdigit():
+                raise ValueError("Please type Numbers only!")
+            paper.answer_user = int(text)
+        elif text.lower() in ["yes", "y", "1", "true"]:
+            paper.answer_user = True
+        elif text.lower() in ["no", "n", "0", "false"]:
+            paper.answer_user = False
+        else:
+            raise ValueError("Please answer yes or no")
+
+    @staticmethod
+    def check(paper):
+        mode = getattr(paper, "mode", "count")
+        if mode == "list":
+            return sorted(paper.answer_user) == sorted(paper.answer_actual)
+        elif mode == "count":
+            return paper.answer_user == len(paper.factors)
+        return bool(paper.answer_user) == bool(paper.answer_actual)
+
+    @staticmethod
+    def explain(paper, correct):
+        number = paper._X
+        facs = paper.factors
+        if len(facs) == 2:
+            status = "a prime number"
+        elif number == 1:
+            status = "neither prime nor composite"
+        else:
+            status = "a composite number"
+        pair = paper.twin_pair
+        pair_text = f" and part of the twin prime pair {pair}" if pair else ""
+        if correct:
+            explanation = f"Factors of {number}: {', '.join(map(str, facs))}. It is {status}{pair_text}."
+            return f"Correct! {explanation}", (explanation,)
+        explanation = (f"The number {number} has {len(facs)} factors: {', '.join(map(str, facs))}. "
+                       f"It is {status}{pair_text}.")
+        return f"Incorrect! {explanation}", (f"Incorrect! {explanation}",)
+
+    @staticmethod
+    def layout(paper):
+        mode = getattr(paper, "mode", "count")
+        if mode in ("prime", "twin"):
+            return "yes/no", "Choose Answer:"
+        return ("factors" if mode == "list" else "answer"), "Type Answer Here:"
+
+    @staticmethod
+    def show(paper):
+        actual = paper.answer_actual
+        mode = getattr(paper, "mode", "count")
+        if mode == "list":
+            return ", ".join(map(str, actual))
+        if mode in ("prime", "twin"):
+            return "yes" if actual else "no"
+        return str(actual)
+
+    @classmethod
+    def read(cls, text):
+        for mode, pattern in cls.PATTERNS.items():
+            match = pattern.fullmatch(text)
+            if match:
+                return Exam.factor_question(int(match.group(1)), mode)
+        return None
+
+
+class PrimeFactorization(Topic):
+    S = "prime_factorization"
+    PATTERN = re.compile(r"What are the prime factors of ([1-9]\d{0,5}) using the (factor tree|division) method\?")
+
+    @classmethod
+    def generate(cls, difficulty, rng):
+        lo, hi = Exam.band(Exam.PRIME_FACTOR_BANDS, difficulty)
+        while True:
+            X = rng.randint(lo, hi)
+            pf = prime_factorization(X)
+            if len(set(pf)) >= 2:
+                return Exam.prime_factor_question(X, rng.choice(["factor tree", "division"]), pf)
+
+    @staticmethod
+    def parse(paper, text, remainder_text="", choice=-1):
+        parsed = parse_factor_input(text)
+        if parsed is None:
+            raise ValueError("Please enter prime factors separated by ×, * or spaces")
+        paper.answer_user = parsed
+
+    @staticmethod
+    def check(paper):
+        user = Counter(paper.answer_user)
+        actual = Counter(paper.answer_actual)
+        return user == actual and all(is_prime(f) for f in paper.answer_user)
+
+    @classmethod
+    def explain(cls, paper, correct):
+        if correct:
+            msg = f"Correct! Prime factorization of {paper._X} is {cls.show(paper)}"
+        else:
+            msg = f"Incorrect. The correct prime factorization of {paper._X} is {cls.show(paper)}"
+        return msg, (msg,)
+
+    @staticmethod
+    def layout(paper):
+        return "factors", "Enter prime factors:"
+
+    @staticmethod
+    def show(paper):
+        return " × ".join(map(str, sorted(paper.answer_actual)))
+
+    @classmethod
+    def read(cls, text):
+        match = cls.PATTERN.fullmatch(text)
+        return None if match is None else Exam.prime_factor_question(int(match.group(1)), match.group(2))
+
+
+class CommonNumber(Topic):
+    """Base of HCF and LCM questions, which ask about two or three numbers by a named method."""
+    # (upper difficulty, (count, pool)) bands of the numbers asked about
+    BANDS = []
+    METHODS = []
+    TITLE = ""
+    PATTERN = re.compile(r"Find the (HCF|LCM) of ([1-9]\d*)(?:, ([1-9]\d*),)? and ([1-9]\d*) (.+)\.")
+
+    @classmethod
+    def pick(cls, difficulty, rng):
+        count, pool = Exam.band(cls.BANDS, difficulty)
+        return rng.sample(pool, count)
+
+    @classmethod
+    def generate(cls, difficulty, rng):
+        return cls.paper(cls.pick(difficulty, rng), rng.choice(cls.METHODS))
+
+    @classmethod
+    def paper(cls, nums, method):
+        X, Y, Z = (nums + [None])[:3]
+        paper = Exam(f"Find the {cls.TITLE} of {cls.numbers_text(nums)} {cls.method_text(method)}.", X, Y, Z, cls.S)
+        paper.numbers = nums
+        paper.method = method
+        return paper
+
+    @classmethod
+    def method_text(cls, method):
+        if method == cls.METHODS[0]:
+            return f"by {method}"
+        elif method == "prime factorization":
+            return "using prime factorization"
+        return "using the division method"
+
+    @classmethod
+    def read(cls, text):
+        match = cls.PATTERN.fullmatch(text)
+        if match is None or match.group(1) != cls.TITLE:
+            return None
+        methods = {cls.method_text(method): method for method in cls.METHODS}
+        if match.group(5) not in methods:
+            return None
+        return cls.paper([int(n) for n in match.group(2, 3, 4) if n is not None], methods[match.group(5)])
+
+    @staticmethod
+    def numbers_text(nums):
+        if len(nums) == 3:
+            return f"{nums[0]}, {nums[1]}, and {nums[2]}"
+        return f"{nums[0]} and {nums[1]}"
+
+
+class HCF(CommonNumber):
+    S = "hcf"
+    BANDS = [(1.5, (2, range(2, 21))), (2.5, (2, range(10, 100))), (None, (3, range(20, 200)))]
+    METHODS = ["listing factors", "prime factorization", "division method"]
+    TITLE = "HCF"
+
+    @classmethod
+    def pick(cls, difficulty, rng):
+        # two different numbers below 21 never share a factor above
+        # 10, so easy questions only need a common factor
+        min_hcf = 1 if difficulty < 1.5 else 10
+        while True:
+            nums = super().pick(difficulty, rng)
+            if math.gcd(*nums) > min_hcf:
+                return nums
+
+    @staticmethod
+    def answer(paper):
+        paper.answer_actual = math.gcd(paper._X, paper._Y, paper._Z or 0)
+
+    @classmethod
+    def explain(cls, paper, correct):
+        ntext = cls.numbers_text(paper.numbers)
+        if correct:
+            msg = f"Correct! The HCF of {ntext} is {paper.answer_actual}."
+        else:
+            msg = f"Incorrect. The correct HCF of {ntext} is {paper.answer_actual}."
+        return msg, (msg,)
+
+
+class LCM(CommonNumber):
+    S = "lcm"
+    BANDS = [(1.5, (2, range(2, 21))), (2.5, (2, range(6, 41))), (None, (3, range(10, 60)))]
+    METHODS = ["listing multiples", "prime factorization", "division method"]
+    TITLE = "LCM"
+
+    @staticmethod
+    def answer(paper):
+        nums = [paper._X, paper._Y] if paper._Z is None else [paper._X, paper._Y, paper._Z]
+        paper.answer_actual = lcm_of_numbers(nums)
+
+    @classmethod
+    def explain(cls, paper, correct):
+        explanation = lcm_explanation(paper.numbers, paper.method)
+        if correct:
+            msg = f"Correct! The LCM of {cls.numbers_text(paper.numbers)} is {paper.answer_actual}."
+        else:
+            msg = f"Incorrect. The LCM of {cls.numbers_text(paper.numbers)} is {paper.answer_actual}."
+        return f"{msg}\n{explanation}", (msg, explanation)
+
+
+class MixedOperations(Topic):
+    S = "expression"
+
+    @classmethod
+    def generate(cls, difficulty, rng):
+        tree, _ = Expressions.generate(difficulty, rng)
+        return Exam(expression_text(tree), tree, None, None, "expression")
+
+    @classmethod
+    def batch(cls, difficulty, rng, count):
+        return [Exam(expression_text(tree), tree, None, None, "expression")
+                for tree, _ in Expressions.batch(difficulty, rng, count)]
+
+    @staticmethod
+    def answer(paper):
+        paper.answer_actual = int(evaluate_expression(paper._X))
+
+    @staticmethod
+    def key(paper):
+        return f"expression|{canonical_expression(paper._X)}"
+
+    @classmethod
+    def read(cls, text):
+        tree = read_expression(text)
+        if not isinstance(tree, tuple):
+            return None
+        try:
+            evaluate_expression(tree)
+        except ZeroDivisionError:
+            return None
+        return Exam(text, tree, None, None, "expression")
+
+
 class GUI_Exam(Exam):
     """
     Class representing the graphical user interface for a math exam application.
@@ -612,6 +2885,7 @@ class GUI_Exam(Exam):
         - generate_question: Generate and display a new math question.
         - check_answer: Check the user's answer and provide feedback.
         - launch_result_frame: Switch to the result interface after completing the exam.
+        - new_quiz: Return from the result interface to the home screen for another quiz.
         - get_grade: Calculate the user's grade based on the exam score.
         - for_correct_answer: Return a random message for correct answers.
         - for_incorrect_answer: Return a random message for incorrect answers.
@@ -623,40 +2897,56 @@ class GUI_Exam(Exam):
     Note: This class inherits from Tkinter's Frame class.
     """    
     
-    engine = pyttsx3.init()
-    voices = engine.getProperty('voices')                               # getting details of available voices
-    preferred = next((v for v in voices if "english" in v.name.lower()), voices[0])
-    engine.setProperty('voice', preferred.id)                           # pick an English voice if available
-    engine.setProperty('rate', 170)                                     # slightly slower for natural speech
-    engine.setProperty('volume', 1.0)
-    try:
-        engine.setProperty('pitch', 75)                                 # espeak supports pitch
-    except Exception:
-        pass
+    engine = None
+    root = None
+    latency = None
+    profile_sessions = False
+    profiler = None
+    session_seed = None
+    session_random = None
+
+    @classmethod
+    def init_engine(cls):
+        """Create the text-to-speech engine on first use."""
+        engine = pyttsx3.init()
+        voices = engine.getProperty('voices')                           # getting details of available voices
+        preferred = next((v for v in voices if "english" in v.name.lower()), voices[0])
+        engine.setProperty('voice', preferred.id)                       # pick an English voice if available
+        engine.setProperty('rate', 170)                                 # slightly slower for natural speech
+        engine.setProperty('volume', 1.0)
+        try:
+            engine.setProperty('pitch', 75)                             # espeak supports pitch
+        except Exception:
+            pass
+        cls.engine = engine
 
     @staticmethod
     def speak(*texts):
         """Speak one or more text snippets safely."""
-        for t in texts:
-            GUI_Exam.engine.say(t)
-        # Stop any ongoing speech before starting a new run loop to
-        # avoid 'run loop already started' errors.
-        if GUI_Exam.engine.isBusy():
-            GUI_Exam.engine.stop()
-        try:
-            GUI_Exam.engine.runAndWait()
-        except RuntimeError:
-            # In case a loop is somehow still active, stop and retry once
-            GUI_Exam.engine.stop()
-            GUI_Exam.engine.runAndWait()
+        span = GUI_Exam.latency.span("speak") if GUI_Exam.latency else nullcontext()
+        with span:
+            if GUI_Exam.engine is None:
+                GUI_Exam.init_engine()
+            for t in texts:
+                GUI_Exam.engine.say(t)
+            # Stop any ongoing speech before starting a new run loop to
+            # avoid 'run loop already started' errors.
+            if GUI_Exam.engine.isBusy():
+                GUI_Exam.engine.stop()
+            try:
+                GUI_Exam.engine.runAndWait()
+            except RuntimeError:
+                # In case a loop is somehow still active, stop and retry once
+                GUI_Exam.engine.stop()
+                GUI_Exam.engine.runAndWait()
 
-    root = Tk()
-    
     @classmethod
     def launch_main(cls):
         """
         Generate and display a new math question.
         """
+        cls.root = Tk()
+        cls.init_engine()
         cls.root.title("MathQuest Adventures")
         cls.root.state('zoomed')
         cls.root.geometry("1530x775")
@@ -703,6 +2993,23 @@ class GUI_Exam(Exam):
             justify="center",
             bg=self.bg_color,
         )
+        self.learner_frame = Frame(self.container, bg=self.bg_color)
+        self.learner_label = Label(
+            self.learner_frame,
+            text="Learner:",
+            font=("Comic Sans MS", 20),
+            bg=self.bg_color,
+        )
+        self.learner_variable = StringVar()
+        self.learner_menu = OptionMenu(self.learner_frame, self.learner_variable, "")
+        self.learner_menu.config(font=("Comic Sans MS", 16), width=14, bg=self.bg_color)
+        self.new_learner_button = Button(
+            self.learner_frame,
+            text="New Learner",
+            font=("Comic Sans MS", 14),
+            command=self.add_learner,
+        )
+        self.refresh_learner_menu()
         self.aritmatic_label = Label(
             self.container,
             text="Please select Arithmatics:",
@@ -710,15 +3017,7 @@ class GUI_Exam(Exam):
             justify="left",
             bg=self.bg_color,
         )
-        self.add_variable = StringVar()
-        self.subtract_variable = StringVar()
-        self.multiply_variable = StringVar()
-        self.divide_variable = StringVar()
-        self.fraction_variable = StringVar()
-        self.factors_primes_variable = StringVar()
-        self.prime_factor_variable = StringVar()
-        self.hcf_variable = StringVar()
-        self.lcm_variable = StringVar()
+        self.op_variables = {key: StringVar() for key in OPERATIONS}
         self.select_all_variable = StringVar()
         self.display_question = StringVar()
         self.grade = StringVar()
@@ -742,105 +3041,21 @@ class GUI_Exam(Exam):
         )
 
         cbfont = ("Comic Sans MS", 18)
-        self.add_checkbox = Checkbutton(
-            self.basic_ops_frame,
-            text="Addition",
-            variable=self.add_variable,
-            onvalue="+",
-            offvalue=None,
-            font=cbfont,
-            anchor="w",
-            width=15,
-            bg=self.bg_color,
-        )
-        self.subtract_checkbox = Checkbutton(
-            self.basic_ops_frame,
-            text="Subraction",
-            variable=self.subtract_variable,
-            onvalue="-",
-            offvalue=None,
-            font=cbfont,
-            anchor="w",
-            width=15,
-            bg=self.bg_color,
-        )
-        self.multiply_checkbox = Checkbutton(
-            self.basic_ops_frame,
-            text="Multiplication",
-            variable=self.multiply_variable,
-            onvalue="*",
-            offvalue=None,
-            font=cbfont,
-            anchor="w",
-            width=15,
-            bg=self.bg_color,
-        )
-        self.divide_checkbox = Checkbutton(
-            self.basic_ops_frame,
-            text="Division",
-            variable=self.divide_variable,
-            onvalue="/",
-            offvalue=None,
-            font=cbfont,
-            anchor="w",
-            width=15,
-            bg=self.bg_color,
-        )
-        self.fraction_checkbox = Checkbutton(
-            self.adv_ops_frame,
-            text="Fractions",
-            variable=self.fraction_variable,
-            onvalue="fraction",
-            offvalue=None,
-            font=cbfont,
-            anchor="w",
-            width=18,
-            bg=self.bg_color,
-        )
-        self.factors_primes_checkbox = Checkbutton(
-            self.adv_ops_frame,
-            text="Factors & Primes",
-            variable=self.factors_primes_variable,
-            onvalue="factors_primes",
-            offvalue=None,
-            font=cbfont,
-            anchor="w",
-            width=18,
-            bg=self.bg_color,
-        )
-        self.prime_factor_checkbox = Checkbutton(
-            self.adv_ops_frame,
-            text="Prime Factorization",
-            variable=self.prime_factor_variable,
-            onvalue="prime_factorization",
-            offvalue=None,
-            font=cbfont,
-            anchor="w",
-            width=18,
-            bg=self.bg_color,
-        )
-        self.hcf_checkbox = Checkbutton(
-            self.adv_ops_frame,
-            text="HCF",
-            variable=self.hcf_variable,
-            onvalue="hcf",
-            offvalue=None,
-            font=cbfont,
-            anchor="w",
-            width=18,
-            bg=self.bg_color,
-        )
-        self.lcm_checkbox = Checkbutton(
-            self.adv_ops_frame,
-            text="LCM",
-            variable=self.lcm_variable,
-            onvalue="lcm",
-            offvalue=None,
-            font=cbfont,
-            anchor="w",
-            width=18,
-            bg=self.bg_color,
-        )
+        self.op_checkboxes = {}
+        for key, op in OPERATIONS.items():
+            basic = op.group == "arithmetic"
+            self.op_checkboxes[key] = Checkbutton(
+                self.basic_ops_frame if basic else self.adv_ops_frame,
+                text=op.name,
+                variable=self.op_variables[key],
+                onvalue=key,
+                offvalue=None,
+                font=cbfont,
+                anchor="w",
+                width=15 if basic else 18,
+                bg=self.bg_color,
+            )
+            self.op_checkboxes[key].deselect()
         self.select_all_checkbox = Checkbutton(
             self.container,
             text="All of the above!",
@@ -851,8 +3066,7 @@ class GUI_Exam(Exam):
             bg=self.bg_color,
             anchor="w",
         )
-        self.add_checkbox.deselect(), self.subtract_checkbox.deselect(), self.multiply_checkbox.deselect()
-        self.divide_checkbox.deselect(), self.fraction_checkbox.deselect(), self.factors_primes_checkbox.deselect(), self.prime_factor_checkbox.deselect(), self.hcf_checkbox.deselect(), self.lcm_checkbox.deselect(), self.select_all_checkbox.deselect()
+        self.select_all_checkbox.deselect()
         self.label_num_question = Label(
             self.container,
             text="Type number of Questions:",
@@ -932,8 +3146,61 @@ class GUI_Exam(Exam):
             justify="center",
             width=7,
         )
+        # keystrokes mark the first key and last edit of the current attempt
+        self.input_user_answer.bind("<Key>", self.on_answer_edit, add="+")
+        self.input_user_answer_remainder.bind("<Key>", self.on_answer_edit, add="+")
+        self.response_timer = None
+        # yes/no buttons and fraction bar choices are made once and relabelled for each question
+        self.yes_no_var = StringVar()
+        self.yes_no_frame = Frame(self.exam_frame, bg=self.bg_color)
+        for column, word in enumerate(("Yes", "No")):
+            Radiobutton(
+                self.yes_no_frame,
+                text=word,
+                value=word.lower(),
+                variable=self.yes_no_var,
+                font=("Comic Sans MS", 20),
+                bg=self.bg_color,
+                command=self.on_answer_edit,
+            ).grid(row=0, column=column, padx=15)
         self.choice_var = IntVar()
-        self.options_frame = None
+        self.options_frame = Frame(self.exam_frame)
+        self.choice_widgets = []
+        for i in range(FractionChoices.CHOICES):
+            frame = Frame(self.options_frame)
+            picture = Label(frame, borderwidth=0)
+            picture.pack()
+            button = Radiobutton(
+                frame,
+                variable=self.choice_var,
+                value=i,
+                font=("Comic Sans MS", 18),
+                bg=self.bg_color,
+                command=self.on_answer_edit,
+            )
+            button.pack(pady=5)
+            frame.grid(row=0, column=i, padx=5)
+            self.choice_widgets.append((frame, picture, button))
+        # the widgets each answer layout shows, with their grid options
+        answer = {
+            self.label_user_answer: dict(row=6, column=1, rowspan=2, sticky="E", pady=10),
+            self.input_user_answer: dict(row=6, column=2, rowspan=2, sticky="W", pady=10, padx=5),
+        }
+        self.layout_widgets = {
+            "answer": answer,
+            "factors": answer,
+            "quotient": {
+                **answer,
+                self.label_user_answer_remainder: dict(row=6, column=3, rowspan=2, sticky="E"),
+                self.input_user_answer_remainder: dict(row=6, column=4, rowspan=2, sticky="W"),
+            },
+            "yes/no": {
+                self.label_user_answer: answer[self.label_user_answer],
+                self.yes_no_frame: dict(row=6, column=2, rowspan=2, sticky="W", pady=10),
+            },
+            "choices": {self.options_frame: dict(row=6, column=1, columnspan=6)},
+        }
+        self.layout = None
         self.question_asked, self.exam_score = 0, 0          # To keep track of the number of questions & correct answers.
         self.start_time, self.test_start, self.question_paper = None, None, None
         self.attempts_counter = 0
@@ -941,7 +3208,7 @@ class GUI_Exam(Exam):
             self.exam_frame,
             text="Submit",
             font=("Comic Sans MS", 20),
-            command=self.check_user_answer,
+            command=self.submit_answer,
         )
         self.evaluation_feedback = Label(
             self.exam_frame,
@@ -955,6 +3222,11 @@ class GUI_Exam(Exam):
         self.grade_label = Label(self.result_frame, font=("Bell MT", 50), justify="center", width=38)
         self.stat_frame = Frame(self.result_frame, width=350, height=475, bd=5, relief="groove")
         self.quit_button = Button(self.result_frame, text="Quit!", font=("Bell MT", 16), command=self.root.quit)
+        # the result screen's labels are made once and refilled after every quiz
+        self.result_spacers = [Label(self.result_frame, width=25, height=height) for height in (3, 10, 3)]
+        self.stat_time_label = Label(self.stat_frame, font=("Bell MT", 16), justify="left")
+        self.stat_score_label = Label(self.stat_frame, font=("Bell MT", 16), justify="left")
+        self.new_quiz_button = Button(self.result_frame, text="New Quiz!", font=("Bell MT", 16), command=self.new_quiz)
         self.sound_checkbox = Checkbutton(
             self.exam_frame,
             text="Disable Sound!",
@@ -970,7 +3242,20 @@ class GUI_Exam(Exam):
         self.file_open_mode = None
         self.pdf = None
         self.stats = {}
+        # latency debug overlay, toggled with F12 during a quiz
+        self.debug_overlay = Label(
+            self.exam_frame,
+            font=("Courier New", 10),
+            bg="#202020",
+            fg="#7CFC00",
+            justify="left",
+            anchor="nw",
+        )
+        self.debug_overlay_visible = False
+        self.root.bind("<F12>", self.toggle_debug_overlay)
+        self.checkpoint = None
         self.launch_home_frame()
+        self.root.after_idle(self.offer_resume)
                 
     def launch_home_frame(self):
         self.home_frame.pack(fill="both", expand=1)
@@ -986,35 +3271,27 @@ class GUI_Exam(Exam):
         self.banner_label.grid(row=0, column=0, columnspan=2, pady=(20, 10))
         self.home_label.grid(row=1, column=0, columnspan=2, pady=(0, 20))
 
-        self.aritmatic_label.grid(row=2, column=0, columnspan=2, pady=(0, 10), sticky="w")
+        # learner picker
+        self.learner_frame.grid(row=2, column=0, columnspan=2, pady=(0, 20))
+        self.learner_label.pack(side="left", padx=5)
+        self.learner_menu.pack(side="left", padx=5)
+        self.new_learner_button.pack(side="left", padx=5)
 
-        # operation frames
-        self.basic_ops_frame.grid(row=3, column=0, padx=10, sticky="n")
-        self.adv_ops_frame.grid(row=3, column=1, padx=10, sticky="n")
+        self.aritmatic_label.grid(row=3, column=0, columnspan=2, pady=(0, 10), sticky="w")
 
-        # pack checkboxes inside frames
-        for widget in (
-            self.add_checkbox,
-            self.subtract_checkbox,
-            self.multiply_checkbox,
-            self.divide_checkbox,
-        ):
-            widget.pack(anchor="w")
+        # operation frames
+        self.basic_ops_frame.grid(row=4, column=0, padx=10, sticky="n")
+        self.adv_ops_frame.grid(row=4, column=1, padx=10, sticky="n")
 
-        for widget in (
-            self.fraction_checkbox,
-            self.factors_primes_checkbox,
-            self.prime_factor_checkbox,
-            self.hcf_checkbox,
-            self.lcm_checkbox,
-        ):
+        # pack checkboxes inside frames
+        for widget in self.op_checkboxes.values():
             widget.pack(anchor="w")
 
-        self.select_all_checkbox.grid(row=4, column=0, columnspan=2, pady=(10, 10), sticky="w")
-        self.label_num_question.grid(row=5, column=0, sticky="e")
-        self.input_num_question.grid(row=5, column=1, sticky="w")
-        self.start_exam_button.grid(row=6, column=0, columnspan=2, pady=(20, 5))
-        self.progress_button.grid(row=7, column=0, columnspan=2, pady=(5, 20))
+        self.select_all_checkbox.grid(row=5, column=0, columnspan=2, pady=(10, 10), sticky="w")
+        self.label_num_question.grid(row=6, column=0, sticky="e")
+        self.input_num_question.grid(row=6, column=1, sticky="w")
+        self.start_exam_button.grid(row=7, column=0, columnspan=2, pady=(20, 5))
+        self.progress_button.grid(row=8, column=0, columnspan=2, pady=(5, 20))
 
         # bind mousewheel scrolling for canvas
         self.home_canvas.bind_all("<MouseWheel>", self._on_mousewheel)
@@ -1044,48 +3321,45 @@ class GUI_Exam(Exam):
             if not self.home_scrollbar.winfo_ismapped():
                 self.home_scrollbar.pack(side="right", fill="y")
 
+    def refresh_learner_menu(self):
+        """Fill the learner picker from the profile store."""
+        menu = self.learner_menu["menu"]
+        menu.delete(0, "end")
+        for learner_id, name in learner_store.list_learners():
+            menu.add_command(
+                label=name,
+                command=lambda i=learner_id, n=name: self.select_learner(i, n),
+            )
+        self.learner_variable.set(active_learner.name)
+
+    def select_learner(self, learner_id, name):
+        """Make *learner_id* the active learner without loading anyone else's data."""
+        self.learner_variable.set(name)
+        set_active_learner(learner_id)
+
+    def add_learner(self):
+        name = simpledialog.askstring("New Learner", "Learner name:", parent=GUI_Exam.root)
+        if not name or not name.strip():
+            return
+        learner_id = learner_store.add_learner(name)
+        set_active_learner(learner_id)
+        self.refresh_learner_menu()
+
     def checkbox_status(self):
         if self.select_all_variable.get() == "select_all" and not self.input_num_question.get() == "" and str(self.input_num_question.get()).isdecimal() and int(self.input_num_question.get()) > 0:
-            self.add_variable.set("+")
-            self.subtract_variable.set("-")
-            self.multiply_variable.set("*")
-            self.divide_variable.set("/")
-            self.fraction_variable.set("fraction")
-            self.factors_primes_variable.set("factors_primes")
-            self.prime_factor_variable.set("prime_factorization")
-            self.hcf_variable.set("hcf")
-            self.lcm_variable.set("lcm")
-        status_list = [
-            self.add_variable.get(),
-            self.subtract_variable.get(),
-            self.multiply_variable.get(),
-            self.divide_variable.get(),
-            self.fraction_variable.get(),
-            self.factors_primes_variable.get(),
-            self.prime_factor_variable.get(),
-            self.hcf_variable.get(),
-            self.lcm_variable.get(),
-        ]
+            for key, variable in self.op_variables.items():
+                variable.set(key)
+        status_list = [variable.get() for variable in self.op_variables.values()]
         if all(item in ("0", "", None) for item in status_list):
             return "Please Select atleast One option!"
         else:
-            return [
-                self.add_variable.get(),
-                self.subtract_variable.get(),
-                self.multiply_variable.get(),
-                self.divide_variable.get(),
-                self.fraction_variable.get(),
-                self.factors_primes_variable.get(),
-                self.prime_factor_variable.get(),
-                self.hcf_variable.get(),
-                self.lcm_variable.get(),
-            ]
+            return status_list
     
     def start(self):
         """Start the exam based on user selections."""
         self.test_checkbox.grid_forget()
-        if self.checkbox_status() == "Please Select atleast One option!" or self.input_num_question.get() == "" or not str(self.input_num_question.get()).isdecimal() or int(self.input_num_question.get()) <= 0:
-            self.test_checkbox.grid(row=8, column=0, columnspan=2, pady=(5, 0))
+        if self.checkbox_status() == "Please Select atleast One option!" or self.input_num_question.get() == "" or not str(self.input_num_question.get()).isdecimal() or not 0 < int(self.input_num_question.get()) <= MAX_QUESTIONS:
+            self.test_checkbox.grid(row=9, column=0, columnspan=2, pady=(5, 0))
         else:
             self.launch_exam_frame()
 
@@ -1142,33 +3416,17 @@ class GUI_Exam(Exam):
 
     def launch_progress_dashboard(self):
         """Open a window showing progress charts from AllSessions.xlsx."""
-        path = os.path.join(OUTPUT_DIR, "AllSessions.xlsx")
+        path = active_learner.sessions_path
         if not os.path.exists(path):
             messagebox.showinfo("Progress", "No session data found yet.")
             return
 
         try:
-            log_df = pd.read_excel(path, sheet_name="Log")
-            idx_df = pd.read_excel(path, sheet_name="Index")
+            log_df, idx_df = load_progress_frames(path)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load data: {e}")
             return
 
-        log_df["Accuracy (%)"] = clamp_percent(log_df["Accuracy (%)"])
-        idx_df["Accuracy (%)"] = clamp_percent(idx_df["Accuracy (%)"])
-
-        # The log sheet stores start times with a date component while the
-        # index only contains the time. Extract the time portion before
-        # merging so we can match rows correctly.
-        log_df["_time"] = log_df["Start Time"].astype(str).str[-8:]
-        idx_df["_time"] = idx_df["Start Time"].astype(str).str[-8:]
-        log_df = log_df.merge(idx_df[["_time", "Session Number"]], on="_time", how="left")
-        log_df.drop(columns=["_time"], inplace=True)
-
-        # Use forward fill for the session numbers so consecutive rows share
-        # the appropriate session identifier.
-        log_df["Session Number"] = log_df["Session Number"].ffill()
-
         diff_hist = load_difficulty_history()
 
         dash = Toplevel(self.root)
@@ -1213,11 +3471,7 @@ class GUI_Exam(Exam):
             widget.bind("<Button-1>", open_large)
 
         def accuracy_over_time(ax):
-            data = (
-                log_df.groupby(["Session Number", "Question Type"])["Accuracy (%)"].mean().reset_index()
-            )
-            data["Accuracy (%)"] = clamp_percent(data["Accuracy (%)"])
-            pivot = data.pivot(index="Session Number", columns="Question Type", values="Accuracy (%)")
+            pivot = accuracy_by_session(log_df)
             pivot.plot(ax=ax, marker="o")
             ax.set_title("Accuracy Over Time")
             ax.set_xlabel("Session")
@@ -1229,9 +3483,7 @@ class GUI_Exam(Exam):
                 ax.text(0.5, 0.5, "No data", ha="center", va="center")
                 ax.set_axis_off()
                 return
-            max_len = max(len(v) for v in diff_hist.values())
-            df = pd.DataFrame({op_names.get(k, k): v + [None] * (max_len - len(v)) for k, v in diff_hist.items()})
-            df.index = range(1, max_len + 1)
+            df = difficulty_frame(diff_hist)
             df.plot(ax=ax, marker="o")
             ax.set_title("Difficulty Score Evolution")
             ax.set_xlabel("Session")
@@ -1249,9 +3501,7 @@ class GUI_Exam(Exam):
                 ax.legend_.remove()
 
         def topic_accuracy(ax):
-            data = log_df.groupby("Question Type").apply(
-                lambda g: clamp_percent(g["Correct Answers"].sum() / g["Total Questions"].sum() * 100)
-            )
+            data = accuracy_by_topic(log_df)
             data.plot(kind="bar", ax=ax)
             ax.set_title("Topic-wise Accuracy")
             ax.set_xlabel("Operation")
@@ -1273,7 +3523,7 @@ class GUI_Exam(Exam):
             ax.set_ylabel("Accuracy (%)")
 
         def topic_distribution(ax):
-            dist = log_df.groupby("Question Type")["Total Questions"].sum()
+            dist = questions_by_topic(log_df)
             dist.plot(kind="pie", ax=ax, autopct="%1.0f%%")
             ax.set_title("Topic Distribution")
             ax.set_ylabel("")
@@ -1283,18 +3533,7 @@ class GUI_Exam(Exam):
                 ax.text(0.5, 0.5, "No data", ha="center", va="center")
                 ax.set_axis_off()
                 return
-            rows = []
-            for op, vals in diff_hist.items():
-                for i, val in enumerate(vals, start=1):
-                    rows.append(
-                        {
-                            "Session Number": i,
-                            "Question Type": op_names.get(op, op),
-                            "Difficulty Score": val,
-                        }
-                    )
-            diff_df = pd.DataFrame(rows)
-            merged = log_df.merge(diff_df, on=["Session Number", "Question Type"], how="inner")
+            merged = difficulty_with_accuracy(log_df, diff_hist)
             ax.scatter(
                 clamp_percent(merged["Accuracy (%)"]),
                 merged["Difficulty Score"],
@@ -1306,9 +3545,7 @@ class GUI_Exam(Exam):
             ax.set_ylabel("Avg Difficulty Score")
 
         def attempts_per_type(ax):
-            data = log_df.groupby("Question Type").apply(
-                lambda g: g["Total Attempts"].sum() / g["Total Questions"].sum()
-            )
+            data = attempts_by_topic(log_df)
             data.plot(kind="bar", ax=ax)
             ax.set_title("Attempts per Question Type")
             ax.set_xlabel("Operation")
@@ -1328,12 +3565,27 @@ class GUI_Exam(Exam):
 
 
     def launch_exam_frame(self):
+        if self.profile_sessions:
+            self.profiler = SessionProfiler().start()
         self.status_checkbox = self.checkbox_status()                 # To fetch the user selection
         self.question_to_ask = int(self.input_num_question.get())     # To fetch how many question to ask
         self.stats = {s: {"total_questions": 0, "correct_answers": 0, "total_attempts": 0,
                           "total_time": 0.0, "first_try_correct": 0}
                        for s in self.status_checkbox if s not in (None, "", "0")}
         self.prepare_question_plan()
+        self.start_time = datetime.now()
+        self.test_start = self.start_time.strftime("%I:%M%p")
+        self.show_exam_frame()
+        self.response_timer = ResponseTimer()
+        with self.latency.span("generate_question"):
+            self.generate_question()
+        self.checkpoint = SessionCheckpoint(active_learner.checkpoint_path)
+        self.checkpoint.start({"record": self.session_record, "file_name": self.file_name,
+                               "start_time": self.start_time.isoformat()})
+        self.root.after_idle(self.response_timer.displayed)
+
+    def show_exam_frame(self):
+        """Swap the home screen for the exam screen."""
         self.home_frame.pack_forget()
         self.home_canvas.unbind_all("<MouseWheel>")
         self.home_canvas.unbind_all("<Button-4>")
@@ -1344,505 +3596,243 @@ class GUI_Exam(Exam):
         self.icon_label.grid(row=1, column=0, columnspan=8, pady=(10, 5))
         self.question_box.grid(row=2, column=1, columnspan=6, pady=10, padx=10)
         self.question_label.pack(padx=20, pady=20)
-        self.label_user_answer.grid(row=6, column=1, sticky="E", pady=10)
-        self.input_user_answer.grid(row=6, column=2, sticky="W", pady=10, padx=5)
-        self.start_time = datetime.now()
-        self.test_start = self.start_time.strftime("%I:%M%p")
+        # feedback keeps its place all quiz long; only its text and colour change
+        self.evaluation_feedback.config(text="", bg=self.bg_color)
+        self.evaluation_feedback.grid(row=12, column=1, columnspan=8, pady=10)
         self.check_button.grid(row=10, column=1, columnspan=2, pady=10)
-        self.generate_question()
+        GUI_Exam.latency = LatencyRecorder()
 
     def prepare_question_plan(self):
         """Build a plan of operations and difficulty levels for this session."""
-        history = load_difficulty_history()
-        stats = compute_thresholds(history)
+        stats = active_learner.thresholds
+        self.ability = active_learner.ability
+        self.mastery = active_learner.mastery
+        self.recent = active_learner.recent
         self.levels = determine_difficulty_levels(difficulty_scores, stats)
-
-        total = self.question_to_ask
-        base = total // 3
-        dist = {"Easy": base, "Medium": base, "Hard": base}
-        for i in range(total - base * 3):
-            dist[["Easy", "Medium", "Hard"][i]] += 1
-
-        ops_by_level = {"Easy": [], "Medium": [], "Hard": []}
-        for op in self.status_checkbox:
-            ops_by_level[self.levels.get(op, "Medium")].append(op)
-
-        plan = []
-        for lvl in ["Easy", "Medium", "Hard"]:
-            ops = ops_by_level[lvl] or self.status_checkbox
-            for _ in range(dist[lvl]):
-                plan.append((random.choice(ops), lvl))
-        random.shuffle(plan)
-        self.question_plan = plan
+        self.session_random = SessionRandom(self.session_seed)
+        self.session_record = session_record(self.session_random, self.status_checkbox, self.question_to_ask,
+                                             self.levels, difficulty_scores, self.ability, mastery=self.mastery)
+        self.question_plan = build_question_plan(self.status_checkbox, self.question_to_ask, self.levels,
+                                                 self.session_random.plan)
+        # missed questions that are due come back in place of some planned ones
+        due = active_learner.reviews.take(self.session_record["operations"],
+                                          max(1, self.question_to_ask // ReviewQueue.SHARE))
+        self.reviews = self.session_record["reviews"] = place_reviews(self.question_plan, due,
+                                                                      self.session_random.plan)
+        self.review_outcomes = []
         self.question_index = 0
         
     def generate_question(self):
         """
         Generate and display a new math question.
         """
-        # ensure the submit button is active for the new question
-        self.check_button.config(state="normal")
         op, level = self.question_plan[self.question_index]
+        item = self.reviews.get(self.question_index)
         self.question_index += 1
-        self.question_paper = Exam.quiz(op, level)
+        self.recent.start()
+        if item is not None:
+            self.question_paper, self.question_nominal, self.question_difficulty = review_question(item)
+        else:
+            # pitch the question at the learner's current estimated ability
+            self.question_paper, self.question_nominal, self.question_difficulty = pitch_question(
+                self.ability, op, level, rng=self.session_random.questions, mastery=self.mastery, recent=self.recent
+            )
+        self.session_record["questions"].append(self.question_paper.question)
+        self.recent.add(question_key(self.question_paper))
+        self.session_record["skips"].append(self.recent.hits)
         if self.question_paper._S not in self.stats:
             self.stats[self.question_paper._S] = {"total_questions": 0, "correct_answers": 0,
                                                 "total_attempts": 0, "total_time": 0.0,
                                                 "first_try_correct": 0}
         self.stats[self.question_paper._S]["total_questions"] += 1
-        if self.question_paper._S in ["+", "-", "*", "/"]:
-            formatted = (
-                f"Q.{self.question_asked + 1} What will be the result of {self.question_paper.question}?"
-            )
-        else:
-            formatted = f"Q.{self.question_asked + 1} {self.question_paper.question}"
-        self.display_question.set(formatted)
-        self.question_label.config(text=formatted)
-        self.current_question_start = datetime.now()
         self.question_asked += 1
+        self.show_question()
 
-        if self.options_frame:
-            self.options_frame.destroy()
-            self.options_frame = None
+    def show_question(self):
+        """Display the current question and the answer widgets it takes."""
+        # ensure the submit button is active for the new question
+        self.check_button.config(state="normal")
+        formatted = format_question(self.question_paper, self.question_asked)
+        self.display_question.set(formatted)
+        self.question_label.config(text=formatted)
         self.choice_var.set(-1)
-
-        if self.question_paper._S == "/":
-            self.label_user_answer.config(text="Type Quotient Here:")
-            self.label_user_answer_remainder.grid(
-                row=6,
-                column=3,
-                rowspan=2,
-                columnspan=1,
-                sticky="E",
-            )
-            self.input_user_answer_remainder.grid(
-                row=6,
-                column=4,
-                rowspan=2,
-                columnspan=1,
-                sticky="W",
-            )
-            self.label_user_answer.grid(
-                row=6,
-                column=1,
-                rowspan=2,
-                columnspan=1,
-                sticky="E",
-            )
-            self.input_user_answer.grid(
-                row=6,
-                column=2,
-                rowspan=2,
-                columnspan=1,
-                sticky="W",
-            )
-        elif self.question_paper._S == "fraction":
-            if self.question_paper.choices:
-                self.label_user_answer.grid_forget()
-                self.input_user_answer.grid_forget()
-                self.label_user_answer_remainder.grid_forget()
-                self.input_user_answer_remainder.grid_forget()
-                self.options_frame = Frame(self.exam_frame)
-                self.options_frame.grid(row=6, column=1, columnspan=6)
-                for i, frac in enumerate(self.question_paper.choices):
-                    frame = Frame(self.options_frame)
-                    # Increase the option size for better visibility
-                    canvas_width, canvas_height = 120, 80
-                    canvas = Canvas(frame, width=canvas_width, height=canvas_height)
-                    for j in range(frac[1]):
-                        x0 = j * (canvas_width / frac[1])
-                        x1 = (j + 1) * (canvas_width / frac[1])
-                        color = "blue" if j < frac[0] else "white"
-                        canvas.create_rectangle(x0, 0, x1, canvas_height, fill=color, outline="black")
-                    canvas.pack()
-                    Radiobutton(
-                        frame,
-                        variable=self.choice_var,
-                        value=i,
-                        font=("Comic Sans MS", 18),
-                        bg=self.bg_color,
-                    ).pack(pady=5)
-                    frame.grid(row=0, column=i, padx=5)
-            else:
-                self.label_user_answer.config(text="Type Answer Here:")
-                self.label_user_answer_remainder.grid_forget()
-                self.input_user_answer_remainder.grid_forget()
-                self.label_user_answer.grid(
-                    row=6,
-                    column=1,
-                    rowspan=2,
-                    columnspan=1,
-                    sticky="E",
-                )
-                self.input_user_answer.grid(
-                    row=6,
-                    column=2,
-                    rowspan=2,
-                    columnspan=1,
-                    sticky="W",
-                )
-        elif self.question_paper._S == "prime_factorization":
-            self.label_user_answer.config(text="Enter prime factors:")
-            self.label_user_answer_remainder.grid_forget()
-            self.input_user_answer_remainder.grid_forget()
-            self.label_user_answer.grid(row=6, column=1, rowspan=2, columnspan=1, sticky="E")
-            self.input_user_answer.grid(row=6, column=2, rowspan=2, columnspan=1, sticky="W")
-        else:
-            self.label_user_answer.config(text="Type Answer Here:")
-            self.label_user_answer_remainder.grid_forget()
-            self.input_user_answer_remainder.grid_forget()
-            self.label_user_answer.grid(
-                row=6,
-                column=1,
-                rowspan=2,
-                columnspan=1,
-                sticky="E",
-            )
-            self.input_user_answer.grid(
-                row=6,
-                column=2,
-                rowspan=2,
-                columnspan=1,
-                sticky="W",
-            )
+        layout, label = topic(self.question_paper._S).layout(self.question_paper)
+        self.show_layout(layout)
+        if layout == "choices":
+            for (frame, picture, button), frac in zip(self.choice_widgets, self.question_paper.choices):
+                picture.config(image=self.fraction_bar(*frac))
+                button.config(text=f"{frac[0]}/{frac[1]}")
+        elif self.label_user_answer.cget("text") != label:
+            self.label_user_answer.config(text=label)
+
+    def show_layout(self, layout):
+        """Grid the answer widgets of *layout*, leaving those the last question also used in place."""
+        shown = self.layout_widgets.get(self.layout, {})
+        widgets = self.layout_widgets[layout]
+        self.layout = layout
+        if widgets is shown:
+            return
+        for widget in shown:
+            if widget not in widgets:
+                widget.grid_forget()
+        for widget, options in widgets.items():
+            if widget not in shown:
+                widget.grid(**options)
+
+    def typed_answer(self):
+        """The ``(text, remainder_text, choice)`` the learner has entered for the current question."""
+        text = self.yes_no_var.get() if self.layout == "yes/no" else self.input_user_answer.get()
+        return text, self.input_user_answer_remainder.get(), self.choice_var.get()
     
+    def submit_answer(self):
+        """Handle the Submit button, timing each phase of the answer pipeline."""
+        self.submitted_at = time.perf_counter()
+        attempt = self.latency.start_attempt(self.question_asked, self.question_paper._S, self.attempts_counter + 1)
+        with self.latency.span("submit", self_phase="widgets"):
+            self.check_user_answer()
+        # Tk redraws in idle callbacks queued by the handler; this one runs after them
+        submitted = time.perf_counter()
+        self.root.after_idle(lambda: self.finish_attempt_timing(attempt, submitted))
+
+    def finish_attempt_timing(self, attempt, submitted):
+        self.latency.add("redraw", time.perf_counter() - submitted, attempt)
+        if self.response_timer.shown is None:
+            # feedback or the next question is now on screen, so the next attempt starts
+            self.response_timer.displayed()
+        if self.debug_overlay_visible:
+            self.update_debug_overlay()
+        if self.end_time is not None:
+            # the quiz just finished, so this was the last attempt of the session
+            self.save_latency()
+            self.checkpoint.finish()
+
+    def on_answer_edit(self, event=None):
+        if self.response_timer is not None:
+            self.response_timer.edited()
+
+    def toggle_debug_overlay(self, event=None):
+        self.debug_overlay_visible = not self.debug_overlay_visible
+        if self.debug_overlay_visible:
+            self.debug_overlay.place(relx=1.0, rely=1.0, anchor="se")
+            self.debug_overlay.lift()
+            self.update_debug_overlay()
+        else:
+            self.debug_overlay.place_forget()
+
+    def update_debug_overlay(self):
+        """Show the last attempt's phase times and the session p95 per phase."""
+        if GUI_Exam.latency is None:
+            self.debug_overlay.config(text="latency: no quiz running")
+            return
+        last = self.latency.attempts[-1]["spans"] if self.latency.attempts else {}
+        lines = [f"{'phase':<18}{'last ms':>10}{'p95 ms':>10}{'n':>6}"]
+        for phase, h in self.latency.summary().items():
+            last_ms = last.get(phase)
+            last_text = f"{last_ms:.1f}" if last_ms is not None else "-"
+            lines.append(f"{phase:<18}{last_text:>10}{h['p95_ms']:>10.1f}{h['count']:>6}")
+        self.debug_overlay.config(text="\n".join(lines))
+
     def check_user_answer(self):
         """
         Check the user's answer and provide feedback.
         """
-        if self.question_paper._S == "/":
-            if self.input_user_answer.get().isdecimal() and self.input_user_answer_remainder.get().isdecimal():
-                self.question_paper.answer_user = int(self.input_user_answer.get())
-                self.question_paper.answer_user_remainder = int(self.input_user_answer_remainder.get())
-            else:
-                messagebox.showerror("Input Error", "Please type Numbers only!")
-                return
-        elif self.question_paper._S == "fraction":
-            if self.question_paper.choices:
-                if self.choice_var.get() == -1:
-                    messagebox.showerror("Input Error", "Please select an option!")
-                    return
-                self.question_paper.answer_user = self.choice_var.get()
-            else:
-                parsed = parse_fraction_mixed_input(self.input_user_answer.get())
-                if parsed is None:
-                    messagebox.showerror(
-                        "Input Error",
-                        "Please enter a number or fraction like a/b",
-                    )
-                    return
-                self.question_paper.answer_user = parsed
-        elif self.question_paper._S == "factors_primes":
-            mode = getattr(self.question_paper, "mode", "count")
-            text = self.input_user_answer.get().strip()
-            if mode == "list":
-                parsed = parse_factor_input(text)
-                if parsed is None:
-                    messagebox.showerror(
-                        "Input Error",
-                        "Enter factors separated by ×, * or spaces",
-                    )
-                    return
-                self.question_paper.answer_user = sorted(parsed)
-            elif mode == "count":
-                if text.isdigit():
-                    self.question_paper.answer_user = int(text)
-                else:
-                    messagebox.showerror("Input Error", "Please type Numbers only!")
-                    return
-            else:
-                if text.lower() in ["yes", "y", "1", "true"]:
-                    self.question_paper.answer_user = True
-                elif text.lower() in ["no", "n", "0", "false"]:
-                    self.question_paper.answer_user = False
-                else:
-                    messagebox.showerror("Input Error", "Please answer yes or no")
-                    return
-        elif self.question_paper._S == "prime_factorization":
-            parsed = parse_factor_input(self.input_user_answer.get())
-            if parsed is None:
-                messagebox.showerror(
-                    "Input Error",
-                    "Please enter prime factors separated by ×, * or spaces",
-                )
-                return
-            self.question_paper.answer_user = parsed
-        elif self.question_paper._S == "hcf":
-            if self.input_user_answer.get().isdecimal():
-                self.question_paper.answer_user = int(self.input_user_answer.get())
-            else:
-                messagebox.showerror("Input Error", "Please type Numbers only!")
-                return
-        else:
-            if self.input_user_answer.get().isdecimal():
-                self.question_paper.answer_user = int(self.input_user_answer.get())
-            else:
-                messagebox.showerror("Input Error", "Please type Numbers only!")
-                return
+        answer = self.typed_answer()
+        try:
+            with self.latency.span("grade"):
+                self.evaluation_result = grade_answer(self.question_paper, *answer)
+        except ValueError as e:
+            messagebox.showerror("Input Error", str(e))
+            return
 
         self.stats[self.question_paper._S]["total_attempts"] += 1
+        rating = self.ability.rating(self.question_paper._S)
+        if self.attempts_counter == 0:
+            self.ability.update(self.question_paper._S, self.question_difficulty, self.evaluation_result)
+        self.mastery.record(self.question_paper, self.evaluation_result)
+        response_time = self.response_timer.record(
+            self.question_asked,
+            self.attempts_counter + 1,
+            self.question_paper._S,
+            self.question_plan[self.question_index - 1][1],
+            self.evaluation_result,
+            self.submitted_at,
+            self.question_nominal,
+            rating,
+            answer,
+        )
 
-        if self.question_paper._S == "factors_primes":
-            mode = getattr(self.question_paper, "mode", "count")
-            if mode == "list":
-                self.evaluation_result = sorted(self.question_paper.answer_user) == sorted(self.question_paper.answer_actual)
-            elif mode == "count":
-                self.evaluation_result = (
-                    self.question_paper.answer_user == len(self.question_paper.factors)
-                )
-            else:
-                self.evaluation_result = (
-                    bool(self.question_paper.answer_user) == bool(self.question_paper.answer_actual)
-                )
-        elif self.question_paper._S == "prime_factorization":
-            user = Counter(self.question_paper.answer_user)
-            actual = Counter(self.question_paper.answer_actual)
-            self.evaluation_result = (
-                user == actual and all(is_prime(f) for f in self.question_paper.answer_user)
-            )
-        elif self.question_paper._S == "fraction" and not self.question_paper.choices:
-            actual = self.question_paper.answer_actual
-            user = self.question_paper.answer_user
-            if isinstance(actual, tuple):
-                self.evaluation_result = actual[0] * user[1] == user[0] * actual[1]
-            else:
-                self.evaluation_result = abs(actual - (user[0] / user[1])) < 1e-6
-        else:
-            self.evaluation_result = evaluate(
-                self.question_paper.answer_user,
-                self.question_paper.answer_actual,
-                self.question_paper.answer_user_remainder,
-                self.question_paper.answer_actual_remainder if self.question_paper._S == "/" else None,
-                self.question_paper._S,
-            )
+        kind = topic(self.question_paper._S)
         if self.evaluation_result == True:
-            if self.question_paper._S == "/":
-                self.evaluation_feedback.config(
-                    text=f"Correct!, For {self.question_paper.question}, the Quotient is {self.question_paper.answer_actual} & Remainder is {self.question_paper.answer_actual_remainder}",
-                    bg="green",
-                )
-            elif self.question_paper._S == "fraction":
-                if self.question_paper.choices:
-                    self.evaluation_feedback.config(
-                        text="Correct!",
-                        bg="green",
-                    )
-                else:
-                    ans = (
-                        f"{self.question_paper.answer_actual[0]}/{self.question_paper.answer_actual[1]}"
-                        if isinstance(self.question_paper.answer_actual, tuple)
-                        else str(self.question_paper.answer_actual)
-                    )
-                    self.evaluation_feedback.config(
-                        text=f"Correct!, {self.question_paper.question} is {ans}",
-                        bg="green",
-                    )
-            elif self.question_paper._S == "factors_primes":
-                number = self.question_paper._X
-                facs = self.question_paper.factors
-                status = (
-                    "a prime number"
-                    if len(facs) == 2
-                    else (
-                        "neither prime nor composite"
-                        if number == 1
-                        else "a composite number"
-                    )
-                )
-                pair = self.question_paper.twin_pair
-                pair_text = f" and part of the twin prime pair {pair}" if pair else ""
-                explanation = f"Factors of {number}: {', '.join(map(str, facs))}. It is {status}{pair_text}."
-                self.evaluation_feedback.config(
-                    text=f"Correct! {explanation}",
-                    bg="green",
-                )
-                if self.sound_variable.get() != "":
-                    GUI_Exam.speak(self.for_correct_answer(), explanation)
-            elif self.question_paper._S == "prime_factorization":
-                ans = " × ".join(map(str, sorted(self.question_paper.answer_actual)))
-                msg = f"Correct! Prime factorization of {self.question_paper._X} is {ans}"
-                self.evaluation_feedback.config(text=msg, bg="green")
-                if self.sound_variable.get() != "":
-                    GUI_Exam.speak(self.for_correct_answer(), msg)
-            elif self.question_paper._S == "hcf":
-                nums = self.question_paper.numbers
-                if len(nums) == 3:
-                    ntext = f"{nums[0]}, {nums[1]}, and {nums[2]}"
-                else:
-                    ntext = f"{nums[0]} and {nums[1]}"
-                msg = f"Correct! The HCF of {ntext} is {self.question_paper.answer_actual}."
-                self.evaluation_feedback.config(text=msg, bg="green")
-                if self.sound_variable.get() != "":
-                    GUI_Exam.speak(self.for_correct_answer(), msg)
-            elif self.question_paper._S == "lcm":
-                nums = self.question_paper.numbers
-                if len(nums) == 3:
-                    ntext = f"{nums[0]}, {nums[1]}, and {nums[2]}"
-                else:
-                    ntext = f"{nums[0]} and {nums[1]}"
-                explanation = lcm_explanation(nums, self.question_paper.method)
-                msg = f"Correct! The LCM of {ntext} is {self.question_paper.answer_actual}."
-                self.evaluation_feedback.config(text=f"{msg}\n{explanation}", bg="green")
-                if self.sound_variable.get() != "":
-                    GUI_Exam.speak(self.for_correct_answer(), msg, explanation)
-            else:
-                self.evaluation_feedback.config(
-                    text=f"Correct!, {self.question_paper.question} is {self.question_paper.answer_actual}",
-                    bg="green",
-                )
-            self.evaluation_feedback.grid(row=12, column=1, columnspan=8, pady=10)
+            text, speech = kind.explain(self.question_paper, True)
+            self.evaluation_feedback.config(text=text, bg="green")
             self.stats[self.question_paper._S]["correct_answers"] += 1
             self.exam_score += 1
             if self.sound_variable.get() != "":
-                if self.question_paper._S not in ["factors_primes", "prime_factorization"]:
-                    GUI_Exam.speak(self.for_correct_answer())
+                GUI_Exam.speak(self.for_correct_answer(), *speech)
         else:
             if self.attempts_counter == 0:
                 self.evaluation_feedback.config(
                     text="Your Answer is Incorrect, you've got 2 more attempts!",
                     bg="teal",
                 )
-                self.evaluation_feedback.grid(row=12, column=1, columnspan=8, pady=10)
                 self.attempts_counter += 1
                 if self.sound_variable.get() != "":
                     GUI_Exam.speak(self.for_incorrect_answer())
             elif self.attempts_counter == 1:
-                self.evaluation_feedback.grid_forget()
                 self.evaluation_feedback.config(
                     text="Your Answer is Incorrect, it's the last attempt!",
                     bg="yellow",
                 )
-                self.evaluation_feedback.grid(row=12, column=1, columnspan=8, pady=10)
                 self.attempts_counter += 1
                 if self.sound_variable.get() != "":
                     GUI_Exam.speak(self.for_incorrect_answer())
             elif self.attempts_counter == 2:
-                self.evaluation_feedback.grid_forget()
-                if self.question_paper._S == "/":
-                    self.evaluation_feedback.config(
-                        text=f"Incorrect!, For {self.question_paper.question} the Quotient is {self.question_paper.answer_actual} & Remainder is {self.question_paper.answer_actual_remainder} not {self.question_paper.answer_user} & {self.question_paper.answer_user_remainder}",
-                        bg="red",
-                    )
-                    if self.sound_variable.get() != "":
-                        GUI_Exam.speak(
-                            f"Incorrect!, For {self.question_paper.question} the Quotient is {self.question_paper.answer_actual} & Remainder is {self.question_paper.answer_actual_remainder}"
-                        )
-                else:
-                    if self.question_paper._S == "fraction":
-                        if self.question_paper.choices:
-                            self.evaluation_feedback.config(
-                                text="Incorrect!",
-                                bg="red",
-                            )
-                            if self.sound_variable.get() != "":
-                                GUI_Exam.speak("Incorrect!")
-                        else:
-                            ans = (
-                                f"{self.question_paper.answer_actual[0]}/{self.question_paper.answer_actual[1]}"
-                                if isinstance(self.question_paper.answer_actual, tuple)
-                                else str(self.question_paper.answer_actual)
-                            )
-                            user_ans = (
-                                f"{self.question_paper.answer_user[0]}/{self.question_paper.answer_user[1]}"
-                                if isinstance(self.question_paper.answer_user, tuple)
-                                else str(self.question_paper.answer_user)
-                            )
-                            self.evaluation_feedback.config(
-                                text=f"Incorrect!, {self.question_paper.question} is {ans} not {user_ans}",
-                                bg="red",
-                            )
-                            if self.sound_variable.get() != "":
-                                GUI_Exam.speak(
-                                    f"Incorrect!, {self.question_paper.question} is {ans} not {user_ans}"
-                                )
-                    elif self.question_paper._S == "factors_primes":
-                        number = self.question_paper._X
-                        facs = self.question_paper.factors
-                        status = (
-                            "a prime number"
-                            if len(facs) == 2
-                            else (
-                                "neither prime nor composite"
-                                if number == 1
-                                else "a composite number"
-                            )
-                        )
-                        pair = self.question_paper.twin_pair
-                        pair_text = f" and part of the twin prime pair {pair}" if pair else ""
-                        explanation = f"The number {number} has {len(facs)} factors: {', '.join(map(str, facs))}. It is {status}{pair_text}."
-                        self.evaluation_feedback.config(
-                            text=f"Incorrect! {explanation}",
-                            bg="red",
-                        )
-                        if self.sound_variable.get() != "":
-                            GUI_Exam.speak(f"Incorrect! {explanation}")
-                    elif self.question_paper._S == "prime_factorization":
-                        ans = " × ".join(map(str, sorted(self.question_paper.answer_actual)))
-                        msg = f"Incorrect. The correct prime factorization of {self.question_paper._X} is {ans}"
-                        self.evaluation_feedback.config(text=msg, bg="red")
-                        if self.sound_variable.get() != "":
-                            GUI_Exam.speak(msg)
-                    elif self.question_paper._S == "hcf":
-                        nums = self.question_paper.numbers
-                        if len(nums) == 3:
-                            ntext = f"{nums[0]}, {nums[1]}, and {nums[2]}"
-                        else:
-                            ntext = f"{nums[0]} and {nums[1]}"
-                        msg = f"Incorrect. The correct HCF of {ntext} is {self.question_paper.answer_actual}."
-                        self.evaluation_feedback.config(text=msg, bg="red")
-                        if self.sound_variable.get() != "":
-                            GUI_Exam.speak(msg)
-                    elif self.question_paper._S == "lcm":
-                        nums = self.question_paper.numbers
-                        if len(nums) == 3:
-                            ntext = f"{nums[0]}, {nums[1]}, and {nums[2]}"
-                        else:
-                            ntext = f"{nums[0]} and {nums[1]}"
-                        explanation = lcm_explanation(nums, self.question_paper.method)
-                        msg = f"Incorrect. The LCM of {ntext} is {self.question_paper.answer_actual}."
-                        self.evaluation_feedback.config(text=f"{msg}\n{explanation}", bg="red")
-                        if self.sound_variable.get() != "":
-                            GUI_Exam.speak(msg, explanation)
-                    else:
-                        self.evaluation_feedback.config(
-                            text=f"Incorrect!, {self.question_paper.question} is {self.question_paper.answer_actual} not {self.question_paper.answer_user}",
-                            bg="red",
-                        )
-                        if self.sound_variable.get() != "":
-                            GUI_Exam.speak(
-                                f"Incorrect!, {self.question_paper.question} is {self.question_paper.answer_actual} not {self.question_paper.answer_user}"
-                            )
-                self.evaluation_feedback.grid(row=12, column=1, columnspan=8, pady=10)
+                text, speech = kind.explain(self.question_paper, False)
+                self.evaluation_feedback.config(text=text, bg="red")
+                if self.sound_variable.get() != "":
+                    GUI_Exam.speak(*speech)
                 self.attempts_counter += 1
                 if self.sound_variable.get() != "":
                     GUI_Exam.speak(self.for_failed_attempt())
 
-        # record time taken for this question
-        elapsed = (datetime.now() - self.current_question_start).total_seconds()
+        # record the learner's own time for this attempt
         stats = self.stats[self.question_paper._S]
-        stats["total_time"] += elapsed
+        stats["total_time"] += response_time
         if self.evaluation_result and self.attempts_counter == 0:
             stats["first_try_correct"] += 1
+        if self.evaluation_result or self.attempts_counter > 2:
+            outcome = review_outcome(self.reviews.get(self.question_index - 1), self.question_paper,
+                                     self.question_nominal, self.evaluation_result, self.attempts_counter + 1)
+            if outcome is not None:
+                self.review_outcomes.append(outcome)
 
         # Check if all questions have been asked
+        log = None
         if self.question_asked < self.question_to_ask and (self.evaluation_result == True or self.attempts_counter > 2):
             # disable submit to avoid double-counting
             self.check_button.config(state="disabled")
-            self.store_data()
+            with self.latency.span("store_data"):
+                log = self.store_data()
             self.attempts_counter = 0
-            self.generate_question()
+            with self.latency.span("generate_question"):
+                self.generate_question()
         elif self.question_asked <= self.question_to_ask and self.evaluation_result != True and self.attempts_counter <= 2:
             pass
         elif self.question_asked == self.question_to_ask and (self.evaluation_result == True or self.attempts_counter > 2):
             self.check_button.config(state="disabled")
-            self.store_data()
+            with self.latency.span("store_data"):
+                log = self.store_data()
             self.end_time = datetime.now()
             self.test_end = self.end_time.strftime("%I:%M%p")
+        with self.latency.span("checkpoint"):
+            self.checkpoint.add(self.response_timer.attempts[-1], log, self.session_record)
+        if self.end_time is not None:
             self.launch_result_frame()
         
         # Clear the content of Input Entry Box
         self.input_user_answer.delete(0, END)
         self.input_user_answer_remainder.delete(0, END)
+        self.yes_no_var.set("")
 
     def launch_result_frame(self):
         """Launch the result screen after completing the exam."""
@@ -1852,40 +3842,174 @@ class GUI_Exam(Exam):
         # 3.1 Creating a display for grades
         self.grade.set(get_grade(self.exam_score, self.question_asked))
         self.grade_label.config(text=self.grade.get())
-        Label(self.result_frame, width=25, height=3).grid(row=0, column=0, columnspan=5)
+        self.result_spacers[0].grid(row=0, column=0, columnspan=5)
         self.grade_label.grid(row=1, column=0, rowspan=3, columnspan=8)
 
         # 3.2 Creating the exam stat chart
-        Label(self.result_frame, width=25, height=10).grid(row=3, column=0, columnspan=5)
+        self.result_spacers[1].grid(row=3, column=0, columnspan=5)
         self.stat_frame.grid(row=4, column=0, columnspan=10)
         
         # 3.2.1 Creating test start info
-        Label(
-        self.stat_frame,
+        self.stat_time_label.config(
         text=f"Test Date: {self.start_time.strftime('%d-%B-%Y')}\nTest started on: {self.test_start}\nTest ended on: {self.test_end}\nExam Duration: {round((self.end_time - self.start_time).total_seconds()/60, 2)} minutes",
-        font=("Bell MT", 16), justify="left"
-        ).pack(pady=5)
-        Label(
-        self.stat_frame,
+        )
+        self.stat_time_label.pack(pady=5)
+        self.stat_score_label.config(
         text=f"Score: {self.exam_score}\nTotal Questions: {self.question_asked}\nPercent Marks: {round(self.exam_score/self.question_asked*100, 2)}%",
-        font=("Bell MT", 16), justify="left"
-        ).pack(pady=5)
+        )
+        self.stat_score_label.pack(pady=5)
         
-        # 3.2.2 Adding quit button
-        Label(self.result_frame, width=25, height=3).grid(row=12, column=0, columnspan=5)
-        self.quit_button.grid(row=13, column=0, rowspan=10, columnspan=10)
+        # 3.2.2 Adding new quiz and quit buttons
+        self.result_spacers[2].grid(row=12, column=0, columnspan=5)
+        self.new_quiz_button.grid(row=13, column=0, columnspan=10, pady=(0, 10))
+        self.quit_button.grid(row=14, column=0, columnspan=10)
         
         # 3.2.3 Grades announcment
         if self.sound_variable.get() != "":
-            GUI_Exam.speak(tell_grade(self.grade.get()))
+            GUI_Exam.speak(tell_grade(self.grade.get(), self.feedback_random))
 
-        self.store_data()
-        self.make_pdf()
-        self.make_excel_summary()
+        with self.latency.span("store_data"):
+            self.store_data()
+        with self.latency.span("make_pdf"):
+            self.make_pdf()
+        with self.latency.span("excel_summary"):
+            self.make_excel_summary()
+        if self.profiler is not None:
+            self.profiler.stop()
+            self.profiler = None
     
+    def new_quiz(self):
+        """Go back to the home screen for another quiz, reusing this window's widgets."""
+        self.result_frame.pack_forget()
+        self.reset_session()
+        self.launch_home_frame()
+
+    def reset_session(self):
+        """Forget the finished quiz's questions, scores, timers and answers."""
+        self.question_asked, self.exam_score = 0, 0
+        self.attempts_counter = 0
+        self.start_time, self.test_start, self.question_paper = None, None, None
+        self.evaluation_result, self.end_time, self.test_end = None, None, None
+        self.question_plan = self.session_record = self.reviews = None
+        self.question_index, self.levels = 0, None
+        self.review_outcomes = []
+        self.stats = {}
+        # the learner's ratings, facts and recent questions are picked up again by the next quiz
+        self.ability = self.mastery = self.recent = None
+        self.response_timer = None
+        self.session_random = None
+        self.checkpoint = None
+        GUI_Exam.latency = None
+        self.file_name = f"Practice_dated_{datetime.now().strftime('%d-%b-%y-%I%M')}"
+        self.file_open_mode = None
+        self.pdf = None
+        self.display_question.set("")
+        self.grade.set("")
+        self.question_label.config(text="")
+        self.evaluation_feedback.config(text="", bg=self.bg_color)
+        self.input_user_answer.delete(0, END)
+        self.input_user_answer_remainder.delete(0, END)
+        self.yes_no_var.set("")
+        self.choice_var.set(-1)
+
+    def offer_resume(self):
+        """Offer to carry on with the active learner's unfinished quiz, if there is one."""
+        path = active_learner.checkpoint_path
+        saved = SessionCheckpoint.load(path)
+        if saved is None:
+            return
+        header, entries = saved
+        record = header["record"]
+        started = datetime.fromisoformat(header["start_time"])
+        answered = sum(1 for entry in entries if entry["log"])
+        if not messagebox.askyesno(
+            "Unfinished Quiz",
+            f"{active_learner.name} has an unfinished quiz from {started.strftime('%d-%B-%Y %I:%M%p')}, "
+            f"{answered} of {record['total']} questions answered.\n\nCarry on where it stopped?",
+            parent=GUI_Exam.root,
+        ):
+            SessionCheckpoint(path).finish()
+            return
+        try:
+            session = resume_session(header, entries)
+        except ValueError as e:
+            messagebox.showerror("Unfinished Quiz", f"The quiz could not be resumed: {e}.", parent=GUI_Exam.root)
+            SessionCheckpoint(path).finish()
+            return
+        self.resume_quiz(header, entries, session)
+
+    def resume_quiz(self, header, entries, session):
+        """Take over the session rebuilt by ``resume_session`` and show its current question."""
+        record = header["record"]
+        self.status_checkbox = record["operations"]
+        self.question_to_ask = record["total"]
+        self.levels = record["levels"]
+        self.session_random = session.session_random
+        self.session_record = record
+        self.question_plan = session.question_plan
+        self.reviews = record["reviews"] = session.reviews
+        self.review_outcomes = session.review_outcomes
+        self.question_index = session.question_index
+        self.question_asked, self.exam_score = session.question_asked, session.exam_score
+        self.attempts_counter = session.attempts_counter
+        self.question_paper = session.question_paper
+        self.question_nominal, self.question_difficulty = session.question_nominal, session.question_difficulty
+        self.stats = {op: {"total_questions": 0, "correct_answers": 0, "total_attempts": 0,
+                           "total_time": 0.0, "first_try_correct": 0} for op in record["operations"]}
+        self.stats.update(session.stats)
+        # fact mastery and recent questions are files written as the quiz went; the ratings are not
+        self.ability = active_learner.ability
+        self.ability.state.update({op: list(entry) for op, entry in session.ability.state.items()})
+        self.mastery = active_learner.mastery
+        self.recent = active_learner.recent
+        self.file_name = header["file_name"]
+        self.start_time = session.start_time
+        self.test_start = self.start_time.strftime("%I:%M%p")
+        os.makedirs(active_learner.output_dir, exist_ok=True)
+        with open(os.path.join(active_learner.output_dir, f"{self.file_name}.txt"), "w") as file:
+            file.write("".join(entry["log"] for entry in entries if entry["log"]))
+        self.checkpoint = SessionCheckpoint(active_learner.checkpoint_path)
+        self.checkpoint.reopen(len(record["questions"]))
+        self.response_timer = session.response_timer
+        self.show_exam_frame()
+        if session.finished:
+            # every question was answered, but the results were not saved
+            self.end_time = datetime.now()
+            self.test_end = self.end_time.strftime("%I:%M%p")
+            self.launch_result_frame()
+            self.save_latency()
+            self.checkpoint.finish()
+            return
+        self.show_question()
+        self.root.after_idle(self.response_timer.displayed)
+
+    # bar pictures of fraction choices by (numerator, denominator), drawn once
+    bar_images = {}
+
+    @classmethod
+    def fraction_bar(cls, numerator, denominator, width=120, height=80):
+        """Return a bar cut into *denominator* parts with *numerator* of them shaded."""
+        image = cls.bar_images.get((numerator, denominator))
+        if image is None:
+            image = PhotoImage(width=width, height=height)
+            for j in range(denominator):
+                x0, x1 = j * width // denominator, (j + 1) * width // denominator
+                image.put("#0000ff" if j < numerator else "#ffffff", to=(x0, 0, x1, height))
+                image.put("#000000", to=(x0, 0, x0 + 1, height))
+            image.put("#000000", to=(width - 1, 0, width, height))
+            image.put("#000000", to=(0, 0, width, 1))
+            image.put("#000000", to=(0, height - 1, width, height))
+            cls.bar_images[(numerator, denominator)] = image
+        return image
+
+    @property
+    def feedback_random(self):
+        """The session's feedback stream, or the module-level generator outside a quiz."""
+        return random if self.session_random is None else self.session_random.feedback
+
     def for_correct_answer(self):
         """Provide a random message for correct answers."""
-        return random.choice([
+        return self.feedback_random.choice([
         "Bingo! You're practically a math magician!",
         "Nailed it! You're as sharp as a ninja star!",
         "Absolutely correct! You're a math superhero in the making!",
@@ -1915,7 +4039,7 @@ class GUI_Exam(Exam):
     
     def for_incorrect_answer(self):
         """Provide a random message for incorrect answers."""
-        return random.choice([
+        return self.feedback_random.choice([
         "Oopsie-doodle! No worries, superheroes stumble too!",
         "Close, but no cookie this time! You'll get it next round, I believe in you!",
         "Uh-oh! The numbers did a little dance, but don't worry, you'll catch the rhythm next time!",
@@ -1945,7 +4069,7 @@ class GUI_Exam(Exam):
 
     def for_failed_attempt(self):
         """Provide a random message for failed attempts."""
-        return random.choice([
+        return self.feedback_random.choice([
         "Phew, tricky one! No worries, every mistake is a chance to learn something new!",
         "Whoa, that one did a little twist! Mistakes happen, but so does progress. Ready for the next adventure?",
         "That was a toughie! Don't worry, you're building a super-strong brain by giving it a workout!",
@@ -1980,11 +4104,12 @@ class GUI_Exam(Exam):
             self.file_open_mode = "a"
         if self.test_end == None:
             a = self.display_question.get()
-            if self.question_paper._S == "fraction" and self.question_paper.choices:
+            layout, _ = topic(self.question_paper._S).layout(self.question_paper)
+            if layout == "choices":
                 b = f"Your Answer: Option {self.choice_var.get()+1}"
             else:
-                b = f"Your Answer: {self.input_user_answer.get()}"
-            c = f"Remainder: {self.input_user_answer_remainder.get()}" if self.question_paper._S == "/" else None
+                b = f"Your Answer: {self.typed_answer()[0]}"
+            c = f"Remainder: {self.input_user_answer_remainder.get()}" if layout == "quotient" else None
             d = (
                 f"You answered Correctly in Attempt No.: {self.attempts_counter+1}"
                 if self.attempts_counter < 3
@@ -1995,195 +4120,69 @@ class GUI_Exam(Exam):
             b = f"Test Dated: {self.start_time.strftime('%d-%B-%Y')}\nTest Started: {self.test_start}"
             c = f"Test Ended: {self.test_end}"
             d = f"Exam Duration: {round((self.end_time - self.start_time).total_seconds()/60, 2)} minutes"
-        with open(os.path.join(OUTPUT_DIR, f"{self.file_name}.txt"), (self.file_open_mode)) as file:
-            if a!= None and b==None and c==None and d==None:
-                file.write(str(f"{a}\n\n"))
-                return
-            elif a!= None and b!=None and c==None and d==None:
-                file.write(str(f"{a}\n"))
-                file.write(str(f"{b}\n\n"))
-                return
-            elif a!= None and b!=None and c!=None and d==None:
-                file.write(str(f"{a}\n"))
-                file.write(str(f"{b}\n"))
-                file.write(str(f"{c}\n\n"))
-                return
-            elif a!= None and b!=None and c==None and d!=None:
-                file.write(str(f"{a}\n"))
-                file.write(str(f"{b}\n"))
-                file.write(str(f"{d}\n\n"))
-                return
-            elif a!= None and b!=None and c!=None and d!=None:
-                file.write(str(f"{a}\n"))
-                file.write(str(f"{b}\n"))
-                file.write(str(f"{c}\n"))
-                file.write(str(f"{d}\n\n"))
-                return
+        text = "".join(f"{line}\n" for line in (a, b, c, d) if line is not None) + "\n"
+        os.makedirs(active_learner.output_dir, exist_ok=True)
+        with open(os.path.join(active_learner.output_dir, f"{self.file_name}.txt"), (self.file_open_mode)) as file:
+            file.write(text)
+        return text
 
     def make_pdf(self):
         self.pdf = PDF()
         self.pdf.set_title("Mathematics Practice")
         self.pdf.set_author("Vijendra Singh")
-        self.pdf.print_chapter(f"{self.file_name}.txt")
-        self.pdf.output(os.path.join(OUTPUT_DIR, f"Worksheet_{datetime.now().strftime('%d-%b-%y-%I%M')}.pdf"))
+        self.pdf.print_chapter(os.path.join(active_learner.output_dir, f"{self.file_name}.txt"))
+        self.pdf.output(os.path.join(active_learner.output_dir, f"Worksheet_{datetime.now().strftime('%d-%b-%y-%I%M')}.pdf"))
+
+    def save_latency(self):
+        """Export latency histograms, attempt response times and the session record to JSON and the learner store."""
+        stamp = self.start_time.strftime("%Y-%m-%d %H:%M:%S.%f")
+        self.latency.export(
+            os.path.join(active_learner.output_dir, f"Latency_{self.start_time.strftime('%d-%b-%y-%I%M')}.json"),
+            learner=active_learner.learner_id,
+            session_start=stamp,
+        )
+        learner_store.save_latency(active_learner.learner_id, stamp, self.latency.summary())
+        learner_store.save_attempts(active_learner.learner_id, stamp, self.response_timer.attempts)
+        learner_store.save_session(active_learner.learner_id, stamp, self.session_record)
 
     def update_difficulty_scores(self):
-        """Update difficulty for each operation based on session performance."""
-        for op, data in self.stats.items():
-            total = data.get("total_questions", 0)
-            if total == 0:
-                continue
-
-            accuracy = (data.get("correct_answers", 0) / total) * 100
-            avg_attempts = data.get("total_attempts", 0) / total
-            avg_time = data.get("total_time", 0) / total
-
-            current = difficulty_scores.get(op, DEFAULT_DIFFICULTY.get(op, 2.0))
-
-            if accuracy >= 80 and avg_attempts <= 1.3 and avg_time < 20:
-                current += 0.1
-            elif accuracy < 60 and avg_attempts >= 2.5 and avg_time > 45:
-                current -= 0.1
-
-            difficulty_scores[op] = current
+        """Set each practised operation's difficulty from the ability estimate."""
+        self.ability.apply_to(difficulty_scores, self.stats)
 
     def make_excel_summary(self):
         self.update_difficulty_scores()
 
-        rows = []
-        for k, v in self.stats.items():
-            total = v["total_questions"]
-            correct = v["correct_answers"]
-            attempts = v["total_attempts"]
-            accuracy = round((correct / total * 100) if total else 0, 2)
-            accuracy = clamp_percent(accuracy)
-            rows.append({
-                "Question Type": op_names.get(k, k),
-                "Total Questions": total,
-                "Correct Answers": correct,
-                "Total Attempts": attempts,
-                "Accuracy (%)": accuracy,
-            })
-
-        df_summary = pd.DataFrame(rows)
-
-        overall_acc = round(self.exam_score / self.question_asked * 100, 2) if self.question_asked else 0
-        overall_acc = clamp_percent(overall_acc)
-        meta = {
-            "Start Time": self.test_start,
-            "End Time": self.test_end,
-            "Duration": f"{round((self.end_time - self.start_time).total_seconds()/60, 2)} minutes",
-            "Total Questions": self.question_asked,
-            "Total Correct": self.exam_score,
-            "Overall Accuracy (%)": overall_acc,
-        }
-        meta_df = pd.DataFrame(list(meta.items()), columns=["Metric", "Value"])
+        df_summary, meta_df = build_session_summary(
+            self.stats,
+            self.exam_score,
+            self.question_asked,
+            self.start_time,
+            self.end_time,
+            self.test_start,
+            self.test_end,
+        )
 
         # update the master workbook with a new summary sheet and log entries
         self.update_all_sessions_log(df_summary, meta_df)
 
     def update_all_sessions_log(self, df_summary, meta_df):
         """Create or update AllSessions.xlsx with log, index, and summary sheets."""
-        path = os.path.join(OUTPUT_DIR, "AllSessions.xlsx")
-        os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-        if os.path.exists(path):
-            wb = load_workbook(path)
-        else:
-            wb = Workbook()
-            # remove default sheet and create Log and Index
-            default = wb.active
-            wb.remove(default)
-            log_ws = wb.create_sheet("Log")
-            log_ws.append([
-                "Date",
-                "Time",
-                "Question Type",
-                "Total Questions",
-                "Correct Answers",
-                "Total Attempts",
-                "Accuracy (%)",
-                "Start Time",
-                "End Time",
-                "Duration",
-            ])
-            idx_ws = wb.create_sheet("Index")
-            idx_ws.append([
-                "Session Number",
-                "Date",
-                "Start Time",
-                "End Time",
-                "Duration",
-                "Total Questions",
-                "Accuracy (%)",
-                "Summary Sheet",
-            ])
-
-        # ensure worksheets exist
-        log_ws = wb["Log"] if "Log" in wb.sheetnames else wb.create_sheet("Log")
-        idx_ws = wb["Index"] if "Index" in wb.sheetnames else wb.create_sheet("Index")
-
-        from openpyxl.utils.dataframe import dataframe_to_rows
-
-        # determine next session number based on summary sheets
-        session_num = len([s for s in wb.sheetnames if s.startswith("Summary_")]) + 1
-        summary_name = f"Summary_{session_num:03d}"
-        summary_ws = wb.create_sheet(summary_name)
-
-        # write summary table
-        for r in dataframe_to_rows(df_summary, index=False, header=True):
-            summary_ws.append(r)
-        summary_ws.append([])
-        for r in dataframe_to_rows(meta_df, index=False, header=True):
-            summary_ws.append(r)
-
-        # append entries to log sheet
-        date_str = self.start_time.strftime("%Y-%m-%d")
-        time_str = self.start_time.strftime("%H:%M:%S")
-        start_full = self.start_time.strftime("%Y-%m-%d %H:%M:%S")
-        end_full = self.end_time.strftime("%Y-%m-%d %H:%M:%S")
-        duration = round((self.end_time - self.start_time).total_seconds() / 60, 2)
-
-        for r in df_summary.to_dict("records"):
-            log_ws.append([
-                date_str,
-                time_str,
-                r["Question Type"],
-                r["Total Questions"],
-                r["Correct Answers"],
-                r["Total Attempts"],
-                r["Accuracy (%)"],
-                start_full,
-                end_full,
-                duration,
-            ])
-
-        # append index row with hyperlink to summary sheet
-        overall_accuracy = clamp_percent(
-            meta_df.loc[meta_df["Metric"] == "Overall Accuracy (%)", "Value"].iloc[0]
-        )
-        idx_row = [
-            session_num,
-            date_str,
-            time_str,
-            self.end_time.strftime("%H:%M:%S"),
-            duration,
+        write_all_sessions_log(
+            active_learner.sessions_path,
+            df_summary,
+            meta_df,
+            self.start_time,
+            self.end_time,
             self.question_asked,
-            overall_accuracy,
-        ]
-        idx_ws.append(idx_row + [summary_name])
-        link_cell = idx_ws.cell(row=idx_ws.max_row, column=len(idx_row) + 1)
-        link_cell.hyperlink = f"#{summary_name}!A1"
-        link_cell.style = "Hyperlink"
-
-        # save workbook and then record difficulty scores for this session
-        wb.save(path)
+        )
         append_difficulty_session(difficulty_scores)
 
         save_difficulty_scores(difficulty_scores)
+        active_learner.commit_state()
+        active_learner.reviews.record(self.review_outcomes)
 
 
-class PDF(FPDF, GUI_Exam):
+class PDF(FPDF):
     def header(self):
         logo_path = resource_path("logo_image.jpg")
         if os.path.exists(logo_path):
@@ -2224,7 +4223,7 @@ class PDF(FPDF, GUI_Exam):
 
     def chapter_body(self, filepath):
         # Reading text file:
-        with open(os.path.join(OUTPUT_DIR, f"{root_instance.file_name}.txt"), "rb") as fh:
+        with open(filepath, "rb") as fh:
             txt = fh.read().decode("latin-1")
         # Setting font: Times 12
         self.set_font("Times", size=12)
@@ -2241,9 +4240,540 @@ class PDF(FPDF, GUI_Exam):
         self.chapter_body(filepath)
 
 
+class QuizSession:
+    """
+    A quiz session without any Tk widgets.
+
+    Follows the exam screen: the same question plan, three attempts per
+    question, the same grading rules and the same end-of-session difficulty
+    update. Headless front ends such as the classroom server use it.
+    """
+
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, profile, operations, total, split=1.0, level_step=None, seed=None, levels=None,
+                 table=None, reviews=None):
+        self.profile = profile
+        self.scores = profile.scores
+        self.total = total
+        self.stats = {}
+        self.level_step = level_step
+        self.ability = profile.ability
+        self.mastery = profile.mastery
+        self.recent = profile.recent
+        self.table = calibration if table is None else table
+        self.session_random = SessionRandom(seed)
+        if levels is None:
+            levels = determine_difficulty_levels(self.scores, profile.thresholds, split)
+        self.record = session_record(self.session_random, operations, total, levels, self.scores, self.ability,
+                                     level_step, self.table, self.mastery)
+        self.question_plan = build_question_plan(operations, total, levels, self.session_random.plan)
+        if reviews is None:
+            queue = profile.reviews
+            due = [] if queue is None else queue.take(self.record["operations"], max(1, total // ReviewQueue.SHARE))
+            reviews = place_reviews(self.question_plan, due, self.session_random.plan)
+        else:
+            for index, item in reviews.items():
+                self.question_plan[index] = (item["operation"], "Review")
+        self.reviews = self.record["reviews"] = reviews
+        self.review_outcomes = []
+        self.question_index = 0
+        self.question_asked, self.exam_score = 0, 0
+        self.attempts_counter = 0
+        self.question_paper = None
+        self.question_nominal = self.question_difficulty = None
+        self.response_timer = ResponseTimer()
+        self.start_time, self.end_time = datetime.now(), None
+
+    @classmethod
+    def replay(cls, record):
+        """Rebuild a stored session from its record, ready to be answered again."""
+        scores = dict(record["scores"])
+        ability = AbilityEstimator({op: list(entry) for op, entry in record["ability"].items()}, scores)
+        # older records predate fact mastery and repeat avoidance
+        mastery = None if record.get("mastery") is None else FactMastery.from_snapshot(record["mastery"])
+        recent = ReplayedRecent(record["skips"]) if "skips" in record else None
+        profile = SimpleNamespace(scores=scores, ability=ability, mastery=mastery, recent=recent, thresholds=None,
+                                  reviews=None)
+        reviews = {int(index): item for index, item in record.get("reviews", {}).items()}
+        return cls(profile, record["operations"], record["total"], level_step=record["level_step"],
+                   seed=record["seed"], levels=record["levels"], table=Calibration(record["calibration"]),
+                   reviews=reviews)
+
+    @property
+    def finished(self):
+        return self.end_time is not None
+
+    def next_question(self):
+        """Generate the next planned question and return it."""
+        op, level = self.question_plan[self.question_index]
+        item = self.reviews.get(self.question_index)
+        self.question_index += 1
+        if self.recent is not None:
+            self.recent.start()
+        if item is not None:
+            self.question_paper, self.question_nominal, self.question_difficulty = review_question(item, self.table)
+        else:
+            self.question_paper, self.question_nominal, self.question_difficulty = pitch_question(
+                self.ability, op, level, self.level_step, self.session_random.questions, self.table, self.mastery,
+                self.recent
+            )
+        self.record["questions"].append(self.question_paper.question)
+        if self.recent is not None:
+            self.recent.add(question_key(self.question_paper))
+            self.record["skips"].append(self.recent.hits)
+        if op not in self.stats:
+            self.stats[op] = {"total_questions": 0, "correct_answers": 0,
+                              "total_attempts": 0, "total_time": 0.0,
+                              "first_try_correct": 0}
+        self.stats[op]["total_questions"] += 1
+        self.question_asked += 1
+        self.attempts_counter = 0
+        self.response_timer.displayed()
+        return self.question_paper
+
+    def submit(self, text, remainder_text="", choice=-1):
+        """
+        Grade one attempt at the current question.
+
+        Returns ``(correct, done)`` where *done* means the question is closed,
+        either answered correctly or out of attempts. Unparsable input raises
+        ``ValueError`` and does not use up an attempt.
+        """
+        paper = self.question_paper
+        correct = grade_answer(paper, text, remainder_text, choice)
+        stats = self.stats[paper._S]
+        stats["total_attempts"] += 1
+        rating = self.ability.rating(paper._S)
+        if self.attempts_counter == 0:
+            self.ability.update(paper._S, self.question_difficulty, correct)
+        if self.mastery is not None:
+            self.mastery.record(paper, correct)
+        stats["total_time"] += self.response_timer.record(
+            self.question_asked,
+            self.attempts_counter + 1,
+            paper._S,
+            self.question_plan[self.question_index - 1][1],
+            correct,
+            difficulty=self.question_nominal,
+            rating=rating,
+            answer=(text, remainder_text, choice),
+        )
+        # the result goes straight back to the learner, so the next attempt starts now
+        self.response_timer.displayed()
+        if correct:
+            stats["correct_answers"] += 1
+            self.exam_score += 1
+        else:
+            self.attempts_counter += 1
+        if correct and self.attempts_counter == 0:
+            stats["first_try_correct"] += 1
+        done = correct or self.attempts_counter >= self.MAX_ATTEMPTS
+        if done:
+            outcome = review_outcome(self.reviews.get(self.question_index - 1), paper, self.question_nominal,
+                                     correct, self.attempts_counter + 1)
+            if outcome is not None:
+                self.review_outcomes.append(outcome)
+        if done and self.question_asked >= self.total:
+            self.end_time = datetime.now()
+        return correct, done
+
+    def finish(self):
+        """Apply the difficulty update and return the record to commit."""
+        self.ability.apply_to(self.scores, self.stats)
+        df_summary, meta_df = build_session_summary(
+            self.stats,
+            self.exam_score,
+            self.question_asked,
+            self.start_time,
+            self.end_time,
+            self.start_time.strftime("%I:%M%p"),
+            self.end_time.strftime("%I:%M%p"),
+        )
+        return {"summary": df_summary, "meta": meta_df, "scores": dict(self.scores),
+                "attempts": list(self.response_timer.attempts), "session": self.record,
+                "reviews": list(self.review_outcomes)}
+
+    def commit(self, record):
+        """Write a finished session to the learner's workbook and profile."""
+        self.apply(record)
+        self.save(record)
+
+    def apply(self, record):
+        """
+        Fold a finished session into the learner's in-memory profile.
+
+        The classroom server calls this on its event loop, where sessions are
+        built, and runs only ``save`` on a worker thread. ``save`` works from
+        *record* and the ability snapshot added here, never from the live
+        profile, which the next session may already be changing.
+        """
+        self.profile.remember_scores(record["scores"])
+        record["ability"] = {op: list(entry) for op, entry in self.ability.state.items()}
+
+    def save(self, record):
+        """Write a session, after ``apply``, to the workbook and the learner store."""
+        with self.profile.save_lock:
+            path = self.profile.sessions_path
+            write_all_sessions_log(
+                path,
+                record["summary"],
+                record["meta"],
+                self.start_time,
+                self.end_time,
+                self.question_asked,
+            )
+            append_difficulty_session(record["scores"], path)
+            self.profile.store.save_scores(self.profile.learner_id, record["scores"])
+            self.profile.commit_state(record["ability"])
+            stamp = self.start_time.strftime("%Y-%m-%d %H:%M:%S.%f")
+            self.profile.store.save_attempts(self.profile.learner_id, stamp, record["attempts"])
+            self.profile.store.save_session(self.profile.learner_id, stamp, record["session"])
+            self.profile.reviews.record(record["reviews"])
+
+
+def replay_session(record, attempts):
+    """
+    Regenerate a stored session from its seed and grade the recorded answers again.
+
+    *record* comes from ``LearnerStore.load_session`` and *attempts* from
+    ``LearnerStore.load_attempts`` for the same session. Returns the
+    replayed ``QuizSession`` and one row per attempt. A row's ``match`` is
+    false when the regenerated question or its grade differs from the
+    original, for example after a change to the question generator. The
+    replay stops at the first answer that cannot be graded.
+    """
+    session = QuizSession.replay(record)
+    rows = []
+    for a in attempts:
+        if a["question"] != session.question_asked:
+            session.next_question()
+        paper = session.question_paper
+        original = record["questions"][a["question"] - 1] if a["question"] <= len(record["questions"]) else None
+        row = {"question": a["question"], "attempt": a["attempt"], "operation": paper._S,
+               "text": paper.question, "original": original, "key": format_answer(paper), "answer": None,
+               "recorded": a["correct"], "correct": None, "match": False}
+        rows.append(row)
+        if a["answer"] is None:
+            # stored before answers were kept
+            break
+        text, remainder_text, choice = json.loads(a["answer"])
+        row["answer"] = text if paper._S != "/" else f"{text} r {remainder_text}"
+        if paper.choices:
+            row["answer"] = f"option {choice}"
+        try:
+            correct, _ = session.submit(text, remainder_text, choice)
+        except ValueError:
+            break
+        row["correct"] = int(correct)
+        row["match"] = paper.question == original and row["correct"] == a["correct"]
+    return session, rows
+
+
+class SessionCheckpoint:
+    """
+    The quiz in progress, kept in an append-only JSON-lines file in the
+    learner's folder, so a closed window or a crash loses at most the
+    attempt being typed.
+
+    The first line holds the session record, the practice file name and
+    the start time. Each graded attempt then appends one short line: its
+    ``ResponseTimer`` row, the text added to the practice file, and the
+    next question's text and repeats when one was shown. Nothing is
+    rewritten, so every write is a few hundred bytes however long the
+    quiz. ``resume_session`` rebuilds everything else from these. The file
+    is removed once the finished session is saved.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.questions = 0
+
+    def start(self, header):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.file = open(self.path, "w", encoding="utf-8")
+        self.questions = len(header["record"]["questions"])
+        self._write(header)
+
+    def reopen(self, questions):
+        """Carry on appending to a loaded checkpoint whose session has shown *questions* questions."""
+        self.file = open(self.path, "a", encoding="utf-8")
+        self.questions = questions
+
+    def add(self, attempt, log, record):
+        """Append a graded *attempt*, the practice *log* text and any question added to *record* since."""
+        entry = {"attempt": attempt, "log": log}
+        if len(record["questions"]) > self.questions:
+            entry["question"] = [record["questions"][-1], record["skips"][-1]]
+            self.questions = len(record["questions"])
+        self._write(entry)
+
+    def _write(self, entry):
+        self.file.write(json.dumps(entry) + "\n")
+        self.file.flush()
+
+    def finish(self):
+        """Close and remove the checkpoint, once its session is saved or given up."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    @staticmethod
+    def load(path):
+        """
+        Return ``(header, entries)`` of the checkpoint at *path*, or ``None``.
+
+        The header's record gets back the questions added line by line. A
+        last line cut short by a crash is left out.
+        """
+        if not os.path.exists(path):
+            return None
+        lines = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    lines.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+        if not lines or "record" not in lines[0]:
+            return None
+        header, entries = lines[0], lines[1:]
+        record = header["record"]
+        for entry in entries:
+            if "question" in entry:
+                text, skips = entry["question"]
+                record["questions"].append(text)
+                record["skips"].append(skips)
+        return header, entries
+
+
+def resume_session(header, entries):
+    """
+    Rebuild an unfinished session from its checkpoint, ready for the next attempt.
+
+    The recorded answers are replayed from the seed by ``replay_session``,
+    which restores the question plan, the current question, the random
+    streams, the ability ratings, scores and review outcomes exactly. Stats
+    and response times are then taken from the recorded attempts, and the
+    session clock carries on from the last submit. Raises ``ValueError``
+    when the replay no longer matches the checkpoint, for example after
+    the question generator changed.
+    """
+    record = header["record"]
+    attempts = [entry["attempt"] for entry in entries]
+    session, rows = replay_session(record, attempts)
+    if len(rows) != len(attempts) or not all(row["match"] for row in rows):
+        raise ValueError("the unfinished quiz no longer replays the same")
+    if not session.finished and session.question_asked < len(record["questions"]):
+        # the question on screen when the quiz stopped
+        session.next_question()
+        if session.question_paper.question != record["questions"][-1]:
+            raise ValueError("the unfinished quiz no longer replays the same")
+    for stats in session.stats.values():
+        stats["total_time"] = 0.0
+    for a in attempts:
+        session.stats[a["operation"]]["total_time"] += (a["submit_ms"] - a["displayed_ms"]) / 1000
+    timer = session.response_timer
+    timer.attempts = list(attempts)
+    timer.origin = time.perf_counter() - (attempts[-1]["submit_ms"] / 1000 if attempts else 0.0)
+    timer.shown = timer.first_key = timer.last_edit = None
+    session.start_time = datetime.fromisoformat(header["start_time"])
+    return session
+
+
+class StallWatchdog:
+    """
+    Detect freezes of the Tk main loop.
+
+    The main loop stamps a heartbeat through ``root.after`` every
+    *interval* seconds. A daemon thread checks the stamp. When it is older
+    than *threshold*, the thread samples the main thread's stack until the
+    loop recovers, then logs the stall's duration and the stacks it saw to
+    a rotating diagnostics log.
+    """
+
+    def __init__(self, root, threshold=0.5, interval=0.1, log_path=None):
+        self.root = root
+        self.threshold = threshold
+        self.interval = interval
+        self.log_path = log_path or os.path.join(OUTPUT_DIR, "diagnostics", "stalls.log")
+        self.main_ident = threading.main_thread().ident
+        self.last_beat = time.perf_counter()
+        self.running = False
+        self.thread = None
+        self.logger = logging.getLogger("mathquest.stalls")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+
+    def start(self):
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        if not self.logger.handlers:
+            handler = logging.handlers.RotatingFileHandler(
+                self.log_path, maxBytes=1_000_000, backupCount=5, encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self.logger.addHandler(handler)
+        self.running = True
+        self.last_beat = time.perf_counter()
+        self.root.after(int(self.interval * 1000), self._beat)
+        self.thread = threading.Thread(target=self._watch, name="stall-watchdog", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+
+    def _beat(self):
+        self.last_beat = time.perf_counter()
+        if self.running:
+            self.root.after(int(self.interval * 1000), self._beat)
+
+    def _main_stack(self):
+        frame = sys._current_frames().get(self.main_ident)
+        return "".join(traceback.format_stack(frame)) if frame is not None else "<main thread not found>\n"
+
+    def _watch(self):
+        while self.running:
+            time.sleep(self.interval)
+            beat = self.last_beat
+            if time.perf_counter() - beat <= self.threshold:
+                continue
+            # stalled: sample the main thread until the heartbeat moves again
+            stacks = Counter()
+            while self.running and self.last_beat == beat:
+                stacks[self._main_stack()] += 1
+                time.sleep(self.interval)
+            self.report(self.last_beat - beat - self.interval, stacks)
+
+    def report(self, seconds, stacks):
+        samples = sum(stacks.values())
+        lines = [f"Main loop stalled for {seconds * 1000:.0f} ms ({samples} stack samples)"]
+        for stack, count in stacks.most_common(3):
+            lines.append(f"--- {count}/{samples} samples in:")
+            lines.append(stack.rstrip())
+        self.logger.warning("\n".join(lines))
+
+
+# (subsystem, substrings of the code's file or function name), first match wins
+PROFILE_SUBSYSTEMS = [
+    ("speech", ["pyttsx3", "comtypes", "espeak", "sapi", "nsss"]),
+    ("workbook", ["openpyxl", "pandas", "xlsx", "zipfile", "et_xmlfile", "xml"]),
+    ("pdf", ["fpdf"]),
+    ("charts", ["matplotlib", "backend_tkagg", "PIL"]),
+    ("learner store", ["sqlite3"]),
+    ("ui", ["tkinter", "Tkapp"]),
+    ("profiling", ["cProfile", "tracemalloc", "pstats"]),
+    ("quiz logic", [os.path.basename(__file__)]),
+]
+
+
+def profile_subsystem(filename, name=""):
+    text = f"{filename} {name}"
+    for subsystem, keys in PROFILE_SUBSYSTEMS:
+        if any(k in text for k in keys):
+            return subsystem
+    return "other"
+
+
+class SessionProfiler:
+    """
+    cProfile and tracemalloc around one quiz session.
+
+    ``stop`` writes ``Profile_<stamp>.prof`` for pstats or snakeviz and a
+    ``Profile_<stamp>.txt`` report to the output folder. The report has time
+    and allocations per subsystem, the slowest functions and the largest
+    allocation sites. A session that is still running when the app exits
+    is written out then.
+    """
+
+    def __init__(self, output_dir=None, frames=25):
+        self.output_dir = output_dir or OUTPUT_DIR
+        self.frames = frames
+        self.profiler = None
+        self.stamp = None
+
+    def start(self):
+        self.stamp = datetime.now().strftime("%d-%b-%y-%I%M%S")
+        tracemalloc.start(self.frames)
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+        atexit.register(self.stop)
+        return self
+
+    def stop(self):
+        """Stop profiling and write the reports; returns their paths."""
+        if self.profiler is None:
+            return None
+        self.profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        atexit.unregister(self.stop)
+        profiler, self.profiler = self.profiler, None
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        prof_path = os.path.join(self.output_dir, f"Profile_{self.stamp}.prof")
+        report_path = os.path.join(self.output_dir, f"Profile_{self.stamp}.txt")
+        profiler.dump_stats(prof_path)
+        with open(report_path, "w", encoding="utf-8") as fh:
+            fh.write(self.report(profiler, snapshot))
+        return prof_path, report_path
+
+    @staticmethod
+    def report(profiler, snapshot, top=25):
+        stats = pstats.Stats(profiler)
+        time_by = Counter()
+        calls_by = Counter()
+        for (filename, _, name), (_, calls, self_time, _, callers) in stats.stats.items():
+            subsystem = profile_subsystem(filename, name)
+            if subsystem == "other" and filename == "~" and callers:
+                # builtins have no file, so charge them to their busiest caller
+                caller = max(callers, key=lambda c: callers[c][3])
+                subsystem = profile_subsystem(caller[0], caller[2])
+            time_by[subsystem] += self_time
+            calls_by[subsystem] += calls
+        mem_by = Counter()
+        blocks_by = Counter()
+        for stat in snapshot.statistics("filename"):
+            subsystem = profile_subsystem(stat.traceback[0].filename)
+            mem_by[subsystem] += stat.size
+            blocks_by[subsystem] += stat.count
+
+        out = io.StringIO()
+        out.write(f"Total profiled time: {stats.total_tt:.3f} s\n\n")
+        out.write(f"{'subsystem':<16}{'own time s':>12}{'share':>8}{'calls':>12}{'live KiB':>12}{'blocks':>10}\n")
+        for subsystem, _ in PROFILE_SUBSYSTEMS + [("other", [])]:
+            share = time_by[subsystem] / stats.total_tt * 100 if stats.total_tt else 0
+            out.write(f"{subsystem:<16}{time_by[subsystem]:>12.3f}{share:>7.1f}%{calls_by[subsystem]:>12}"
+                      f"{mem_by[subsystem] / 1024:>12.1f}{blocks_by[subsystem]:>10}\n")
+
+        out.write(f"\nTop {top} functions by cumulative time\n")
+        stats.stream = out
+        stats.sort_stats("cumulative").print_stats(top)
+        out.write(f"Top {top} functions by own time\n")
+        stats.sort_stats("tottime").print_stats(top)
+
+        out.write(f"Top {top} allocation sites still alive at the end of the session\n")
+        for stat in snapshot.statistics("lineno")[:top]:
+            frame = stat.traceback[0]
+            out.write(f"{stat.size / 1024:>10.1f} KiB {stat.count:>8} blocks  {frame.filename}:{frame.lineno}\n")
+        return out.getvalue()
+
+
 def main():
     global root_instance
+    # --profile wraps every quiz in cProfile/tracemalloc and writes reports to the output folder
+    GUI_Exam.profile_sessions = "--profile" in sys.argv[1:]
+    # --seed N starts every quiz from the same seed, e.g. to reproduce a stored session's questions
+    if "--seed" in sys.argv[1:]:
+        GUI_Exam.session_seed = int(sys.argv[sys.argv.index("--seed") + 1])
     root_instance = GUI_Exam.launch_main()
+    # MATHQUEST_WATCHDOG=<seconds> logs main-loop stalls longer than that
+    watchdog_threshold = os.environ.get("MATHQUEST_WATCHDOG")
+    if watchdog_threshold:
+        StallWatchdog(GUI_Exam.root, float(watchdog_threshold)).start()
     GUI_Exam.root.mainloop()
 
 def get_grade(m, t):
@@ -2281,6 +4811,101 @@ def evaluate(answer_user, answer_actual, answer_user_remainder=None, answer_actu
         else:
             return False
 
+def grade_answer(paper, text, remainder_text="", choice=-1):
+    """
+    Parse the learner's input into *paper* and return whether it is correct.
+
+    These are the grading rules of the exam screen. Input that cannot be
+    parsed raises ``ValueError`` carrying the message shown to the learner.
+    """
+    kind = topic(paper._S)
+    kind.parse(paper, text, remainder_text, choice)
+    return kind.check(paper)
+
+
+def _pack(value):
+    if isinstance(value, tuple):
+        return {"tuple": [_pack(v) for v in value]}
+    if isinstance(value, list):
+        return [_pack(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _pack(v) for k, v in value.items()}
+    return value
+
+
+def _unpack(value):
+    if isinstance(value, dict):
+        if list(value) == ["tuple"]:
+            return tuple(_unpack(v) for v in value["tuple"])
+        return {k: _unpack(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_unpack(v) for v in value]
+    return value
+
+
+def question_key(paper):
+    """What makes two questions the same for ``RecentQuestions``, as told by the paper's topic."""
+    return topic(paper._S).key(paper)
+
+
+def encode_paper(paper):
+    """Describe *paper* as JSON-ready data that ``decode_paper`` turns back into the same question."""
+    spec = {"S": paper._S, "question": paper.question, "X": paper._X, "Y": paper._Y, "Z": paper._Z,
+            "choices": paper.choices, "answer_actual": paper.answer_actual}
+    for attr in ("mode", "numbers", "method"):
+        if hasattr(paper, attr):
+            spec[attr] = getattr(paper, attr)
+    return _pack(spec)
+
+
+def decode_paper(spec):
+    spec = _unpack(spec)
+    paper = Exam(spec["question"], spec["X"], spec["Y"], spec["Z"], spec["S"], spec["choices"])
+    paper.answer_actual = spec["answer_actual"]
+    for attr in ("mode", "numbers", "method"):
+        if attr in spec:
+            setattr(paper, attr, spec[attr])
+    return paper
+
+
+def format_answer(paper):
+    """Return the correct answer of *paper* as display text."""
+    return topic(paper._S).show(paper)
+
+
+QUESTION_NUMBER = re.compile(r"Q\.\d+\s+")
+WORDED_QUESTION = re.compile(r"What will be the result of (.*)\?")
+
+
+def read_question(text):
+    """
+    Return the paper for a question as printed on a worksheet, or ``None`` if no topic reads it.
+
+    *text* may carry the number and wording ``format_question`` adds. Each
+    topic's ``read`` is tried in turn. Questions with choices are not
+    printed with them, so they cannot be read back.
+    """
+    text = text.strip()
+    number = QUESTION_NUMBER.match(text)
+    if number:
+        text = text[number.end():]
+    worded = WORDED_QUESTION.fullmatch(text)
+    if worded:
+        text = worded.group(1)
+    for op in OPERATIONS.values():
+        paper = op.topic.read(text)
+        if paper is not None:
+            return paper
+    return None
+
+
+def format_question(paper, number):
+    """Return the question text as shown to the learner."""
+    if OPERATIONS[paper._S].worded:
+        return f"Q.{number} What will be the result of {paper.question}?"
+    return f"Q.{number} {paper.question}"
+
+
 def factors_of(n: int):
     return [i for i in range(1, n + 1) if n % i == 0]
 
@@ -2352,9 +4977,14 @@ def lcm_explanation(nums, method):
         return f"{' ; '.join(steps)}. Multiply {', '.join(factors)} to get {lcm_val}."
 
 
+FACTOR_SEPARATORS = re.compile(r"[×*\s]+")
+FRACTION_INPUT = re.compile(r"^(\d+)\s*/\s*(\d+)$")
+MIXED_NUMBER_INPUT = re.compile(r"^(\d+)\s+(\d+)\s*/\s*(\d+)$")
+
+
 def parse_factor_input(text: str):
     """Parse user entered prime factors separated by ×, *, or spaces."""
-    parts = [p for p in re.split(r"[×*\s]+", text.strip()) if p]
+    parts = [p for p in FACTOR_SEPARATORS.split(text.strip()) if p]
     if not parts:
         return None
     if not all(part.isdigit() for part in parts):
@@ -2367,7 +4997,7 @@ def parse_fraction_input(text: str):
     text = text.strip()
     if text.isdigit():
         return int(text), 1
-    m = re.match(r"^(\d+)\s*/\s*(\d+)$", text)
+    m = FRACTION_INPUT.match(text)
     if not m:
         return None
     num, den = int(m.group(1)), int(m.group(2))
@@ -2376,23 +5006,28 @@ def parse_fraction_input(text: str):
     return num, den
 
 def parse_fraction_mixed_input(text: str):
-    """Parse simple fractions or mixed numbers like '1 1/2'."""
+    """Parse simple fractions or mixed numbers like '1 1/2', with a leading '-' for negative answers."""
     text = text.strip()
-    m = re.match(r"^(\d+)\s+(\d+)\s*/\s*(\d+)$", text)
+    sign = -1 if text.startswith("-") else 1
+    if sign < 0:
+        text = text[1:].lstrip()
+    m = MIXED_NUMBER_INPUT.match(text)
     if m:
         whole = int(m.group(1))
         num = int(m.group(2))
         den = int(m.group(3))
         if den == 0:
             return None
-        return whole * den + num, den
-    return parse_fraction_input(text)
+        return sign * (whole * den + num), den
+    parsed = parse_fraction_input(text)
+    return None if parsed is None else (sign * parsed[0], parsed[1])
 
 
-def tell_grade(grade):
+def tell_grade(grade, rng=None):
     """Provide a random congratulatory message based on the grade."""
+    rng = random if rng is None else rng
     if grade == "Grade: A":
-        return random.choice([
+        return rng.choice([
     "Fantastic! You've reached Grade A! You're a math wizard in the making!",
     "Incredible job! Grade A is the highest honor, and you've earned it with your exceptional skills.",
     "Wow! You're a mathematical genius! Grade A is a testament to your brilliance.",
@@ -2400,7 +5035,7 @@ def tell_grade(grade):
     "Brilliant work! Grade A means you've mastered the math quest. Keep up the fantastic effort!"
 ])
     elif grade == "Grade: B":
-        return random.choice([
+        return rng.choice([
     "Bravo! Grade B is outstanding! Keep up the great work, you're mastering these math challenges!",
     "Impressive! Grade B showcases your dedication to excellence in math.",
     "Well done! Grade B is a mark of your commitment and hard work in the math adventure.",
@@ -2408,7 +5043,7 @@ def tell_grade(grade):
     "Excellent effort! Grade B reflects your strong performance in the math quest. Keep shining!"
 ])
     elif grade == "Grade: C":
-        return random.choice([
+        return rng.choice([
     "Congratulations on achieving Grade C! You're doing well, and with a bit more practice, you'll shine even brighter!",
     "Good work! Grade C signifies your steady progress in mastering math skills.",
     "Well deserved! Grade C shows your commitment to learning and improvement.",
@@ -2416,7 +5051,7 @@ def tell_grade(grade):
     "Keep it up! Grade C is a commendable achievement, and you're on the right track!"
 ])
     elif grade == "Grade: D":
-        return random.choice([
+        return rng.choice([
     "Great effort! Grade D shows progress, and you're on the right track. Keep practicing, and you'll see amazing results!",
     "Well done on achieving Grade D! Your dedication is paying off, and you're improving in math.",
     "Persistence pays off! Grade D acknowledges your hard work and commitment to overcoming math obstacles.",
@@ -2424,7 +5059,7 @@ def tell_grade(grade):
     "Good job! Grade D recognizes your efforts, and you're making progress in the world of math."
 ])
     elif grade == "Grade: F":
-        return random.choice([
+        return rng.choice([
     "No worries! Even superheroes face challenges. Grade F is just a stepping stone. With persistence, you'll conquer every math quest!",
     "Keep going! Grade F is a chance to learn and grow. You'll overcome math challenges with determination.",
     "Every setback is a setup for a comeback! Grade F is a starting point, and you'll rise to new math heights.",
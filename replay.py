@@ -0,0 +1,77 @@
+"""
+Session replay for MathQuest Adventures.
+
+Every quiz records its random seed and the learner's starting state in
+``learners.db``. This script regenerates a stored session's questions from
+that seed and grades the recorded answers again through the app's grader,
+so a reported bad question or hang can be reproduced exactly:
+
+    python replay.py --output-dir <folder> --learner Asha --list
+    python replay.py --output-dir <folder> --learner Asha --session "2026-10-18 09:15:02.123456"
+    python replay.py --output-dir <folder> --learner Asha --worksheet
+
+Each attempt is compared with the original: the question text and the
+grade must both match. The exit status is 1 if anything differs.
+``--worksheet`` prints the session's questions with an answer key instead.
+"""
+import argparse
+import sys
+
+from classroom_server import load_project
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a stored quiz session from its seed.")
+    parser.add_argument("--output-dir", help="app output folder (the app's usual folder by default)")
+    parser.add_argument("--learner", help="learner name (the most recently used learner by default)")
+    parser.add_argument("--session", help="session start as stored, e.g. '2026-10-18 09:15:02.123456' (latest by default)")
+    parser.add_argument("--list", action="store_true", help="list the learner's stored sessions and seeds")
+    parser.add_argument("--worksheet", action="store_true", help="print the questions and answer key only")
+    args = parser.parse_args(argv)
+
+    project = load_project(args.output_dir)
+    store = project.learner_store
+    learner_id = store.find_learner(args.learner) if args.learner else store.list_learners()[0][0]
+    if not learner_id:
+        parser.error(f"no learner named {args.learner!r}")
+
+    if args.list:
+        with store.lock:
+            rows = store.conn.execute(
+                "SELECT session_start, seed FROM sessions WHERE learner_id = ? ORDER BY session_start",
+                (learner_id,),
+            ).fetchall()
+        for session_start, seed in rows:
+            print(f"{session_start}  seed {seed}")
+        return 0
+
+    record = store.load_session(learner_id, args.session)
+    if record is None:
+        parser.error("no stored session; sessions are recorded from this version of the app on")
+    attempts = store.load_attempts(learner_id, record["session_start"])
+    session, rows = project.replay_session(record, attempts)
+
+    print(f"Session {record['session_start']}, seed {record['seed']}, "
+          f"{record['total']} questions of {', '.join(record['operations'])}")
+    if args.worksheet:
+        for row in rows:
+            if row["attempt"] == 1:
+                print(f"Q{row['question']}: {row['text']}    [{row['key']}]")
+        return 0
+
+    mismatches = 0
+    for row in rows:
+        flag = "ok" if row["match"] else "DIFFERS"
+        mismatches += not row["match"]
+        grade = "-" if row["correct"] is None else ("right" if row["correct"] else "wrong")
+        print(f"Q{row['question']}.{row['attempt']} {flag:<8}{row['text']:<50} answer {row['answer']!s:<12}"
+              f"{grade} (recorded {'right' if row['recorded'] else 'wrong'})")
+        if row["original"] != row["text"]:
+            print(f"    originally: {row['original']}")
+    replayed = len(rows) if rows and rows[-1]["correct"] is not None else len(rows) - 1
+    print(f"{replayed} of {len(attempts)} attempts replayed, {mismatches} differ")
+    return 1 if mismatches or replayed < len(attempts) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,394 @@
+"""
+Synthetic session history for MathQuest Adventures.
+
+Simulates a learner over many sessions and writes the result in the exact
+``AllSessions.xlsx`` layout (Log, Index, Difficulty and one Summary_NNN
+sheet per session) and into the learner store. Used to profile the
+dashboard, ``load_difficulty_history`` and the workbook writers at scale.
+
+    python synthetic_history.py --sessions 100000 --output-dir <folder> --learner "Load Test"
+
+The workbook is streamed straight into the xlsx zip file one sheet part at
+a time. Long sheets are staged in temporary files, so memory use does not
+grow with the number of sessions.
+"""
+import argparse
+import math
+import numbers
+import os
+import random
+import shutil
+import tempfile
+import time
+import zipfile
+from datetime import datetime, timedelta
+from xml.sax.saxutils import escape
+
+from classroom_server import load_project
+
+LOG_HEADERS = ["Date", "Time", "Question Type", "Total Questions", "Correct Answers",
+               "Total Attempts", "Accuracy (%)", "Start Time", "End Time", "Duration"]
+INDEX_HEADERS = ["Session Number", "Date", "Start Time", "End Time", "Duration",
+                 "Total Questions", "Accuracy (%)", "Summary Sheet"]
+SUMMARY_HEADERS = ["Question Type", "Total Questions", "Correct Answers", "Total Attempts", "Accuracy (%)"]
+
+# relative popularity of each topic when a learner picks what to practise
+OP_WEIGHTS = {"+": 5, "-": 5, "*": 4, "/": 3, "fraction": 2, "factors_primes": 1,
+              "prime_factorization": 1, "hcf": 1, "lcm": 1, "expression": 1}
+# typical seconds per question at difficulty 2 for each topic
+OP_SECONDS = {"+": 8, "-": 9, "*": 10, "/": 15, "fraction": 20, "factors_primes": 14,
+              "prime_factorization": 22, "hcf": 25, "lcm": 25, "expression": 30}
+
+
+def simulate_sessions(project, sessions, seed=0, start=None, attempts=None):
+    """
+    Yield ``(start, end, stats, scores)`` for *sessions* simulated sessions.
+
+    Each operation has a hidden ability that grows with practice towards
+    a personal ceiling. The chance of a correct attempt follows a logistic
+    curve of ability minus the question's difficulty. Questions are pitched,
+    and the scores moved by first tries only, by the app's own ability
+    estimator, so difficulty drifts the way it does for real learners. Each topic is also a little
+    harder or easier than its nominal difficulty says, which is what
+    ``calibrate.py`` should recover.
+
+    If *attempts* is a list, each session's attempts are appended to it in
+    the learner store's attempt format; the caller empties it as it goes.
+    """
+    rng = random.Random(seed)
+    ops = list(project.DEFAULT_DIFFICULTY)
+    weights = [OP_WEIGHTS.get(op, 1) for op in ops]
+    ability = {op: rng.gauss(2.3, 0.4) for op in ops}
+    ceiling = {op: ability[op] + abs(rng.gauss(1.5, 0.5)) for op in ops}
+    scores = project.DEFAULT_DIFFICULTY.copy()
+    estimator = project.AbilityEstimator({}, scores)
+    hardness = {op: rng.gauss(0, 0.3) for op in ops}
+    when = start or datetime(2023, 1, 2, 16, 0, 0)
+    for _ in range(sessions):
+        # next session one to three days later, mostly in the afternoon
+        day = when + timedelta(days=rng.choice([1, 1, 1, 2, 3]))
+        when = day.replace(hour=min(20, max(8, int(rng.gauss(16, 2)))),
+                           minute=rng.randrange(60), second=rng.randrange(60))
+        chosen = set()
+        for _ in range(rng.choice([1, 1, 2, 2, 3, 4])):
+            chosen.add(rng.choices(ops, weights)[0])
+        total_questions = rng.randint(5, 20)
+        stats = {}
+        seconds = 0.0
+        for i in range(total_questions):
+            op = sorted(chosen)[i % len(chosen)]
+            st = stats.setdefault(op, {"total_questions": 0, "correct_answers": 0, "total_attempts": 0,
+                                       "total_time": 0.0, "first_try_correct": 0})
+            st["total_questions"] += 1
+            nominal = project.calibration.nominal(op, estimator.difficulty(op))
+            difficulty = project.calibration.difficulty(op, nominal)
+            p = 1 / (1 + math.exp(-1.7 * (ability[op] - nominal - hardness[op])))
+            for attempt in range(3):
+                st["total_attempts"] += 1
+                took = rng.lognormvariate(math.log(OP_SECONDS[op] * 2 ** (nominal - 2)), 0.5)
+                st["total_time"] += took
+                correct = rng.random() < p
+                if attempts is not None:
+                    shown = seconds * 1000
+                    attempts.append({
+                        "question": i + 1, "attempt": attempt + 1, "operation": op, "level": "Medium",
+                        "correct": int(correct), "displayed_ms": round(shown, 3),
+                        "first_key_ms": round(shown + took * 600, 3), "last_edit_ms": round(shown + took * 950, 3),
+                        "submit_ms": round(shown + took * 1000, 3), "difficulty": round(nominal, 3),
+                        "rating": round(estimator.rating(op), 4), "answer": None,
+                    })
+                seconds += took
+                # the app only rates the first try at a question
+                if attempt == 0:
+                    estimator.update(op, difficulty, correct)
+                if correct:
+                    st["correct_answers"] += 1
+                    if attempt == 0:
+                        st["first_try_correct"] += 1
+                    break
+                p *= 0.8
+            ability[op] += 0.003 * (ceiling[op] - ability[op])
+        estimator.apply_to(scores, stats)
+        end = when + timedelta(seconds=seconds + rng.uniform(20, 120))
+        yield when, end, stats, dict(scores)
+        when = end
+
+
+def session_tables(project, stats, start, end):
+    """
+    Return the summary and metadata rows ``build_session_summary`` would make.
+
+    Built from plain lists because creating two DataFrames per session
+    would dominate the run time for large histories.
+    """
+    rows = []
+    for k, v in stats.items():
+        total = v["total_questions"]
+        accuracy = project.clamp_percent(round(v["correct_answers"] / total * 100 if total else 0, 2))
+        rows.append([project.op_names.get(k, k), total, v["correct_answers"], v["total_attempts"], accuracy])
+    asked = sum(r[1] for r in rows)
+    correct = sum(r[2] for r in rows)
+    meta = [
+        ["Start Time", start.strftime("%I:%M%p")],
+        ["End Time", end.strftime("%I:%M%p")],
+        ["Duration", f"{round((end - start).total_seconds()/60, 2)} minutes"],
+        ["Total Questions", asked],
+        ["Total Correct", correct],
+        ["Overall Accuracy (%)", project.clamp_percent(round(correct / asked * 100, 2) if asked else 0)],
+    ]
+    return rows, meta
+
+
+def col_letter(idx):
+    letters = ""
+    while idx:
+        idx, rem = divmod(idx - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+COLUMNS = [col_letter(i) for i in range(1, 27)]
+
+
+def row_xml(row_num, values):
+    cells = []
+    for col, val in zip(COLUMNS, values):
+        if val is None:
+            continue
+        if type(val) in (int, float) or isinstance(val, numbers.Number):
+            cells.append(f'<c r="{col}{row_num}"><v>{val}</v></c>')
+        else:
+            cells.append(f'<c r="{col}{row_num}" t="inlineStr"><is><t>{escape(str(val))}</t></is></c>')
+    return f'<row r="{row_num}">{"".join(cells)}</row>'
+
+
+SHEET_HEAD = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+              '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+              'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+              '<sheetData>')
+SHEET_TAIL = "</sheetData></worksheet>"
+
+
+class StagedSheet:
+    """A long sheet whose rows are staged in a temporary file until saving."""
+
+    def __init__(self, workdir, name, headers):
+        self.name = name
+        self.rows = 0
+        self.fh = open(os.path.join(workdir, f"{name}.xml"), "w", encoding="utf-8")
+        self.links = None
+        self.append(headers)
+
+    def append(self, values):
+        self.rows += 1
+        self.fh.write(row_xml(self.rows, values))
+
+    def add_link(self, ref, sheet):
+        if self.links is None:
+            self.links = open(self.fh.name + ".links", "w", encoding="utf-8")
+        self.links.write(f'<hyperlink ref="{ref}" location="{sheet}!A1" display="{sheet}"/>')
+
+    def copy_into(self, zf, part):
+        self.fh.close()
+        with zf.open(part, "w", force_zip64=True) as out:
+            out.write(SHEET_HEAD.encode())
+            with open(self.fh.name, "rb") as src:
+                shutil.copyfileobj(src, out, 1 << 20)
+            out.write(b"</sheetData>")
+            if self.links is not None:
+                self.links.close()
+                out.write(b"<hyperlinks>")
+                with open(self.links.name, "rb") as src:
+                    shutil.copyfileobj(src, out, 1 << 20)
+                out.write(b"</hyperlinks>")
+            out.write(b"</worksheet>")
+
+
+def write_workbook(project, path, history, summaries=True):
+    """
+    Stream *history* from ``simulate_sessions`` into an AllSessions workbook.
+
+    Returns the number of sessions written. With *summaries* off the
+    Summary_NNN sheets and Index links are left out, which keeps files
+    with very many sessions small.
+    """
+    ops = list(project.DEFAULT_DIFFICULTY)
+    workdir = tempfile.mkdtemp(prefix="mathquest_synth_")
+    tmp_path = path + ".tmp"
+    sheet_names = []
+    try:
+        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+            log = StagedSheet(workdir, "Log", LOG_HEADERS)
+            idx = StagedSheet(workdir, "Index", INDEX_HEADERS)
+            diff = StagedSheet(workdir, "Difficulty", ["Timestamp"] + [project.op_names.get(k, k) for k in ops])
+            count = 0
+            for count, (start, end, stats, scores) in enumerate(history, start=1):
+                summary_rows, meta_rows = session_tables(project, stats, start, end)
+                date_str = start.strftime("%Y-%m-%d")
+                time_str = start.strftime("%H:%M:%S")
+                start_full = start.strftime("%Y-%m-%d %H:%M:%S")
+                end_full = end.strftime("%Y-%m-%d %H:%M:%S")
+                duration = round((end - start).total_seconds() / 60, 2)
+                for r in summary_rows:
+                    log.append([date_str, time_str, r[0], r[1], r[2], r[3], r[4], start_full, end_full, duration])
+                meta = dict(meta_rows)
+                summary_name = f"Summary_{count:03d}"
+                idx.append([count, date_str, time_str, end.strftime("%H:%M:%S"), duration,
+                            meta["Total Questions"], meta["Overall Accuracy (%)"],
+                            summary_name if summaries else None])
+                if summaries:
+                    idx.add_link(f"H{idx.rows}", summary_name)
+                    rows = [SUMMARY_HEADERS] + summary_rows + [[], ["Metric", "Value"]] + meta_rows
+                    body = "".join(row_xml(i, r) for i, r in enumerate(rows, start=1))
+                    zf.writestr(f"xl/worksheets/sheet_s{count}.xml", SHEET_HEAD + body + SHEET_TAIL)
+                    sheet_names.append((summary_name, f"sheet_s{count}.xml"))
+                diff.append([end_full] + [round(scores[k], 2) for k in ops])
+
+            # the app creates Difficulty just after the first summary sheet
+            order = [("Log", "sheet_log.xml"), ("Index", "sheet_index.xml")]
+            order += sheet_names[:1] + [("Difficulty", "sheet_difficulty.xml")] + sheet_names[1:]
+            log.copy_into(zf, "xl/worksheets/sheet_log.xml")
+            idx.copy_into(zf, "xl/worksheets/sheet_index.xml")
+            diff.copy_into(zf, "xl/worksheets/sheet_difficulty.xml")
+            write_package_parts(zf, order)
+        os.replace(tmp_path, path)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return count
+
+
+def write_package_parts(zf, order):
+    """Write the workbook, relationship, style and content-type parts."""
+    sheets = "".join(
+        f'<sheet name="{name}" sheetId="{i}" r:id="rId{i}"/>' for i, (name, _) in enumerate(order, start=1)
+    )
+    zf.writestr("xl/workbook.xml", (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f"<sheets>{sheets}</sheets></workbook>"
+    ))
+    rels = "".join(
+        f'<Relationship Id="rId{i}" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+        f'relationships/worksheet" Target="worksheets/{part}"/>'
+        for i, (_, part) in enumerate(order, start=1)
+    )
+    rels += (f'<Relationship Id="rId{len(order) + 1}" Type="http://schemas.openxmlformats.org/'
+             'officeDocument/2006/relationships/styles" Target="styles.xml"/>')
+    zf.writestr("xl/_rels/workbook.xml.rels", (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        f"{rels}</Relationships>"
+    ))
+    zf.writestr("xl/styles.xml", (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        "</styleSheet>"
+    ))
+    zf.writestr("_rels/.rels", (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+        'relationships/officeDocument" Target="xl/workbook.xml"/></Relationships>'
+    ))
+    overrides = "".join(
+        f'<Override PartName="/xl/worksheets/{part}" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for _, part in order
+    )
+    zf.writestr("[Content_Types].xml", (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/styles.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        f"{overrides}</Types>"
+    ))
+
+
+def write_store(project, profile, history, attempts=None, batch=5000):
+    """
+    Write *history* into the learner store's difficulty tables.
+
+    *attempts* is the list given to ``simulate_sessions``; its rows go to
+    the attempts table as each session is written.
+    """
+    store = profile.store
+    ops = list(project.DEFAULT_DIFFICULTY)
+    attempt_sql = f"INSERT OR REPLACE INTO attempts VALUES ({', '.join('?' * (len(store.ATTEMPT_FIELDS) + 2))})"
+    rows, attempt_rows, count, scores = [], [], 0, None
+    with store.lock:
+        conn = store.conn
+        first = conn.execute(
+            "SELECT COALESCE(MAX(session), 0) FROM difficulty_history WHERE learner_id = ?",
+            (profile.learner_id,),
+        ).fetchone()[0]
+        for count, (start, end, _, scores) in enumerate(history, start=1):
+            stamp = end.strftime("%Y-%m-%d %H:%M:%S")
+            rows.extend((profile.learner_id, first + count, stamp, op, float(scores[op])) for op in ops)
+            if attempts:
+                session_start = start.strftime("%Y-%m-%d %H:%M:%S.%f")
+                attempt_rows.extend((profile.learner_id, session_start) + tuple(a[f] for f in store.ATTEMPT_FIELDS)
+                                    for a in attempts)
+                attempts.clear()
+            if len(rows) >= batch:
+                conn.executemany("INSERT INTO difficulty_history VALUES (?, ?, ?, ?, ?)", rows)
+                conn.executemany(attempt_sql, attempt_rows)
+                rows.clear()
+                attempt_rows.clear()
+        if rows:
+            conn.executemany("INSERT INTO difficulty_history VALUES (?, ?, ?, ?, ?)", rows)
+        if attempt_rows:
+            conn.executemany(attempt_sql, attempt_rows)
+        conn.commit()
+    if scores:
+        store.save_scores(profile.learner_id, scores, record_history=False)
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic MathQuest session history.")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--output-dir", required=True, help="app output folder to write into")
+    parser.add_argument("--learner", default="Synthetic Learner", help="learner profile to fill")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workbook", help="write the workbook here instead of the learner's folder")
+    parser.add_argument("--no-summaries", action="store_true", help="skip the Summary_NNN sheets")
+    parser.add_argument("--no-store", action="store_true", help="do not write the learner store")
+    args = parser.parse_args(argv)
+
+    project = load_project(args.output_dir)
+    store = project.learner_store
+    learner_id = store.find_learner(args.learner) or store.add_learner(args.learner)
+    profile = store.profile(learner_id)
+    path = args.workbook or profile.sessions_path
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    t0 = time.perf_counter()
+    count = write_workbook(project, path, simulate_sessions(project, args.sessions, args.seed),
+                           summaries=not args.no_summaries)
+    t1 = time.perf_counter()
+    print(f"Wrote {count} sessions to {path} in {t1 - t0:.1f} s")
+    if not args.no_store:
+        # simulate again with the same seed rather than holding the history in memory
+        attempts = []
+        write_store(project, profile, simulate_sessions(project, args.sessions, args.seed, attempts=attempts),
+                    attempts)
+        print(f"Stored difficulty history and attempts for learner '{profile.name}' "
+              f"in {time.perf_counter() - t1:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
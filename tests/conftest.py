@@ -0,0 +1,15 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classroom_server import load_project
+
+
+@pytest.fixture(scope="session")
+def project():
+    """The app module, writing to a throwaway output folder."""
+    return load_project(tempfile.mkdtemp(prefix="mathquest_tests_"))
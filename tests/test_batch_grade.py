@@ -0,0 +1,36 @@
+import random
+
+import pandas as pd
+
+import batch_grade
+
+
+def test_printed_questions_read_back_with_the_same_answer(project):
+    rng = random.Random(4)
+    for op in project.OPERATIONS:
+        for difficulty in (1.0, 2.0, 3.0, 4.0):
+            paper = project.Exam.quiz(op, "Medium", {op: difficulty}, rng)
+            if paper.choices:
+                continue
+            back = project.read_question(project.format_question(paper, 3))
+            # a one-step mixed question such as "12 + 5" reads as plain addition
+            assert back is not None and (back._S == op or op == "expression")
+            if op != "fraction":
+                assert project.format_answer(back) == project.format_answer(paper)
+
+
+def test_rows_are_graded_by_the_exam_rules(project):
+    frame = pd.DataFrame({
+        "question": ["Q.1 What will be the result of 12 + 7?", "17 / 5", "17 / 5", "12 - 4", "1/3 - 1/2",
+                     "List all factors of 6", "Which bar shows 1/4 + 1/4?", "12 * 3"],
+        "answer": ["19", "3", "3", "eight", "-1/6", "1 2 3 6", "2", " 36 "],
+        "remainder": ["", "2", "1", "", "", "", "", ""],
+        "learner": ["Asha"] * 4 + ["Ben"] * 4,
+    })
+    graded = batch_grade.Grader(project).grade(frame)
+    assert list(graded["result"]) == ["right", "right", "wrong", "invalid", "right", "right", "invalid", "right"]
+    assert graded["expected"][1] == "Quotient 3, Remainder 2"
+    assert graded["message"][3] == "Please type Numbers only!"
+    assert graded["message"][6] == "Unrecognised question"
+    stats = batch_grade.tally(graded)
+    assert stats.loc[("Asha", "/"), "questions"] == 2 and stats.loc[("Asha", "/"), "right"] == 1
@@ -0,0 +1,33 @@
+import numpy as np
+
+
+def test_addition_counts_carries(project):
+    load = project.carry_load("+", [45, 41, 999], [38, 32, 1])
+    # one carry in two columns, none, and a carry out of every column
+    assert np.allclose(load, [0.5, 0.0, 1.0])
+
+
+def test_three_term_sums(project):
+    assert np.allclose(project.carry_load("+", [111], [222], [333]), [0.0])
+    assert np.allclose(project.carry_load("+", [555], [555], [555]), [1.0])
+
+
+def test_subtraction_counts_borrows_and_zeros(project):
+    load = project.carry_load("-", [57, 52, 1000], [23, 38, 1])
+    # no borrow; one borrow; a borrow through three zeros is capped at 1
+    assert np.allclose(load, [0.0, 0.5, 1.0])
+
+
+def test_multiplication_and_division(project):
+    assert np.allclose(project.carry_load("*", [23, 99], [3, 9]), [0.0, 1.0])
+    assert np.allclose(project.carry_load("/", [84, 95], [2, 7]), [0.5, 0.5])
+
+
+def test_carry_matched_follows_the_fraction_of_the_difficulty(project):
+    import random
+    rng = random.Random(5)
+    plain = [project.Exam.carry_matched("+", 2.0, 10, 100, rng) for _ in range(20)]
+    busy = [project.Exam.carry_matched("+", 2.95, 10, 891, rng) for _ in range(20)]
+    plain_load = project.carry_load("+", [x for x, _, _ in plain], [y for _, y, _ in plain]).mean()
+    busy_load = project.carry_load("+", [x for x, _, _ in busy], [y for _, y, _ in busy]).mean()
+    assert plain_load < busy_load
@@ -0,0 +1,52 @@
+import loadtest
+
+
+def answered_session(project, path, attempts):
+    """A session given *attempts* answers, every third one wrong, checkpointed as the exam screen does."""
+    store = project.learner_store
+    profile = store.profile(store.add_learner(f"checkpoint_{attempts}"))
+    session = project.QuizSession(profile, ["+", "/", "fraction", "factors_primes"], 10, seed=11)
+    session.next_question()
+    checkpoint = project.SessionCheckpoint(path)
+    checkpoint.start({"record": session.record, "file_name": "Practice_dated_test",
+                      "start_time": session.start_time.isoformat()})
+    for i in range(attempts):
+        paper = session.question_paper
+        answer = loadtest.wrong_answer(paper) if i % 3 == 1 else loadtest.correct_answer(paper)
+        _, done = session.submit(*answer)
+        log = f"Q.{session.question_asked}\n\n" if done else None
+        if done and not session.finished:
+            session.next_question()
+        checkpoint.add(session.response_timer.attempts[-1], log, session.record)
+    return session, checkpoint
+
+
+def test_resume_carries_on_exactly_where_the_quiz_stopped(project, tmp_path):
+    path = str(tmp_path / "session_checkpoint.jsonl")
+    session, _ = answered_session(project, path, 9)
+    header, entries = project.SessionCheckpoint.load(path)
+    assert len(entries) == 9 and "".join(entry["log"] or "" for entry in entries).count("Q.") == 6
+
+    resumed = project.resume_session(header, entries)
+    assert resumed.question_paper.question == session.question_paper.question
+    assert (resumed.question_index, resumed.question_asked, resumed.exam_score, resumed.attempts_counter) == \
+        (session.question_index, session.question_asked, session.exam_score, session.attempts_counter)
+    assert resumed.session_random.questions.getstate() == session.session_random.questions.getstate()
+    assert resumed.ability.state == session.ability.state
+    assert resumed.review_outcomes == session.review_outcomes
+    assert resumed.response_timer.attempts == session.response_timer.attempts
+    for op, stats in session.stats.items():
+        # recorded in milliseconds to three places
+        assert abs(resumed.stats[op].pop("total_time") - stats.pop("total_time")) < 1e-5
+        assert resumed.stats[op] == stats
+
+
+def test_a_torn_last_line_is_left_out(project, tmp_path):
+    path = str(tmp_path / "session_checkpoint.jsonl")
+    _, checkpoint = answered_session(project, path, 2)
+    checkpoint.file.write('{"attempt": {"quest')
+    checkpoint.file.flush()
+    header, entries = project.SessionCheckpoint.load(path)
+    assert len(entries) == 2
+    checkpoint.finish()
+    assert project.SessionCheckpoint.load(path) is None
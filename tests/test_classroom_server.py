@@ -0,0 +1,149 @@
+import asyncio
+import base64
+import json
+import os
+import struct
+
+from classroom_server import OP_TEXT, ClassroomServer, accept_key, read_frame
+
+
+class Client:
+    """A WebSocket client as a browser would speak it, with masked frames."""
+
+    @classmethod
+    async def connect(cls, port):
+        self = cls()
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", port)
+        key = base64.b64encode(os.urandom(16)).decode()
+        self.writer.write(
+            "GET /ws HTTP/1.1\r\nHost: 127.0.0.1\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode()
+        )
+        response = (await self.reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+        assert response.startswith("HTTP/1.1 101")
+        assert f"Sec-WebSocket-Accept: {accept_key(key)}" in response
+        return self
+
+    async def send(self, payload):
+        if not isinstance(payload, bytes):
+            payload = json.dumps(payload).encode()
+        mask = os.urandom(4)
+        assert len(payload) < 126
+        self.writer.write(struct.pack("!BB", 0x80 | OP_TEXT, 0x80 | len(payload)) + mask
+                          + bytes(b ^ mask[i % 4] for i, b in enumerate(payload)))
+        await self.writer.drain()
+
+    async def receive(self):
+        opcode, payload = await read_frame(self.reader)
+        assert opcode == OP_TEXT
+        return json.loads(payload)
+
+    def close(self):
+        self.writer.close()
+
+
+async def take_quiz(port, name, questions):
+    """Join as *name* and answer until the result comes back; return the messages seen."""
+    client = await Client.connect(port)
+    await client.send({"type": "join", "learner": name, "operations": ["+", "-", "/"], "questions": questions})
+    question = await client.receive()
+    seen = [question]
+    while True:
+        assert question["type"] == "question"
+        answer = {"type": "answer", "answer": "1"}
+        if question["layout"] == "quotient_remainder":
+            answer["remainder"] = "0"
+        await client.send(answer)
+        feedback = await client.receive()
+        seen.append(feedback)
+        assert feedback["type"] == "feedback"
+        if not feedback["done"]:
+            continue
+        question = await client.receive()
+        seen.append(question)
+        if question["type"] == "result":
+            break
+    client.close()
+    return seen
+
+
+async def with_server(project, test):
+    server = ClassroomServer(project, "127.0.0.1", 0)
+    task = asyncio.create_task(server.run())
+    while server.server is None:
+        await asyncio.sleep(0.01)
+    try:
+        return await test(server)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+def test_simulated_classroom_sessions_are_committed(project):
+    names = [f"classroom_{i}" for i in range(6)]
+
+    async def classroom(server):
+        runs = await asyncio.gather(*(take_quiz(server.port, name, 4) for name in names))
+        while server.committed < len(names):
+            await asyncio.sleep(0.01)
+        return runs
+
+    runs = asyncio.run(with_server(project, classroom))
+    store = project.learner_store
+    for name, seen in zip(names, runs):
+        result = seen[-1]
+        assert result["total"] == 4 and 0 <= result["score"] <= 4
+        assert [m["number"] for m in seen if m["type"] == "question"] == [1, 2, 3, 4]
+        learner_id = store.find_learner(name)
+        record = store.load_session(learner_id)
+        assert record is not None and record["total"] == 4
+        attempts = store.load_attempts(learner_id, record["session_start"])
+        assert len(attempts) == sum(m["type"] == "feedback" for m in seen)
+
+
+def test_bad_messages_get_error_replies(project):
+    async def errors(server):
+        client = await Client.connect(server.port)
+        replies = []
+        for message in (
+            {"type": "answer", "answer": "1"},
+            {"type": "join", "learner": " ", "operations": ["+"]},
+            {"type": "join", "learner": "classroom_errors", "operations": ["sqrt"]},
+            {"type": "join", "learner": "classroom_errors", "operations": ["+"], "questions": 0},
+            {"type": "join", "learner": "classroom_errors", "operations": ["+"], "questions": "abc"},
+            {"type": "join", "learner": "classroom_errors", "operations": ["+"],
+             "questions": project.MAX_QUESTIONS + 1},
+            {"type": "join", "learner": "classroom_errors", "operations": ["+"], "questions": 1000000000},
+            b"not json",
+            {"type": "join", "learner": "classroom_errors", "operations": ["+"], "questions": 1},
+            {"type": "answer", "choice": "first"},
+            {"type": "wave"},
+        ):
+            await client.send(message)
+            replies.append(await client.receive())
+        while replies[-1]["type"] != "result":
+            await client.send({"type": "answer", "answer": "1"})
+            replies.append(await client.receive())
+            if replies[-1]["done"]:
+                replies.append(await client.receive())
+        await client.send({"type": "answer", "answer": "1"})
+        replies.append(await client.receive())
+        client.close()
+        return replies
+
+    replies = asyncio.run(with_server(project, errors))
+    assert [reply.get("message") for reply in replies[:8]] == [
+        "Join a quiz first",
+        "Please type your name",
+        "Please Select atleast One option!",
+        "Please ensure correct selections & entry!",
+        "Please ensure correct selections & entry!",
+        "Please ensure correct selections & entry!",
+        "Please ensure correct selections & entry!",
+        "Invalid message",
+    ]
+    assert replies[8]["type"] == "question"
+    assert replies[9]["message"] == "Please select an option!"
+    assert replies[10]["message"] == "Unknown message type: wave"
+    assert replies[-2]["type"] == "result"
+    assert replies[-1]["message"] == "This quiz is already finished"
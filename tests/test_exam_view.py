@@ -0,0 +1,44 @@
+import types
+
+
+class Widget:
+    """Stands in for a Tk widget, counting grid calls."""
+    def __init__(self, name, log):
+        self.name, self.log = name, log
+
+    def grid(self, **options):
+        self.log.append(("grid", self.name))
+
+    def grid_forget(self):
+        self.log.append(("forget", self.name))
+
+
+def test_layouts_only_regrid_the_widgets_that_change(project):
+    log = []
+    label, entry, left_label, left, yes_no, options = (
+        Widget(name, log) for name in ("label", "entry", "left_label", "left", "yes_no", "options"))
+    answer = {label: {}, entry: {}}
+    view = types.SimpleNamespace(layout=None, layout_widgets={
+        "answer": answer,
+        "factors": answer,
+        "quotient": {**answer, left_label: {}, left: {}},
+        "yes/no": {label: {}, yes_no: {}},
+        "choices": {options: {}},
+    })
+    show = lambda layout: project.GUI_Exam.show_layout(view, layout)
+
+    show("answer")
+    assert sorted(log) == [("grid", "entry"), ("grid", "label")]
+    log.clear()
+    show("answer")
+    show("factors")
+    assert log == []
+    show("quotient")
+    assert sorted(log) == [("grid", "left"), ("grid", "left_label")]
+    log.clear()
+    show("yes/no")
+    assert sorted(log) == [("forget", "entry"), ("forget", "left"), ("forget", "left_label"), ("grid", "yes_no")]
+    log.clear()
+    show("choices")
+    assert sorted(log) == [("forget", "label"), ("forget", "yes_no"), ("grid", "options")]
+    assert view.layout == "choices"
@@ -0,0 +1,32 @@
+import random
+from fractions import Fraction
+
+
+def test_text_keeps_needed_brackets(project):
+    tree = ("-", 20, ("+", 3, 4))
+    assert project.expression_text(tree) == "20 - (3 + 4)"
+    assert project.expression_text(("+", ("*", 2, 3), 4)) == "2 × 3 + 4"
+    assert project.evaluate_expression(("/", 3, 4)) == Fraction(3, 4)
+
+
+def test_canonical_form_ignores_operand_order(project):
+    a = ("+", 3, ("*", 4, 5))
+    b = ("+", ("*", 5, 4), 3)
+    assert project.canonical_expression(a) == project.canonical_expression(b)
+    assert project.canonical_expression(("-", 3, 4)) != project.canonical_expression(("-", 4, 3))
+
+
+def test_generated_questions_follow_the_rules(project):
+    rng = random.Random(7)
+    for difficulty in (2.0, 3.0, 4.0, 5.0):
+        _, (_, _, _, limit) = next((u, b) for u, b in project.Expressions.BANDS if u is None or difficulty < u)
+        for tree, value in project.Expressions.batch(difficulty, rng, 300):
+            assert project.evaluate_expression(tree) == value
+            assert 0 <= value <= limit
+
+
+def test_quiz_grades_mixed_operations(project):
+    paper = project.Exam.quiz("expression", "Hard", {"expression": 4.0}, random.Random(1))
+    assert paper.question == project.expression_text(paper._X)
+    assert project.grade_answer(paper, str(paper.answer_actual))
+    assert not project.grade_answer(paper, str(paper.answer_actual + 1))
@@ -0,0 +1,27 @@
+import random
+from collections import Counter
+
+
+def test_alias_draws_follow_the_weights(project):
+    weights = [1, 2, 3, 4]
+    table = project.alias_table(weights)
+    rng = random.Random(0)
+    n = 40000
+    counts = Counter(project.alias_draw(table, rng) for _ in range(n))
+    for i, w in enumerate(weights):
+        assert abs(counts[i] / n - w / sum(weights)) < 0.01
+
+
+def test_alias_never_draws_a_zero_weight(project):
+    table = project.alias_table([0, 5, 0, 1])
+    rng = random.Random(1)
+    assert {project.alias_draw(table, rng) for _ in range(2000)} == {1, 3}
+
+
+def test_missed_facts_weigh_more(project):
+    mastery = project.FactMastery()
+    paper = project.Exam("7 * 8", 7, 8, None, "*")
+    for _ in range(5):
+        mastery.record(paper, False)
+    weights = mastery.weights("*")
+    assert weights[7 - project.FACT_MIN, 8 - project.FACT_MIN] > weights[6 - project.FACT_MIN, 8 - project.FACT_MIN]
@@ -0,0 +1,26 @@
+import random
+from fractions import Fraction
+
+
+def test_no_choice_equals_the_answer_in_value(project):
+    for entries in project.FractionChoices.tables().values():
+        assert entries
+        for first, second, answer, wrong in entries:
+            assert Fraction(*first) + Fraction(*second) == Fraction(*answer)
+            values = [Fraction(*c) for c in [answer] + wrong]
+            assert len(wrong) == project.FractionChoices.CHOICES - 1
+            assert len(set(values)) == len(values)
+
+
+def test_farey_sequence(project):
+    assert project.farey(4) == [(0, 1), (1, 4), (1, 3), (1, 2), (2, 3), (3, 4), (1, 1)]
+
+
+def test_multiple_choice_is_graded_by_the_picked_option(project):
+    rng = random.Random(3)
+    paper = None
+    while paper is None or not paper.choices:
+        paper = project.Exam.quiz("fraction", "Medium", {"fraction": 2.0}, rng)
+    right = paper.choices.index(paper.answer_actual)
+    assert project.grade_answer(paper, "", "", right)
+    assert not project.grade_answer(paper, "", "", (right + 1) % len(paper.choices))
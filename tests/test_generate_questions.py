@@ -0,0 +1,21 @@
+import json
+
+import generate_questions
+
+
+def test_blocks_depend_only_on_the_seed(project):
+    generate_questions.start_worker(None)
+    job = (5, 0, 50, list(project.OPERATIONS), ["Easy", "Medium", "Hard"], None)
+    lines = generate_questions.block_lines(job)
+    assert lines == generate_questions.block_lines(job)
+    assert lines != generate_questions.block_lines((6,) + job[1:])
+    records = [json.loads(line) for line in lines.splitlines()]
+    assert [record["n"] for record in records] == list(range(1, 51))
+    for record in records:
+        assert record["op"] in project.OPERATIONS
+        assert record["text"].startswith(f"Q.{record['n']} ") and record["question"] in record["text"]
+
+
+def test_jobs_cover_the_count_in_blocks():
+    counts = [job[2] for job in generate_questions.jobs(2500, 1, ["+"], ["Easy"], None)]
+    assert counts == [generate_questions.BLOCK, generate_questions.BLOCK, 500]
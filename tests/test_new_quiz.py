@@ -0,0 +1,165 @@
+import gc
+import os
+import shutil
+import subprocess
+import types
+
+import pytest
+
+import loadtest
+
+SESSIONS = 100
+# sessions run before memory is measured, while caches and tables fill up
+WARM_UP = 20
+# the session workbook is read back whole for every save, so a little growth goes with its size
+RSS_GROWTH_MB = 16
+
+
+def rss_mb():
+    if not os.path.exists("/proc/self/statm"):
+        pytest.skip("resident memory is read from /proc")
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+
+@pytest.fixture
+def display():
+    """Use the desktop's display, or start Xvfb on a free one when there is none."""
+    if os.environ.get("DISPLAY"):
+        yield
+        return
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        pytest.skip("no display and Xvfb is not installed")
+    read_end, write_end = os.pipe()
+    server = subprocess.Popen([xvfb, "-displayfd", str(write_end), "-screen", "0", "1600x900x24", "-nolisten", "tcp"],
+                              pass_fds=(write_end,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.close(write_end)
+    with os.fdopen(read_end) as f:
+        number = f.readline().strip()
+    if not number:
+        server.kill()
+        pytest.skip("Xvfb did not start")
+    os.environ["DISPLAY"] = f":{number}"
+    try:
+        yield
+    finally:
+        del os.environ["DISPLAY"]
+        server.terminate()
+        server.wait()
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def test_back_to_back_sessions_keep_memory_flat(project):
+    store = project.learner_store
+    profile = store.profile(store.add_learner("soak"))
+    for n in range(SESSIONS):
+        if n == WARM_UP:
+            gc.collect()
+            objects, rss = len(gc.get_objects()), rss_mb()
+        session = project.QuizSession(profile, ["+", "/", "fraction", "factors_primes"], 3)
+        session.next_question()
+        while not session.finished:
+            _, done = session.submit(*loadtest.correct_answer(session.question_paper))
+            if done and not session.finished:
+                session.next_question()
+        session.commit(session.finish())
+    gc.collect()
+    assert len(gc.get_objects()) - objects < 1000
+    assert rss_mb() - rss < RSS_GROWTH_MB
+
+
+class Widget:
+    """Stands in for a pooled Tk widget or variable, logging what is done to it."""
+    def __init__(self, name, log):
+        self.name, self.log = name, log
+
+    def __getattr__(self, method):
+        return lambda *args, **options: self.log.append((self.name, method))
+
+
+def test_reset_session_forgets_the_quiz_but_keeps_the_widgets(project, tmp_path):
+    log = []
+    widgets = {name: Widget(name, log) for name in (
+        "display_question", "grade", "question_label", "evaluation_feedback", "input_user_answer",
+        "input_user_answer_remainder", "yes_no_var", "choice_var")}
+    store = project.learner_store
+    profile = store.profile(store.add_learner("reset"))
+    session = project.QuizSession(profile, ["+", "fraction"], 3, seed=5)
+    session.next_question()
+    session.submit(*loadtest.correct_answer(session.question_paper))
+    checkpoint = project.SessionCheckpoint(str(tmp_path / "session_checkpoint.jsonl"))
+    checkpoint.start({"record": session.record})
+    pdf = project.PDF()
+    pdf.set_title("Mathematics Practice")
+    pdf.add_page()
+    app = types.SimpleNamespace(
+        bg_color="#F0F8FF", question_asked=1, exam_score=1, attempts_counter=0, start_time=session.start_time,
+        test_start="10:00AM", question_paper=session.question_paper, evaluation_result=True, end_time=None,
+        test_end=None, question_plan=session.question_plan, session_record=session.record, reviews={},
+        question_index=1, levels=session.record["levels"], review_outcomes=[None], stats=session.stats,
+        response_timer=session.response_timer, session_random=session.session_random, checkpoint=checkpoint,
+        ability=session.ability, mastery=session.mastery, recent=session.recent,
+        file_name="Practice_dated_old", file_open_mode="a", pdf=pdf, **widgets)
+    project.GUI_Exam.latency = project.LatencyRecorder()
+    try:
+        project.GUI_Exam.reset_session(app)
+    finally:
+        latency, project.GUI_Exam.latency = project.GUI_Exam.latency, None
+    checkpoint.finish()
+
+    assert (app.question_asked, app.exam_score, app.attempts_counter, app.question_index) == (0, 0, 0, 0)
+    assert app.question_paper is app.start_time is app.end_time is app.evaluation_result is None
+    assert app.question_plan is app.session_record is app.reviews is app.levels is None
+    assert app.stats == {} and app.review_outcomes == []
+    assert app.response_timer is app.session_random is app.checkpoint is latency is None
+    assert app.ability is app.mastery is app.recent is None
+    assert app.pdf is app.file_open_mode is None and app.file_name != "Practice_dated_old"
+    # the same pooled widgets are emptied, none made or destroyed
+    assert all(getattr(app, name) is widget for name, widget in widgets.items())
+    assert {name for name, _ in log} == set(widgets)
+    assert not any(method in ("destroy", "grid_forget", "pack_forget") for _, method in log)
+
+
+def test_new_quiz_reuses_the_window(project, display):
+    tkinter = pytest.importorskip("tkinter")
+    try:
+        root = tkinter.Tk()
+    except tkinter.TclError:
+        pytest.skip("no display")
+    project.GUI_Exam.root = root
+    try:
+        app = project.GUI_Exam()
+        app.op_variables["+"].set("+")
+        app.op_variables["/"].set("/")
+        app.op_variables["fraction"].set("fraction")
+        app.op_variables["factors_primes"].set("factors_primes")
+        app.input_num_question.insert(0, "3")
+        for n in range(SESSIONS):
+            if n == WARM_UP:
+                gc.collect()
+                widgets, rss = count_widgets(root), rss_mb()
+            app.start()
+            app.sound_variable.set("")
+            while app.end_time is None:
+                text, remainder, choice = loadtest.correct_answer(app.question_paper)
+                if app.layout == "yes/no":
+                    app.yes_no_var.set(text)
+                else:
+                    app.input_user_answer.insert(0, text)
+                app.input_user_answer_remainder.insert(0, remainder)
+                app.choice_var.set(choice)
+                app.submit_answer()
+                root.update()
+            assert app.stat_score_label.cget("text").startswith("Score: 3\n")
+            app.new_quiz()
+            root.update()
+        gc.collect()
+        assert count_widgets(root) == widgets
+        assert rss_mb() - rss < RSS_GROWTH_MB
+    finally:
+        project.GUI_Exam.root = None
+        root.destroy()
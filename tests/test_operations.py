@@ -0,0 +1,44 @@
+import random
+import sys
+import types
+
+import pytest
+
+
+def test_every_operation_has_a_topic_that_makes_and_marks_questions(project):
+    rng = random.Random(3)
+    for key, op in project.OPERATIONS.items():
+        assert issubclass(op.topic, project.Topic)
+        assert project.DEFAULT_DIFFICULTY[key] == op.difficulty
+        assert project.op_names[key] == op.name
+        for difficulty in (1.0, 2.0, 3.0, 4.0):
+            for paper in op.topic.batch(difficulty, rng, 5):
+                assert paper._S == key
+                layout, _ = op.topic.layout(paper)
+                assert layout in ("answer", "quotient", "factors", "yes/no", "choices")
+
+
+def test_topics_are_looked_up_on_first_use(project, monkeypatch):
+    op = project.Operation("double", "Doubling", "mathquest_test_topics:Doubling")
+    with pytest.raises(ModuleNotFoundError):
+        op.topic
+    module = types.ModuleType("mathquest_test_topics")
+    module.Doubling = type("Doubling", (project.Topic,), {})
+    monkeypatch.setitem(sys.modules, "mathquest_test_topics", module)
+    assert op.topic is module.Doubling
+
+
+def test_three_term_sums_count_every_term(project):
+    paper = project.Exam("211 + 203 + 775", 211, 203, 775, "+")
+    assert paper.answer_actual == 1189
+    assert project.grade_answer(paper, "1189")
+
+
+def test_division_reads_and_marks_the_remainder(project):
+    paper = project.Exam("17 / 5", 17, 5, None, "/")
+    assert project.grade_answer(paper, "3", "2")
+    assert not project.grade_answer(paper, "3", "1")
+    with pytest.raises(ValueError):
+        project.grade_answer(paper, "3", "")
+    text, speech = project.topic("/").explain(paper, False)
+    assert text.endswith("not 3 & 1") and "not" not in speech[0]
@@ -0,0 +1,22 @@
+def test_added_questions_are_seen_and_others_are_not(project):
+    recent = project.RecentQuestions()
+    for n in range(200):
+        recent.add(f"+|{n}|{n + 1}|None|", today=1000)
+    assert all(recent.seen(f"+|{n}|{n + 1}|None|", today=1000) for n in range(200))
+    assert not any(recent.seen(f"-|{n}|{n + 1}|None|", today=1000) for n in range(200))
+
+
+def test_questions_expire_after_a_week(project):
+    recent = project.RecentQuestions()
+    recent.add("*|7|8|None|", today=1000)
+    assert recent.seen("*|7|8|None|", today=1000 + project.RecentQuestions.DAYS - 1)
+    assert not recent.seen("*|7|8|None|", today=1000 + project.RecentQuestions.DAYS)
+
+
+def test_a_new_day_reuses_its_slot(project):
+    recent = project.RecentQuestions()
+    recent.add("*|7|8|None|", today=1000)
+    # the same ring slot a week later is cleared before use
+    recent.add("*|6|9|None|", today=1000 + project.RecentQuestions.DAYS)
+    assert not recent.seen("*|7|8|None|", today=1000 + project.RecentQuestions.DAYS)
+    assert recent.seen("*|6|9|None|", today=1000 + project.RecentQuestions.DAYS)
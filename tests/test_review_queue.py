@@ -0,0 +1,31 @@
+import pytest
+
+
+def test_sm2_intervals_grow_after_right_answers(project):
+    schedule = project.ReviewQueue.schedule
+    state = (2.5, 0, 0.0)
+    state = schedule(*state, 5)
+    assert state == (pytest.approx(2.6), 1, 1.0)
+    state = schedule(*state, 5)
+    assert state == (pytest.approx(2.7), 2, 6.0)
+    state = schedule(*state, 4)
+    # quality 4 leaves easiness where it was
+    assert state == (pytest.approx(2.7), 3, round(6 * 2.7))
+
+
+def test_sm2_miss_starts_over_and_easiness_has_a_floor(project):
+    easiness, repetitions, interval = project.ReviewQueue.schedule(1.35, 3, 17.0, project.ReviewQueue.FAILED)
+    assert (repetitions, interval) == (0, 1.0)
+    assert easiness == 1.3
+
+
+def test_missed_question_comes_back_when_due(project):
+    store = project.learner_store
+    queue = project.ReviewQueue(store, store.add_learner("Review Test"))
+    paper = project.Exam("7 * 8", 7, 8, None, "*")
+    queue.record([project.review_outcome(None, paper, 2.0, False, 3)], now=0)
+    assert queue.take(["*"], 5, now=project.ReviewQueue.DAY - 1) == []
+    assert queue.take(["+"], 5, now=project.ReviewQueue.DAY) == []
+    taken = queue.take(["*"], 5, now=project.ReviewQueue.DAY)
+    assert [t["operation"] for t in taken] == ["*"]
+    assert project.decode_paper(taken[0]["paper"]).question == "7 * 8"